@@ -1,7 +1,8 @@
 import math
 
 from svg_to_gcode.compiler.interfaces import cutterInterface
-from svg_to_gcode.svg_parser import parse_file, getMinMax, sortCurves, openFile,getOutputFileName, drawOpts
+from svg_to_gcode.svg_parser import getMinMax, sortCurves, openFile,getOutputFileName
+from svg_to_gcode.svg_parser import parse_file_classified, filter_classifier
 from svg_to_gcode.compiler import CompilerPC
 from svg_to_gcode.svg_parser._dxf_importer import importDXF
 from svg_to_gcode.geometry import Text, Line
@@ -52,18 +53,13 @@ filename = openFile()
 print("\r\nOpen File: " + filename + "\r\n")
 
 if filename.__contains__(".svg"):
-    dOpts = drawOpts()
-    dOpts.doFiltering = True
     ### SVG Files ###
-
-    #cuts
-    dOpts.filter = None # for cuts for Pepakura Files
-    graphics = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
+    # graphics and text in a single parse of the file
+    classifiers = {"graphics": filter_classifier(None), "text": filter_classifier('text')}
+    classified = parse_file_classified(filename, classifiers, True)
+    graphics = classified["graphics"]
     # grafics = sortCurves(grafics)
-
-    #text
-    dOpts.filter = 'text' # for cuts for Pepakura Files
-    text = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
+    text = classified["text"]
 
 # elif filename.__contains__(".dxf"):
 #     grafics, groves,text = importDXF(filename)
@@ -1,7 +1,8 @@
 import math
 
 from svg_to_gcode.compiler.interfaces import cutterInterface
-from svg_to_gcode.svg_parser import parse_file, getMinMax, sortCurves, openFile,getOutputFileName, drawOpts
+from svg_to_gcode.svg_parser import getMinMax, sortCurves, openFile,getOutputFileName
+from svg_to_gcode.svg_parser import parse_file_classified, PEPAKURA_CLASSIFIERS
 from svg_to_gcode.compiler import CompilerPC
 from svg_to_gcode.svg_parser._dxf_importer import importDXF
 from svg_to_gcode.geometry import Text, Line
@@ -52,22 +53,12 @@ filename = openFile()
 print("\r\nOpen File: " + filename + "\r\n")
 
 if filename.__contains__(".svg"):
-    dOpts = drawOpts()
-    dOpts.doFiltering = True
     ### Pepakura SVG Files ###
-    # groves
-    dOpts.filter = 'stroke-dasharray' # for groves for Pepakura Files
-    groves = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
-    groves = sortCurves(groves)
-
-    #cuts
-    dOpts.filter = None # for cuts for Pepakura Files
-    cuts = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
-    cuts = sortCurves(cuts)
-
-    #text
-    dOpts.filter = 'text' # for cuts for Pepakura Files
-    text = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
+    # groves, cuts and text in a single parse of the file
+    classified = parse_file_classified(filename, PEPAKURA_CLASSIFIERS, True)
+    groves = sortCurves(classified["groves"])
+    cuts = sortCurves(classified["cuts"])
+    text = classified["text"]
 elif filename.__contains__(".dxf"):
     cuts, groves,text = importDXF(filename)
     groves = sortCurves(groves)
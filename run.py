@@ -8,7 +8,8 @@ from svg_to_gcode.geometry import LineSegmentChain
 from svg_to_gcode import UNITS, TOLERANCES
 
 from svg_to_gcode.geometry import Vector
-from svg_to_gcode.svg_parser import parse_file, getMinMax, drawOpts
+from svg_to_gcode.svg_parser import getMinMax
+from svg_to_gcode.svg_parser import parse_file_classified, PEPAKURA_CLASSIFIERS
 from svg_to_gcode.compiler import Compiler,CompilerPC, interfaces
 from svg_to_gcode import formulas
 
@@ -56,20 +57,16 @@ gcode_compiler = CompilerPC(cutterInterface, movement_speed=25000, cutting_speed
 # filename = "HEV Belt-unfold 32 inch.svg"
 filename = "HEV_Chest_scale.svg"
 
-dOpts = drawOpts()
-dOpts.doFiltering = True
-
 ### Pepakura Files ###
-# groves
-dOpts.filter = 'stroke-dasharray' # for groves for Pepakura Files
-groves = parse_file(filename,False,None,dOpts) # Parse an svg file into geometric curves
+# groves and cuts in a single parse of the file
+classified = parse_file_classified(filename, PEPAKURA_CLASSIFIERS, False)
+groves = classified["groves"]
 
 print("Size Groves")
 maxXg,maxYg,minXg,minYg = getMinMax(groves)
 
 #cuts
-dOpts.filter = None # for cuts for Pepakura Files
-cuts = parse_file(filename,False,None,dOpts) # Parse an svg file into geometric curves
+cuts = classified["cuts"]
 
 print("Size Cuts")
 maxXg,maxYg,minXg,minYg = getMinMax(cuts)
@@ -1,7 +1,7 @@
 import math
 
 from svg_to_gcode.compiler.interfaces import cutterInterface
-from svg_to_gcode.svg_parser import parse_file, getMinMax, sortCurves,scaleLines, openFile,getOutputFileName, drawOpts
+from svg_to_gcode.svg_parser import parse_file, getMinMax, scaleLines, stitchLines, openFile,getOutputFileName, drawOpts
 from svg_to_gcode.compiler import CompilerPC
 from svg_to_gcode.svg_parser._dxf_importer import importDXF, importAllDXF
 from svg_to_gcode.geometry import Text, Line
@@ -56,7 +56,6 @@ filename = "E:/Documents/Inventor/ato/sq60.dxf"
 # filename = "E:/Documents/Inventor/Halter/huhnProject/Box200mm_cut2.dxf"
 print("\r\nOpen File: " + filename + "\r\n")
 cuts = importAllDXF(filename)
-cuts = sortCurves(cuts)
 cuts = scaleLines(cuts,scale,scale)
 
 # filename2 = openFile("E:/Documents/Inventor/Halter/huhnProject")
@@ -64,7 +63,6 @@ cuts = scaleLines(cuts,scale,scale)
 # print("\r\nOpen File: " + filename2 + "\r\n")
 # groves = list()
 groves = importAllDXF(filename)
-groves = sortCurves(groves)
 groves = scaleLines(groves,scale,scale)
 
 text =  []
@@ -74,6 +72,10 @@ maxXg,maxYg,minXg,minYg = getMinMax(groves)
 print("Size Cuts")
 maxXc,maxYc,minXc,minYc = getMinMax(cuts)
 
+# join lines which share an end, then order them by the time spent between them, with the slopeMax they are cut with
+cuts = gcode_compiler.order_curves(stitchLines(cuts), time_limit=2.0, slope_max=math.radians(15))
+groves = gcode_compiler.order_curves(stitchLines(groves), time_limit=2.0, slope_max=math.radians(180))
+
 Xoffset = 0.0
 Yoffset = 0.0
 
@@ -1,7 +1,8 @@
 import math
 
 from svg_to_gcode.compiler.interfaces import cutterInterface
-from svg_to_gcode.svg_parser import parse_file, getMinMax, sortCurves, openFile,getOutputFileName, drawOpts
+from svg_to_gcode.svg_parser import getMinMax, stitchLines, openFile,getOutputFileName
+from svg_to_gcode.svg_parser import parse_file_classified, PEPAKURA_CLASSIFIERS
 from svg_to_gcode.compiler import CompilerPC
 from svg_to_gcode.svg_parser._dxf_importer import importDXF
 from svg_to_gcode.geometry import Text, Line
@@ -49,33 +50,29 @@ filename = openFile("E:/Documents/_pepakura/huhn/export2")
 print("\r\nOpen File: " + filename + "\r\n")
 
 if filename.__contains__(".svg"):
-    dOpts = drawOpts()
-    dOpts.doFiltering = True
     ### Pepakura SVG Files ###
-    # groves
-    dOpts.filter = 'stroke-dasharray' # for groves for Pepakura Files
-    groves = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
-    groves = sortCurves(groves)
-
-    #cuts
-    dOpts.filter = None # for cuts for Pepakura Files
-    cuts = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
-    cuts = sortCurves(cuts)
-
-    #text
-    dOpts.filter = 'text' # for cuts for Pepakura Files
-    text = parse_file(filename,True,None,dOpts) # Parse an svg file into geometric curves
+    # groves, cuts and text in a single parse of the file
+    classified = parse_file_classified(filename, PEPAKURA_CLASSIFIERS, True)
+    groves = classified["groves"]
+    cuts = classified["cuts"]
+    text = classified["text"]
 elif filename.__contains__(".dxf"):
     cuts, groves,text = importDXF(filename)
-    groves = sortCurves(groves)
-    cuts = sortCurves(cuts)
-
 
 print("Size Groves")
 maxXg,maxYg,minXg,minYg = getMinMax(groves)
 print("Size Cuts")
 maxXc,maxYc,minXc,minYc = getMinMax(cuts)
 
+# join lines which share an end, such that they're cut without lifting the tool
+groves = stitchLines(groves)
+cuts = stitchLines(cuts)
+
+# order and orient the curves by the time spent between them, including lifting the tool and turning the knife, with
+# the slopeMax each of them is cut with below
+groves = gcode_compiler.order_curves(groves, time_limit=2.0, slope_max=math.radians(180))
+cuts = gcode_compiler.order_curves(cuts, time_limit=2.0, slope_max=math.radians(15))
+
 Xoffset = 0.0
 Yoffset = 0.0
 
@@ -1,2 +1,3 @@
 TOLERANCES = {"approximation": 10 ** -2, "input": 10 ** -3, "operation": 10**-4}
 UNITS = {"mm", "in"}
+FLATTENING_METHODS = {"adaptive", "wang"}
@@ -1,10 +1,12 @@
+import math
 import typing
 import warnings
+import itertools
 
 from svg_to_gcode.compiler.interfaces import Interface
-from svg_to_gcode.geometry import Curve, Line
-from svg_to_gcode.geometry import LineSegmentChain
-from svg_to_gcode import UNITS, TOLERANCES
+from svg_to_gcode.geometry import Curve, Line, CircularArc, CubicBazier, QuadraticBezier
+from svg_to_gcode.geometry import LineSegmentChain, ArcChain, SmoothArcChain, approximate_iter
+from svg_to_gcode import UNITS, TOLERANCES, FLATTENING_METHODS
 
 
 class Compiler:
@@ -14,7 +16,8 @@ class Compiler:
     """
 
     def __init__(self, interface_class: typing.Type[Interface], movement_speed, cutting_speed, pass_depth,
-                 dwell_time=0, unit=None, custom_header=None, custom_footer=None):
+                 dwell_time=0, unit=None, custom_header=None, custom_footer=None, flattening="adaptive",
+                 arcs=False, beziers=False):
         """
 
         :param interface_class: Specify which interface to use. The most common is the gcode interface.
@@ -25,6 +28,13 @@ class Compiler:
         :param unit: specify a unit to the machine
         :param custom_header: A list of commands to be executed before all generated commands. Default is [laser_off,]
         :param custom_footer: A list of commands to be executed after all generated commands. Default is [laser_off,]
+        :param flattening: how curves are approximated with line segments. 'adaptive' (default) or 'wang', which is
+        faster for beziers. See LineSegmentChain.line_segment_approximation()
+        :param arcs: if True, curves are approximated with circular arcs and drawn with interface.circular_arc() (G2/G3)
+        instead of line segments. See SmoothArcChain.arc_approximation(). Runs of consecutive Lines are also replaced
+        by arcs where they lie on a common circle, see ArcChain.fit_arcs()
+        :param beziers: if True, beziers aren't approximated. They're drawn with interface.cubic_bezier() and
+        interface.quadratic_bezier(), eg. G5 with interfaces.MarlinGcode. Other curves are still approximated.
         """
         self.interface = interface_class()
         self.movement_speed = movement_speed
@@ -37,6 +47,14 @@ class Compiler:
         
         self.unit = unit
 
+        if flattening not in FLATTENING_METHODS:
+            raise ValueError(f"Unknown flattening method {flattening}. Please specify one of the following: "
+                             f"{FLATTENING_METHODS}")
+
+        self.flattening = flattening
+        self.arcs = arcs
+        self.beziers = beziers
+
         if custom_header is None:
             custom_header = [self.interface.laser_off()]
 
@@ -95,19 +113,58 @@ class Compiler:
         with open(file_name, 'w') as file:
             file.write(self.compile(passes=passes))
 
+    def append_stream(self, line_chains: typing.Iterable[LineSegmentChain], output: typing.TextIO):
+        """
+        Draws a stream of LineSegmentChains and writes the resulting code to output as soon as each chain is drawn,
+        instead of collecting it in self.body. Memory usage doesn't depend on the number of chains.
+
+        The header, any code already in self.body, the drawn chains and the footer are written in that order, producing
+        the same program as compile(passes=1). A stream can only be consumed once, so multiple passes aren't supported.
+
+        :param line_chains: An iterable of LineSegmentChains. Typically approximate_iter(parse_iter(...)).
+        :param output: A writable text stream. Eg. a file opened with open(file_name, 'w').
+        """
+
+        drawn_code = (command for line_chain in line_chains for command in self._draw_chain(line_chain))
+        code = itertools.chain(self.header, [self.interface.set_unit(self.unit)], self.body, drawn_code, self.footer)
+
+        separator = ''
+        for command in code:
+            if len(command) > 0:
+                output.write(separator + command)
+                separator = '\n'
+
     def append_line_chain(self, line_chain: LineSegmentChain):
         """
         Draws a LineSegmentChain by calling interface.linear_move() for each segment. The resulting code is appended to
         self.body
         """
 
-        if line_chain.chain_size() == 0:
+        self.body.extend(self._draw_chain(line_chain))
+
+    def append_arc_chain(self, arc_chain: ArcChain):
+        """
+        Draws an ArcChain (or SmoothArcChain) by calling interface.circular_arc() for each arc and interface.linear_move() for each
+        line. The resulting code is appended to self.body
+        """
+
+        self.body.extend(self._draw_chain(arc_chain))
+
+    def _draw_chain(self, chain: typing.Iterable[Curve]) -> typing.List[str]:
+        """
+        Draws a chain, or a list of continuous curves, with interface commands. Return the resulting code. Lines,
+        CircularArcs and beziers are supported.
+        """
+
+        curves = list(chain)
+
+        if len(curves) == 0:
             warnings.warn("Attempted to parse empty LineChain")
             return []
 
         code = []
 
-        start = line_chain.get(0).start
+        start = curves[0].start
 
         # Don't dwell and turn off laser if the new start is at the current position
         if self.interface.position is None or abs(self.interface.position - start) > TOLERANCES["operation"]:
@@ -119,22 +176,88 @@ class Compiler:
             if self.dwell_time > 0:
                 code = [self.interface.dwell(self.dwell_time)] + code
 
-        for line in line_chain:
-            code.append(self.interface.linear_move(line.end.x, line.end.y))
+        for curve in curves:
+            # Arcs which are indistinguishable from their chord are drawn as lines
+            if isinstance(curve, CircularArc) and \
+                    curve.radius * (1 - math.cos(curve.sweep_angle / 2)) > TOLERANCES["operation"]:
+                code.append(self.interface.circular_arc(curve.end.x, curve.end.y, curve.center.x - curve.start.x,
+                                                        curve.center.y - curve.start.y, curve.clockwise))
+            elif isinstance(curve, CubicBazier):
+                code.append(self.interface.cubic_bezier(curve.end.x, curve.end.y,
+                                                        curve.control1.x - curve.start.x, curve.control1.y - curve.start.y,
+                                                        curve.control2.x - curve.end.x, curve.control2.y - curve.end.y))
+            elif isinstance(curve, QuadraticBezier):
+                code.append(self.interface.quadratic_bezier(curve.end.x, curve.end.y, curve.control.x - curve.start.x,
+                                                            curve.control.y - curve.start.y))
+            else:
+                code.append(self.interface.linear_move(curve.end.x, curve.end.y))
+
+        return code
+
+    @staticmethod
+    def _arc_chains(curves: typing.Iterable[Curve]) -> typing.Iterator[ArcChain]:
+        """
+        Approximate curves with arcs. Consecutive, continuous Lines and LineSegmentChains are collected and fitted with
+        arcs as a whole.
+        """
+
+        lines = LineSegmentChain()
 
-        self.body.extend(code)
+        for curve in curves:
+            is_straight = isinstance(curve, (Line, LineSegmentChain))
+            is_continuous = lines.chain_size() == 0 or abs(lines.vertices[-1] - curve.start) <= TOLERANCES["input"]
+
+            if is_straight and is_continuous:
+                lines.merge(LineSegmentChain.line_segment_approximation(curve))
+                continue
+
+            if lines.chain_size():
+                yield ArcChain.fit_arcs(lines)
+                lines = LineSegmentChain()
+
+            if is_straight:
+                lines.merge(LineSegmentChain.line_segment_approximation(curve))
+            else:
+                yield SmoothArcChain.arc_approximation(curve)
+
+        if lines.chain_size():
+            yield ArcChain.fit_arcs(lines)
 
     def append_curves(self, curves: [typing.Type[Curve]]):
         """
-        Draws curves by approximating them as line segments and calling self.append_line_chain(). The resulting code is
-        appended to self.body
+        Draws curves by approximating them as line segments and calling self.append_line_chain(), or as circular arcs
+        and calling self.append_arc_chain() if self.arcs is True. If self.beziers is True, beziers are drawn as they are.
+        The resulting code is appended to self.body
         """
 
-        for curve in curves:
-            line_chain = LineSegmentChain()
+        for chain in self._chains(curves):
+            if isinstance(chain, LineSegmentChain):
+                self.append_line_chain(chain)
+            elif isinstance(chain, ArcChain):
+                self.append_arc_chain(chain)
+            else:
+                self.body.extend(self._draw_chain(chain))
+
+    def _chains(self, curves: typing.Iterable[Curve]) -> typing.Iterator[typing.Iterable[Curve]]:
+        """Approximate curves according to self.arcs and self.beziers. Beziers which are drawn natively are yielded alone."""
 
-            approximation = LineSegmentChain.line_segment_approximation(curve)
+        if self.arcs:
+            approximate = self._arc_chains
+        else:
+            def approximate(pending_curves):
+                return approximate_iter(pending_curves, method=self.flattening)
 
-            line_chain.extend(approximation)
+        if not self.beziers:
+            yield from approximate(curves)
+            return
 
-            self.append_line_chain(line_chain)
+        pending_curves = []
+        for curve in curves:
+            if isinstance(curve, (CubicBazier, QuadraticBezier)):
+                yield from approximate(pending_curves)
+                pending_curves = []
+                yield [curve]
+            else:
+                pending_curves.append(curve)
+
+        yield from approximate(pending_curves)
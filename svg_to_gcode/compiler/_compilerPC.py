@@ -5,10 +5,11 @@ import math
 from svg_to_gcode.compiler import Compiler
 from svg_to_gcode.compiler.interfaces import Interface
 from svg_to_gcode.geometry import Curve, Line, Text
-from svg_to_gcode.geometry import LineSegmentChain
+from svg_to_gcode.geometry import LineSegmentChain, ApproximationCache
 from svg_to_gcode import UNITS, TOLERANCES
 from svg_to_gcode import formulas
 from svg_to_gcode.geometry import Vector
+from svg_to_gcode.svg_parser import sortCurves, optimizeCurves
 
 from svg_to_gcode.TextToGcode.ttgLib.TextToGcode import ttg
 
@@ -19,6 +20,42 @@ class CompilerPC(Compiler):
 
     def append_code(self,code):
         self.body.extend(code)
+
+    def transition_time(self, distance: float, rotation: float, slope_max=None) -> float:
+        """
+        Estimate the time, in seconds, from the end of a curve to the start of the next one, as cut by
+        append_line_chain(). Used as the cost of optimizeCurves(..., headings=True).
+
+        :param distance: The length of the travel move.
+        :param rotation: The rotation of the knife, in radians.
+        :param slope_max: The slopeMax the curves will be cut with. Defaults to self.slopeMax.
+        """
+        slope_max = self.slopeMax if slope_max is None else slope_max
+
+        rotation_time = math.degrees(rotation) * 60 / self.interface.ABFeed
+        lift_time = 2 * self.interface.Zlift * 60 / self.interface.ZFeed
+
+        # Joined curves are cut without lifting the tool, unless the knife turns by more than slopeMax
+        if distance <= TOLERANCES["operation"]:
+            return rotation_time + (lift_time if rotation > slope_max else 0.0)
+
+        # The knife turns during the travel move
+        return lift_time + max(distance * 60 / self.movement_speed, rotation_time)
+
+    def order_curves(self, curves: [typing.Type[Curve]], time_limit=2.0, reverse=True, slope_max=None):
+        """
+        Order curves, and draw them backwards if reverse is True, such that little time is spent between them lifting
+        the tool, travelling and turning the knife. Curves which continue each other in the same direction, like
+        collinear grooves, are cut one after another without turning the knife.
+
+        slope_max is the slopeMax the curves will be cut with, if it's set after ordering them. Defaults to
+        self.slopeMax.
+        """
+        def cost(distance, rotation):
+            return self.transition_time(distance, rotation, slope_max)
+
+        return optimizeCurves(sortCurves(curves, reverse=reverse), reverse=reverse, time_limit=time_limit, cost=cost,
+                              headings=True)
     
 
     def append_curves(self, curves: [typing.Type[Curve]], tool,offsetX = 0, offsetY = 0):
@@ -29,10 +66,13 @@ class CompilerPC(Compiler):
         if len(curves) == 0:
             return()
 
+        # Repeated parts are only approximated once
+        approximation_cache = ApproximationCache(method=self.flattening)
+
         for curve in curves:
             line_chain = LineSegmentChain()
 
-            approximation = LineSegmentChain.line_segment_approximation(curve)
+            approximation = approximation_cache.approximate(curve)
 
             line_chain.extend(approximation)
 
@@ -53,18 +93,18 @@ class CompilerPC(Compiler):
 
         code = []
 
+        if offsetX or offsetY:
+            line_chain = LineSegmentChain(vertices=line_chain.vertices + (offsetX, offsetY))
+
         start = line_chain.get(0).start
         end = line_chain.get(0).end
-        
-        for line in line_chain:
-            line.start.x += offsetX
-            line.end.x += offsetX
-            line.start.y += offsetY
-            line.end.y += offsetY
 
         # slope = line_chain.get(0).slopeRad
         slope = formulas.line_slopeRad(start, end)
 
+        # turn the knife the short way round
+        slope = self.interface.slope[tool] + (slope - self.interface.slope[tool] + math.pi) % (2 * math.pi) - math.pi
+
         #set to fast move
         self.interface.currentMove = -1
         # # Don't dwell and turn off laser if the new start is at the current position
@@ -91,7 +131,8 @@ class CompilerPC(Compiler):
             lastSlope = self.interface.slope[tool]
 
             slope = formulas.line_slopeRad(self.interface.position , line.end)
-            deltaS = slope - self.interface.slope[tool]
+            deltaS = (slope - self.interface.slope[tool] + math.pi) % (2 * math.pi) - math.pi
+            slope = self.interface.slope[tool] + deltaS
             # slope = formulas.line_slopeRad(line.start , line.end)
 
             # print(f"{self.interface.slope[tool]} {line.slope} {deltaS}")
@@ -1,4 +1,5 @@
 from svg_to_gcode.compiler.interfaces._abstract_interface import Interface
 from svg_to_gcode.compiler.interfaces._gcode import Gcode
 from svg_to_gcode.compiler.interfaces._fan_controlled_gcode import FanControlledGcode
-from svg_to_gcode.compiler.interfaces._cutterInterface import cutterInterface
\ No newline at end of file
+from svg_to_gcode.compiler.interfaces._cutterInterface import cutterInterface
+from svg_to_gcode.compiler.interfaces._spline_gcode import MarlinGcode, LinuxCNCGcode
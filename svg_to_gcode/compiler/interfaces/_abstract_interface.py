@@ -28,6 +28,40 @@ class Interface:
         """
         raise NotImplementedError("Interface class must implement the linear_move command")
 
+    def circular_arc(self, x, y, i, j, clockwise=False) -> str:
+        """
+        Moves the tool along a circular arc, from the current position to (x, y). Only required to compile with arcs.
+
+        :param i: the x offset of the center from the current position.
+        :param j: the y offset of the center from the current position.
+        :param clockwise: the direction of rotation.
+        :return: Appropriate command.
+        """
+        raise NotImplementedError("Interface class must implement the circular_arc command to compile arcs")
+
+    def cubic_bezier(self, x, y, i, j, p, q) -> str:
+        """
+        Moves the tool along a cubic bezier, from the current position to (x, y). Only required to compile with beziers.
+
+        :param i: the x offset of the first control point from the current position.
+        :param j: the y offset of the first control point from the current position.
+        :param p: the x offset of the second control point from (x, y).
+        :param q: the y offset of the second control point from (x, y).
+        :return: Appropriate command.
+        """
+        raise NotImplementedError("Interface class must implement the cubic_bezier command to compile beziers")
+
+    def quadratic_bezier(self, x, y, i, j) -> str:
+        """
+        Moves the tool along a quadratic bezier, from the current position to (x, y). Only required to compile with
+        beziers.
+
+        :param i: the x offset of the control point from the current position.
+        :param j: the y offset of the control point from the current position.
+        :return: Appropriate command.
+        """
+        raise NotImplementedError("Interface class must implement the quadratic_bezier command to compile beziers")
+
     def laser_off(self) -> str:
         """
         Powers off the laser beam.
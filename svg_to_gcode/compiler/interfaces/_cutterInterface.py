@@ -237,6 +237,41 @@ class cutterInterface(interfaces.Gcode):
 
         return command + ';'
 
+    def circular_arc(self, x, y, i, j, clockwise=False):
+
+        if self._next_speed is None:
+            raise ValueError("Undefined movement speed. Call set_movement_speed before executing movement commands.")
+
+        # Arcs are always cutting moves
+        command = "G2" if clockwise else "G3"
+
+        if self._current_speed != self._next_speed:
+            self._current_speed = self._next_speed
+
+        # add tool offset, the center offsets are relative and don't change
+        xMove = x + self.toolOffset[self.tool][0]
+        yMove = y + self.toolOffset[self.tool][1]
+
+        command += f" X{xMove:.{self.precision}f} Y{yMove:.{self.precision}f}"
+        command += f" I{i:.{self.precision}f} J{j:.{self.precision}f}"
+
+        # allways add speed
+        command += f" F{self._current_speed}"
+
+        if self.position is not None:
+            # the history only records the chord of the arc
+            move = (self.position.x, self.position.y, self.positionZ,
+                        x-self.position.x,
+                        y-self.position.y, 0)
+            self.addHistory(move)
+
+        self.position = Vector(x, y)
+
+        if verbose:
+            print(f"Arc to {x}, {y} around {i}, {j}")
+
+        return command + ';'
+
     def combinedLinearMove(self, x=None, y=None, z=None, tool=0, slope=0):
         linearMove = self.linear_move( x, y, z)
         degSlope = self.getSlope(tool, slope)
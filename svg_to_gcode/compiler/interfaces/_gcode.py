@@ -59,6 +59,29 @@ class Gcode(Interface):
 
         return command + ';'
 
+    def circular_arc(self, x, y, i, j, clockwise=False):
+        return self._curve_move("G2" if clockwise else "G3", x, y, I=i, J=j)
+
+    def _curve_move(self, command, x, y, **offsets):
+        """Assemble a curved move to (x, y). The keyword arguments are appended as words, eg. I=1.0 -> ' I1.0000'"""
+
+        if self._next_speed is None:
+            raise ValueError("Undefined movement speed. Call set_movement_speed before executing movement commands.")
+
+        if self._current_speed != self._next_speed:
+            self._current_speed = self._next_speed
+            command += f" F{self._current_speed}"
+
+        command += f" X{x:.{self.precision}f} Y{y:.{self.precision}f}"
+        command += "".join(f" {word}{value:.{self.precision}f}" for word, value in offsets.items())
+
+        self.position = Vector(x, y)
+
+        if verbose:
+            print(f"{command} to {x}, {y}")
+
+        return command + ';'
+
     def laser_off(self):
         return f"M5;"
 
@@ -0,0 +1,29 @@
+from svg_to_gcode.compiler.interfaces import Gcode
+
+
+class MarlinGcode(Gcode):
+    """
+    Gcode for Marlin firmware, which draws cubic beziers natively with G5 (requires BEZIER_CURVE_SUPPORT).
+    Quadratic beziers are elevated to equivalent cubic beziers.
+    """
+
+    def cubic_bezier(self, x, y, i, j, p, q):
+        return self._curve_move("G5", x, y, I=i, J=j, P=p, Q=q)
+
+    def quadratic_bezier(self, x, y, i, j):
+        if self.position is None:
+            raise ValueError("Undefined position. Quadratic beziers can only be elevated from a known position.")
+
+        # Both cubic control points lie 2/3 of the way from their end point to the quadratic control point
+        control_x, control_y = self.position.x + i, self.position.y + j
+        return self.cubic_bezier(x, y, 2 / 3 * i, 2 / 3 * j, 2 / 3 * (control_x - x), 2 / 3 * (control_y - y))
+
+
+class LinuxCNCGcode(Gcode):
+    """Gcode for LinuxCNC, which draws cubic beziers natively with G5 and quadratic beziers with G5.1"""
+
+    def cubic_bezier(self, x, y, i, j, p, q):
+        return self._curve_move("G5", x, y, I=i, J=j, P=p, Q=q)
+
+    def quadratic_bezier(self, x, y, i, j):
+        return self._curve_move("G5.1", x, y, I=i, J=j)
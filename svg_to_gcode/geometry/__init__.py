@@ -9,7 +9,8 @@ specific maintenance notes:
 """
 
 from svg_to_gcode.geometry._vector import Vector
-from svg_to_gcode.geometry._matrix import Matrix, IdentityMatrix, RotationMatrix
+from svg_to_gcode.geometry._matrix import Matrix, IdentityMatrix, RotationMatrix, AffineMatrix
+from svg_to_gcode.geometry._point_array import PointArray, Polyline
 
 from svg_to_gcode.geometry._abstract_curve import Curve
 from svg_to_gcode.geometry._line import Line
@@ -20,5 +21,7 @@ from svg_to_gcode.geometry._quadratic_bazier import QuadraticBezier
 from svg_to_gcode.geometry._cubic_bazier import CubicBazier
 
 from svg_to_gcode.geometry._abstract_chain import Chain
-from svg_to_gcode.geometry._line_segment_chain import LineSegmentChain
+from svg_to_gcode.geometry._line_segment_chain import LineSegmentChain, ApproximationCache, \
+    approximate_iter
+from svg_to_gcode.geometry._arc_chain import ArcChain
 from svg_to_gcode.geometry._smooth_arc_chain import SmoothArcChain
@@ -1,5 +1,9 @@
+import bisect
+
 from collections.abc import Iterable
 
+import numpy as np
+
 from svg_to_gcode.geometry import Curve
 from svg_to_gcode import formulas
 
@@ -9,12 +13,16 @@ class Chain(Curve):
     The Chain class is used to store a sequence of consecutive curves. When considered as a whole, Chains can also be
     viewed as a single, continuous curve. They inherit from the Curve class and are equipped with the subsequent point()
     and derivative() methods.
+
+    The cumulative length at the end of each curve is kept in an index, such that the curve at a given t is found with a
+    binary search. Curves must not be modified after they've been added to the chain.
     """
 
-    __slots__ = '_curves'
+    __slots__ = '_curves', '_ends'
 
     def __init__(self, curves=None):
         self._curves = []
+        self._ends = []
 
         if curves is not None:
             self.extend(curves)
@@ -22,12 +30,22 @@ class Chain(Curve):
     def __iter__(self):
         yield from self._curves
 
+    @property
+    def start(self):
+        """The start of the first curve. Chains are continuous, so it's the start of the whole chain."""
+        return self._curves[0].start
+
+    @property
+    def end(self):
+        """The end of the last curve."""
+        return self._curves[-1].end
+
     def length(self):
         """
         Return the geometric length of the chain.
         The __len__ magic method wasn't overridden to avoid ambiguity between total length and chain size.
         """
-        return sum([curve.length() for curve in self._curves])
+        return self._ends[-1] if self._ends else 0
 
     def chain_size(self):
         """
@@ -36,6 +54,10 @@ class Chain(Curve):
         """
         return len(self._curves)
 
+    def reversed(self):
+        """Return a new chain of the reversed curves, in reverse order."""
+        return type(self)([curve.reversed() for curve in reversed(self._curves)])
+
     def get(self, index: int) -> Curve:
         """Return a curve at a given index"""
         return self._curves[index]
@@ -44,6 +66,11 @@ class Chain(Curve):
         """Append a new curve to the chain"""
         raise NotImplementedError("All chains must implement an append command")
 
+    def _append_curve(self, new_curve: Curve):
+        """Add a curve, which has already been checked by append(), to the chain and to the length index."""
+        self._ends.append((self._ends[-1] if self._ends else 0) + new_curve.length())
+        self._curves.append(new_curve)
+
     def extend(self, new_curves: Iterable):
         """Extend the Chain with an iterable"""
         for new_curve in new_curves:
@@ -57,34 +84,43 @@ class Chain(Curve):
         if not chain._curves:
             return
 
-        if self._curves:
-            assert self.append(chain._curves[0])
+        # The first curve is checked against the end of this chain. The others are already continuous.
+        self.append(chain._curves[0])
 
-        self._curves.extend(chain._curves[1:])
+        for curve in chain._curves[1:]:
+            self._append_curve(curve)
 
     def remove_from_first(self, number_of_curves: int):
         """Remove n curves starting from the first"""
-        for i in range(number_of_curves):
-            self._curves.pop(0)
+        number_of_curves = min(number_of_curves, len(self._curves))
+
+        if number_of_curves:
+            offset = self._ends[number_of_curves - 1]
+            self._ends = [end - offset for end in self._ends[number_of_curves:]]
+            del self._curves[:number_of_curves]
 
     def remove_from_last(self, number_of_curves: int):
         """Remove n curves starting from the last"""
-        for i in range(len(self._curves) - 1, number_of_curves + 1, -1):
-            self._curves.pop(-1)
+        size = max(len(self._curves) - number_of_curves, 0)
+
+        del self._curves[size:]
+        del self._ends[size:]
+
+    def _length_index(self):
+        """The cumulative length at the end of each curve. A sorted sequence with one entry per curve."""
+        return self._ends
 
     def _get_curve_t(self, t):
-        lengths = [curve.length() for curve in self._curves]
-        t_position = t * sum(lengths)
+        ends = self._length_index()
+        t_position = t * ends[-1]
 
-        position = 0
-        for i, length in enumerate(lengths):
-            position += length
-            if position > t_position:
-                break
+        # The first curve which ends after t_position. Curves of length 0 are skipped, except at the very end.
+        i = min(bisect.bisect_right(ends, t_position), len(ends) - 1)
+        start = ends[i - 1] if i > 0 else 0
 
-        curve_t = formulas.inv_linear_map(position - length, position, t_position)
+        curve_t = formulas.inv_linear_map(start, ends[i], t_position) if ends[i] > start else 0
 
-        return self._curves[i], curve_t
+        return self.get(i), curve_t
 
     def point(self, t):
         if self.chain_size() == 0:
@@ -100,5 +136,64 @@ class Chain(Curve):
         curve, curve_t = self._get_curve_t(t)
         return curve.derivative(curve_t)
 
+    def _get_curve_ts(self, ts, ends):
+        """
+        The vectorised equivalent of _get_curve_t(), given the length index. Return the index of each t's curve and its t
+        on that curve.
+        """
+        ends = np.asarray(ends, dtype=np.float64)
+        lengths = np.diff(ends, prepend=0)
+        t_positions = np.asarray(ts, dtype=np.float64).ravel() * ends[-1]
+
+        indices = np.minimum(np.searchsorted(ends, t_positions, side='right'), len(ends) - 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            curve_ts = (t_positions - ends[indices] + lengths[indices]) / lengths[indices]
+
+        return indices, np.nan_to_num(curve_ts)
+
+    @staticmethod
+    def _curve_groups(indices: np.ndarray):
+        """
+        Group the ts of _get_curve_ts() by curve. Yield each curve's index along with the positions of its ts. Sorted ts
+        are split into slices in a single sweep, other ts are sorted by curve first.
+        """
+        if len(indices) == 0:
+            return
+
+        order = None if np.all(indices[1:] >= indices[:-1]) else np.argsort(indices, kind='stable')
+        sorted_indices = indices if order is None else indices[order]
+
+        bounds = (np.flatnonzero(np.diff(sorted_indices)) + 1).tolist()
+        for start, stop in zip([0] + bounds, bounds + [len(indices)]):
+            yield int(sorted_indices[start]), slice(start, stop) if order is None else order[start:stop]
+
+    def _checked_length_index(self) -> np.ndarray:
+        if self.chain_size() == 0:
+            raise ValueError("Chain.points and Chain.derivatives can't be called before adding any curves to the chain.")
+
+        return np.asarray(self._length_index(), dtype=np.float64)
+
+    def points(self, ts):
+        indices, curve_ts = self._get_curve_ts(ts, self._checked_length_index())
+
+        points = np.empty((len(indices), 2))
+        for i, selection in self._curve_groups(indices):
+            points[selection] = self.get(i).points(curve_ts[selection])
+
+        return points
+
+    def derivatives(self, ts):
+        ends = self._checked_length_index()
+        indices, curve_ts = self._get_curve_ts(ts, ends)
+
+        derivatives = np.empty((len(indices), 2))
+        for i, selection in self._curve_groups(indices):
+            # Each curve only covers a fraction of the chain's t, so its derivative is scaled up
+            length = ends[i] - (ends[i - 1] if i > 0 else 0)
+            derivatives[selection] = self.get(i).derivatives(curve_ts[selection]) * (ends[-1] / length)
+
+        return derivatives
+
     def sanity_check(self):
         pass
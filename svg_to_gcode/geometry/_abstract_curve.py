@@ -1,6 +1,12 @@
+import numpy as np
+
 from svg_to_gcode import formulas
 from svg_to_gcode.geometry import Vector
 
+# 8-point Gauss-Legendre quadrature, mapped from [-1, 1] to [0, 1]
+_gauss_nodes, _gauss_weights = np.polynomial.legendre.leggauss(8)
+_gauss_nodes, _gauss_weights = (_gauss_nodes + 1) / 2, _gauss_weights / 2
+
 
 class Curve:
     """
@@ -16,6 +22,13 @@ class Curve:
 
     __slots__ = 'start', 'end'
 
+    # Numeric arc-lengths are accurate to this fraction of the curve's length
+    length_tolerance = 1e-10
+
+    # The arc-length table has at least this many intervals, and halves them at most max_length_depth times
+    length_intervals = 16
+    max_length_depth = 20
+
     def point(self, t: float) -> Vector:
         """
         The point method returns a point along the curve.
@@ -35,6 +48,134 @@ class Curve:
         """
         raise NotImplementedError("derivative(self, t) must be implemented")
 
+    def points(self, ts) -> np.ndarray:
+        """
+        The points method is the vectorised equivalent of point(). Child classes override it with a numpy
+        implementation, this fallback calls point() for each t.
+
+        :param ts: an array-like of numbers between 0 and 1.
+        :return: an (N, 2) array of the points at each t.
+        """
+        return np.array([tuple(self.point(t)) for t in np.ravel(ts)], dtype=np.float64).reshape(-1, 2)
+
+    def derivatives(self, ts) -> np.ndarray:
+        """
+        The derivatives method returns the tangent vectors d(point)/dt at several points along the curve. Unlike
+        derivative(), which returns a slope for some curves, the result is always a vector.
+
+        :param ts: an array-like of numbers between 0 and 1.
+        :return: an (N, 2) array of the derivatives at each t.
+        """
+        raise NotImplementedError("derivatives(self, ts) must be implemented")
+
+    def reversed(self) -> "Curve":
+        """
+        Return a new curve which follows the same path in the opposite direction, from self.end to self.start.
+        reversed().point(t) is equivalent to point(1 - t).
+        """
+        raise NotImplementedError("reversed(self) must be implemented")
+
+    def length(self) -> float:
+        """
+        Return the arc-length of the curve. Child classes with a closed form override it, the others are integrated
+        numerically, see length_table().
+        """
+        return float(self.length_table()[1][-1])
+
+    def length_table(self) -> (np.ndarray, np.ndarray):
+        """
+        Return an arc-length table: sorted ts from 0 to 1, and the distance along the curve from its start to each t.
+
+        The speed |derivatives(t)| is integrated with 8-point Gauss-Legendre quadrature. Intervals are halved until the
+        quadrature of an interval and of its two halves agree within length_tolerance. Curves which declare a
+        _length_table slot cache the table, they must not be modified once they've been measured.
+        """
+        try:
+            return self._length_table
+        except AttributeError:
+            pass
+
+        bounds = np.linspace(0, 1, self.length_intervals + 1)
+        starts, stops = bounds[:-1], bounds[1:]
+        tolerance = None
+
+        # The end t and the length of each accepted half-interval
+        ends, lengths = [], []
+
+        for depth in range(self.max_length_depth + 1):
+            middles = (starts + stops) / 2
+            whole, first_half, second_half = np.split(self._integrate_speed(np.concatenate((starts, starts, middles)),
+                                                                            np.concatenate((stops, middles, stops))), 3)
+
+            if tolerance is None:
+                tolerance = self.length_tolerance * whole.sum()
+
+            accepted = np.abs(whole - first_half - second_half) <= tolerance * (stops - starts)
+            if depth == self.max_length_depth:
+                accepted[:] = True
+
+            ends.extend((middles[accepted], stops[accepted]))
+            lengths.extend((first_half[accepted], second_half[accepted]))
+
+            starts, stops = starts[~accepted], stops[~accepted]
+            if len(starts) == 0:
+                break
+
+            # Halve the rejected intervals
+            middles = (starts + stops) / 2
+            starts, stops = np.concatenate((starts, middles)), np.concatenate((middles, stops))
+
+        ends, lengths = np.concatenate(ends), np.concatenate(lengths)
+        order = np.argsort(ends)
+        table = np.concatenate(([0.0], ends[order])), np.concatenate(([0.0], np.cumsum(lengths[order])))
+
+        try:
+            self._length_table = table
+        except AttributeError:
+            # Curves without a _length_table slot, such as chains, may change and aren't cached
+            pass
+
+        return table
+
+    def _integrate_speed(self, t0: np.ndarray, t1: np.ndarray) -> np.ndarray:
+        """The arc-length from each t0 to the corresponding t1, with a single Gauss-Legendre quadrature each."""
+        ts = t0.reshape(-1, 1) + (t1 - t0).reshape(-1, 1) * _gauss_nodes
+        speeds = np.hypot(*self.derivatives(ts.ravel()).T).reshape(ts.shape)
+        return speeds @ _gauss_weights * (t1 - t0)
+
+    def distance_to_t(self, distance: float) -> float:
+        """Return the t at a given distance along the curve, from its start. The inverse of the arc-length."""
+        return float(self.distances_to_ts([distance])[0])
+
+    def distances_to_ts(self, distances) -> np.ndarray:
+        """
+        The vectorised equivalent of distance_to_t(). Eg. curve.points(curve.distances_to_ts(np.linspace(0, length, n)))
+        samples a curve at evenly spaced distances.
+
+        The t is interpolated from length_table(), then refined with a few Newton steps.
+
+        :param distances: an array-like of distances between 0 and self.length().
+        :return: an array of the t at each distance.
+        """
+        table_ts, table_lengths = self.length_table()
+        distances = np.clip(np.asarray(distances, dtype=np.float64).ravel(), 0, table_lengths[-1])
+
+        i = np.clip(np.searchsorted(table_lengths, distances, side='right') - 1, 0, len(table_ts) - 2)
+        t0, t1 = table_ts[i], table_ts[i + 1]
+        interval_lengths = table_lengths[i + 1] - table_lengths[i]
+        remaining = distances - table_lengths[i]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ts = t0 + (t1 - t0) * np.nan_to_num(np.clip(remaining / interval_lengths, 0, 1))
+
+        for _ in range(3):
+            speeds = np.hypot(*self.derivatives(ts).T)
+            errors = self._integrate_speed(t0, ts) - remaining
+            steps = np.divide(errors, speeds, out=np.zeros_like(errors), where=speeds > 0)
+            ts = np.clip(ts - steps, t0, t1)
+
+        return ts
+
     def sanity_check(self):
         """Verify if that the curve is valid."""
         raise NotImplementedError("sanity_check(self) must be implemented")
@@ -62,13 +203,12 @@ class Curve:
         :return: the approximate maximum distance
         """
 
-        maximum_distance = 0
-        for i in range(samples):
-            t = (i + 1) / (samples + 1)
-            t1 = formulas.linear_map(t_range1[0], t_range1[1], t)
-            t2 = formulas.linear_map(t_range2[0], t_range2[1], t)
+        if samples <= 0:
+            return 0
 
-            distance = abs(curve1.point(t1) - curve2.point(t2))
-            maximum_distance = distance if distance > maximum_distance else maximum_distance
+        t = np.arange(1, samples + 1) / (samples + 1)
+        t1 = formulas.linear_map(t_range1[0], t_range1[1], t)
+        t2 = formulas.linear_map(t_range2[0], t_range2[1], t)
 
-        return maximum_distance
+        difference = curve1.points(t1) - curve2.points(t2)
+        return float(np.hypot(difference[:, 0], difference[:, 1]).max())
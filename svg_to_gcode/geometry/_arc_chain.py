@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+
+from svg_to_gcode.geometry import Chain, Vector
+from svg_to_gcode.geometry import Line, CircularArc, LineSegmentChain
+from svg_to_gcode import TOLERANCES
+
+
+class ArcChain(Chain):
+    """
+    The ArcChain class inherits form the abstract Chain class. It represents a series of continuous Lines and
+    CircularArcs, which can be drawn with linear (G1) and circular (G2/G3) moves.
+
+    ArcChains are generally instantiated through the static method fit_arcs(), which replaces runs of vertices of a
+    LineSegmentChain that lie on a common circle with arcs.
+    """
+
+    # Arcs whose radius exceeds their chord by this factor are considered straight
+    max_radius_ratio = 10 ** 6
+
+    def __repr__(self):
+        return f"ArcChain({[curve.__repr__() for curve in self._curves]})"
+
+    def append(self, curve2):
+        """Append a Line or a CircularArc to the chain."""
+
+        if self._curves:
+            curve1 = self._curves[-1]
+
+            # Assert continuity
+            if abs(curve1.end - curve2.start) > TOLERANCES['input']:
+                raise ValueError(f"The end of the last curve is different from the start of the new curve, "
+                                 f"|{curve1.end} - {curve2.start}| >= {TOLERANCES['input']}")
+
+            # Join curves
+            curve2.start = curve1.end
+
+        self._append_curve(curve2)
+
+    @staticmethod
+    def fit_arcs(line_chain: LineSegmentChain, error_cap=None, min_segments=3, max_sweep=math.pi) -> "ArcChain":
+        """
+        Replace runs of line-segments whose vertices lie on a common circle with CircularArcs. Useful for inputs which
+        are already flattened, such as dxf polylines or svg paths exported by CAD software.
+
+        Runs are grown greedily from the start of the chain. A run is accepted if its vertices, and the segments between
+        them, are within error_cap of an arc through its first and last vertex. Every other segment is kept as a Line.
+
+        :param line_chain: The LineSegmentChain to be simplified.
+        :param error_cap: the maximum acceptable deviation from the line-segments.
+        :param min_segments: the minimum number of consecutive line-segments replaced by an arc.
+        :param max_sweep: the largest angle, in radians, swept by a single arc.
+        :return: An ArcChain with the same start and end as line_chain.
+        """
+        error_cap = TOLERANCES['approximation'] if error_cap is None else error_cap
+
+        if error_cap <= 0:
+            raise ValueError(f"This algorithm is approximate. error_cap must be a non-zero positive float. Not {error_cap}")
+
+        vertices = line_chain.vertices.array
+        arc_chain = ArcChain()
+
+        i = 0
+        while i < len(vertices) - 1:
+            arc = None
+
+            # Grow the run one vertex at a time, until it no longer fits a circle
+            j = i + min_segments
+            while j < len(vertices):
+                candidate = ArcChain._fit_run(vertices[i:j + 1], error_cap, max_sweep)
+
+                if candidate is None:
+                    break
+
+                arc, j = candidate, j + 1
+
+            if arc is None:
+                arc_chain.append(Line(Vector(*vertices[i].tolist()), Vector(*vertices[i + 1].tolist())))
+                i += 1
+            else:
+                arc_chain.append(arc)
+                i = j - 1
+
+        return arc_chain
+
+    @staticmethod
+    def _fit_run(points: np.ndarray, error_cap: float, max_sweep: float):
+        """Return a CircularArc from the first to the last point which is within error_cap of the run, or None."""
+        segments = np.diff(points, axis=0)
+
+        # The run must turn consistently in one direction
+        turns = segments[:-1, 0] * segments[1:, 1] - segments[:-1, 1] * segments[1:, 0]
+        if not (np.all(turns > 0) or np.all(turns < 0)):
+            return None
+
+        start, end = points[0], points[-1]
+        chord = end - start
+        chord_length = math.hypot(*chord)
+
+        if chord_length == 0:
+            return None
+
+        # Least squares circle (Kasa fit), then the closest center on the bisector of the chord, such that the arc
+        # passes exactly through the first and the last point.
+        x, y = points[:, 0], points[:, 1]
+        (a, b, _), *_ = np.linalg.lstsq(np.column_stack((x, y, np.ones(len(x)))), -(x * x + y * y), rcond=None)
+        fitted_center = np.array((-a / 2, -b / 2))
+
+        midpoint = (start + end) / 2
+        normal = np.array((-chord[1], chord[0])) / chord_length
+        center = midpoint + ((fitted_center - midpoint) @ normal) * normal
+        radius = math.hypot(*(start - center))
+
+        if radius > ArcChain.max_radius_ratio * chord_length:
+            return None
+
+        # The deviation between the arc and a segment is at most the radial error of its ends plus its sagitta
+        radial_errors = np.abs(np.hypot(*(points - center).T) - radius)
+        half_lengths = np.minimum(np.hypot(*segments.T) / 2, radius)
+        sagittas = radius - np.sqrt(radius ** 2 - half_lengths ** 2)
+
+        if radial_errors.max() + sagittas.max() > error_cap:
+            return None
+
+        arc = CircularArc(Vector(*start.tolist()), Vector(*end.tolist()), Vector(*center.tolist()), turns[0] < 0)
+
+        # The arc must follow the run, not the complementary side of the circle
+        run_sweep = 2 * float(np.sum(np.arcsin(half_lengths / radius)))
+        if abs(abs(arc.sweep_angle) - run_sweep) > run_sweep / 10 or abs(arc.sweep_angle) > max_sweep:
+            return None
+
+        return arc
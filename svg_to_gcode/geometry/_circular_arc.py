@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from svg_to_gcode.geometry import Vector
 from svg_to_gcode.geometry import Curve
 from svg_to_gcode import formulas
@@ -7,25 +9,40 @@ from svg_to_gcode import TOLERANCES
 
 
 class CircularArc(Curve):
-    """The CircularArc class inherits from the abstract Curve class and describes a circular arc."""
+    """
+    The CircularArc class inherits from the abstract Curve class and describes a circular arc. The arc turns
+    counterclockwise from start to end, unless clockwise is True. If start and end are equivalent, it's a full circle.
+    """
 
-    __slots__ = 'center', 'radius', 'start_angle', 'end_angle'
+    __slots__ = 'center', 'radius', 'start_angle', 'end_angle', 'clockwise'
 
     # ToDo use different instantiation parameters to be consistent with elliptical arcs
-    def __init__(self, start: Vector, end: Vector, center: Vector):
+    def __init__(self, start: Vector, end: Vector, center: Vector, clockwise=False):
         self.start = start
         self.end = end
         self.center = center
+        self.clockwise = clockwise
 
         self.radius = abs(self.start - self.center)
         self.start_angle = self.point_to_angle(self.start)
         self.end_angle = self.point_to_angle(self.end)
 
+        # Unwrap the end angle in the direction of rotation
+        if clockwise:
+            while self.end_angle >= self.start_angle:
+                self.end_angle -= 2 * math.pi
+        else:
+            while self.end_angle <= self.start_angle:
+                self.end_angle += 2 * math.pi
+
     def __repr__(self):
-        return f"Arc(start: {self.start}, end: {self.end}, center: {self.center})"
+        return f"Arc(start: {self.start}, end: {self.end}, center: {self.center}, clockwise: {self.clockwise})"
 
     def length(self):
-        return abs(self.start_angle - self.end_angle) * self.radius
+        return abs(self.sweep_angle) * self.radius
+
+    def reversed(self):
+        return CircularArc(self.end, self.start, self.center, not self.clockwise)
 
     def angle_to_point(self, rad):
         at_origin = self.radius * Vector(math.cos(rad), math.sin(rad))
@@ -33,8 +50,12 @@ class CircularArc(Curve):
         return translated
 
     def point_to_angle(self, point: Vector):
-        translated = (point - self.center)/self.radius  # translate the point onto the unit circle
-        return math.acos(translated.x)
+        return math.atan2(point.y - self.center.y, point.x - self.center.x)
+
+    @property
+    def sweep_angle(self):
+        """The signed angle swept from start to end. Negative if the arc is clockwise."""
+        return self.end_angle - self.start_angle
 
     def point(self, t):
         angle = formulas.linear_map(self.start_angle, self.end_angle, t)
@@ -44,6 +65,14 @@ class CircularArc(Curve):
         position = self.point(t)
         return (self.center.x - position.x) / (position.y - self.center.y)
 
+    def points(self, ts):
+        angles = formulas.linear_map(self.start_angle, self.end_angle, np.asarray(ts, dtype=np.float64).ravel())
+        return self.radius * np.column_stack((np.cos(angles), np.sin(angles))) + (self.center.x, self.center.y)
+
+    def derivatives(self, ts):
+        angles = formulas.linear_map(self.start_angle, self.end_angle, np.asarray(ts, dtype=np.float64).ravel())
+        return self.sweep_angle * self.radius * np.column_stack((-np.sin(angles), np.cos(angles)))
+
     def sanity_check(self):
         # Assert that the Arc is not a point or a line
         try:
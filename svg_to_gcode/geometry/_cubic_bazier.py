@@ -1,3 +1,7 @@
+import math
+
+import numpy as np
+
 from svg_to_gcode.geometry import Vector
 from svg_to_gcode.geometry import Curve
 
@@ -5,7 +9,7 @@ from svg_to_gcode.geometry import Curve
 class CubicBazier(Curve):
     """The CubicBazier class inherits from the abstract Curve class and describes a cubic bazier."""
 
-    __slots__ = 'control1', 'control2'
+    __slots__ = 'control1', 'control2', '_length_table'
 
     def __init__(self, start: Vector, end: Vector, control1: Vector, control2: Vector):
 
@@ -17,6 +21,9 @@ class CubicBazier(Curve):
     def __repr__(self):
         return f"CubicBazier(start: {self.start}, end: {self.end}, control1: {self.control1}, control2: {self.control2})"
 
+    def reversed(self):
+        return CubicBazier(self.end, self.start, self.control2, self.control1)
+
     def point(self, t):
         return (1-t)**3 * self.start +\
                3 * (1-t)**2 * t * self.control1 +\
@@ -28,5 +35,30 @@ class CubicBazier(Curve):
                6 * (1-t) * t * (self.control2 - self.control1) +\
                3 * t**2 * (self.end - self.control2)
 
+    def _control_points(self) -> np.ndarray:
+        return np.array([tuple(self.start), tuple(self.control1), tuple(self.control2), tuple(self.end)])
+
+    def points(self, ts):
+        # Bernstein basis, evaluated for every t at once
+        t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+        s = 1 - t
+        p0, p1, p2, p3 = self._control_points()
+        return s**3 * p0 + 3 * s**2 * t * p1 + 3 * s * t**2 * p2 + t**3 * p3
+
+    def derivatives(self, ts):
+        t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+        s = 1 - t
+        p0, p1, p2, p3 = self._control_points()
+        return 3 * s**2 * (p1 - p0) + 6 * s * t * (p2 - p1) + 3 * t**2 * (p3 - p2)
+
+    def flattening_segments(self, tolerance: float) -> int:
+        """
+        Return the number of line-segments needed to approximate the curve within tolerance, using Wang's formula.
+        Segments are spaced uniformly in t.
+        """
+        p0, p1, p2, p3 = self._control_points()
+        second_differences = np.hypot(*np.array((p2 - 2 * p1 + p0, p3 - 2 * p2 + p1)).T)
+        return max(1, math.ceil(math.sqrt(3 / 4 * second_differences.max() / tolerance)))
+
     def sanity_check(self):
         pass
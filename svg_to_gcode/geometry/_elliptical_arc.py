@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from svg_to_gcode import formulas
 from svg_to_gcode.geometry import Vector, RotationMatrix
 from svg_to_gcode.geometry import Curve
@@ -8,10 +10,11 @@ from svg_to_gcode.geometry import Curve
 class EllipticalArc(Curve):
     """The EllipticalArc class inherits from the abstract Curve class and describes an elliptical arc."""
 
-    __slots__ = 'center', 'radii', 'rotation', 'start_angle', 'sweep_angle', 'end_angle', 'transformation'
+    __slots__ = 'center', 'radii', 'rotation', 'start_angle', 'sweep_angle', 'end_angle', 'transformation', \
+                '_origin', '_axis_x', '_axis_y', '_length_table'
 
-    # ToDo apply transformation beforehand (in Path) for consistency with other geometric objects. If you (the reader)
-    #  know how to easily apply an affine transformation to an ellipse feel free to make a pull request.
+    # The affine image of an ellipse is an ellipse. The rotation and the transformation are applied once, in __init__,
+    # such that each point is origin + cos(angle) * axis_x + sin(angle) * axis_y in output coordinates.
     def __init__(self, center: Vector, radii: Vector, rotation: float, start_angle: float, sweep_angle: float,
                  transformation: None):
 
@@ -23,6 +26,19 @@ class EllipticalArc(Curve):
         self.sweep_angle = sweep_angle
         self.transformation = transformation
 
+        # Pre-transform the ellipse into output coordinates
+        axis_x = RotationMatrix(rotation) * Vector(radii.x, 0)
+        axis_y = RotationMatrix(rotation) * Vector(0, radii.y)
+
+        if transformation:
+            center = transformation.apply_affine_transformation(center)
+            axis_x = transformation.apply_linear_transformation(axis_x)
+            axis_y = transformation.apply_linear_transformation(axis_y)
+
+        self._origin = (center.x, center.y)
+        self._axis_x = (axis_x.x, axis_x.y)
+        self._axis_y = (axis_y.x, axis_y.y)
+
         # Calculate missing data
         self.end_angle = start_angle + sweep_angle
         self.start = self.angle_to_point(self.start_angle)
@@ -34,18 +50,18 @@ class EllipticalArc(Curve):
         return f"EllipticalArc(start: {self.start}, end: {self.end}, center: {self.center}, radii: {self.radii}," \
                f" rotation: {self.rotation}, start_angle: {self.start_angle}, sweep_angle: {self.sweep_angle})"
 
+    def reversed(self):
+        return EllipticalArc(self.center, self.radii, self.rotation, self.end_angle, -self.sweep_angle,
+                             self.transformation)
+
     def point(self, t):
         angle = formulas.linear_map(self.start_angle, self.end_angle, t)
         return self.angle_to_point(angle)
 
     def angle_to_point(self, angle):
-        transformed_radii = Vector(self.radii.x * math.cos(angle), self.radii.y * math.sin(angle))
-        point = RotationMatrix(self.rotation) * transformed_radii + self.center
-
-        if self.transformation:
-            point = self.transformation.apply_affine_transformation(point)
-
-        return point
+        cos, sin = math.cos(angle), math.sin(angle)
+        return Vector(self._origin[0] + cos * self._axis_x[0] + sin * self._axis_y[0],
+                      self._origin[1] + cos * self._axis_x[1] + sin * self._axis_y[1])
 
     def derivative(self, t):
         angle = formulas.linear_map(self.start_angle, self.end_angle, t)
@@ -54,5 +70,79 @@ class EllipticalArc(Curve):
     def angle_to_derivative(self, rad):
         return -(self.radii.y / self.radii.x) * math.tan(rad)**-1
 
+    def _angles(self, ts) -> np.ndarray:
+        return formulas.linear_map(self.start_angle, self.end_angle, np.asarray(ts, dtype=np.float64).reshape(-1, 1))
+
+    def points(self, ts):
+        angles = self._angles(ts)
+        return np.array(self._origin) + np.cos(angles) * self._axis_x + np.sin(angles) * self._axis_y
+
+    def derivatives(self, ts):
+        angles = self._angles(ts)
+        return self.sweep_angle * (np.cos(angles) * self._axis_y - np.sin(angles) * self._axis_x)
+
+    def flattening_angles(self, tolerance: float, max_step=math.pi / 2) -> list:
+        """
+        Return the angles of the vertices of a line segment approximation, from start_angle to end_angle.
+
+        Each step is computed directly from the tolerance, without trial and error. In output coordinates, the chord
+        from angle a to a + step deviates from the ellipse by exactly
+            |axis_x x axis_y| * (1 - cos(step / 2)) / |d(point)/d(angle)|
+        at its middle angle, where |d(point)/d(angle)| is the local speed of the parameterization. The step is solved
+        for the lowest speed within the step, so the deviation never exceeds tolerance.
+
+        :param tolerance: the maximum acceptable deviation from the arc.
+        :param max_step: the largest step, in radians, regardless of the tolerance.
+        """
+        (ux, uy), (vx, vy) = self._axis_x, self._axis_y
+
+        # |axis_x x axis_y| is the product of the ellipse's semi-axes
+        area = abs(ux * vy - uy * vx)
+
+        # speed(angle)^2 = mean + amplitude * cos(2 * angle + phase)
+        u2, v2, uv = ux * ux + uy * uy, vx * vx + vy * vy, ux * vx + uy * vy
+        mean = (u2 + v2) / 2
+        amplitude = math.hypot((v2 - u2) / 2, uv)
+        phase = math.atan2(uv, (v2 - u2) / 2)
+
+        def min_speed(a, b):
+            x_a, x_b = 2 * a + phase, 2 * b + phase
+            if x_a > x_b:
+                x_a, x_b = x_b, x_a
+
+            # The speed is lowest at odd multiples of pi
+            if math.pi * (2 * math.ceil((x_a - math.pi) / (2 * math.pi)) + 1) <= x_b:
+                cos_min = -1
+            else:
+                cos_min = min(math.cos(x_a), math.cos(x_b))
+
+            return math.sqrt(max(mean + amplitude * cos_min, 0))
+
+        def step(speed):
+            if area == 0:
+                return max_step
+            return 2 * math.acos(max(1 - tolerance * speed / area, -1))
+
+        direction = 1 if self.sweep_angle >= 0 else -1
+        remaining = abs(self.sweep_angle)
+
+        angle = self.start_angle
+        angles = [angle]
+
+        while remaining > 0:
+            # Estimate the step at the current angle, then shrink it for the slowest speed within half of it
+            estimate = min(step(min_speed(angle, angle)), max_step, remaining)
+            increment = min(step(min_speed(angle, angle + direction * estimate / 2)), estimate)
+
+            if remaining - increment < 1e-12:
+                break
+
+            angle += direction * increment
+            remaining -= increment
+            angles.append(angle)
+
+        angles.append(self.end_angle)
+        return angles
+
     def sanity_check(self):
         pass
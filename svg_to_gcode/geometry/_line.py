@@ -2,6 +2,7 @@ from svg_to_gcode.geometry import Vector
 from svg_to_gcode.geometry import Curve
 from svg_to_gcode import formulas
 import math
+import numpy as np
 
 # A line segment
 class Line(Curve):
@@ -26,11 +27,21 @@ class Line(Curve):
     def length(self):
         return abs(self.start - self.end)
 
-    def point(self, t):
-        x = self.start.x + t * (self.end.x - self.start.x)
-        y = self.slope * x + self.offset
+    def reversed(self):
+        return Line(self.end, self.start)
 
-        return Vector(x, y)
+    def point(self, t):
+        # Interpolate both coordinates. y = slope * x + offset isn't defined for vertical lines.
+        return Vector(self.start.x + t * (self.end.x - self.start.x), self.start.y + t * (self.end.y - self.start.y))
 
     def derivative(self, t):
         return self.slope
+
+    def points(self, ts):
+        t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+        start = np.array((self.start.x, self.start.y))
+        return start + t * (np.array((self.end.x, self.end.y)) - start)
+
+    def derivatives(self, ts):
+        direction = (self.end.x - self.start.x, self.end.y - self.start.y)
+        return np.tile(np.array(direction, dtype=np.float64), (np.size(ts), 1))
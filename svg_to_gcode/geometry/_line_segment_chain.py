@@ -1,6 +1,11 @@
-from svg_to_gcode.geometry import Chain
-from svg_to_gcode.geometry import Curve, Line, Vector
-from svg_to_gcode import TOLERANCES
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from svg_to_gcode.geometry import Chain, Polyline
+from svg_to_gcode.geometry import Curve, Line
+from svg_to_gcode.geometry import CubicBazier, QuadraticBezier, EllipticalArc
+from svg_to_gcode import TOLERANCES, FLATTENING_METHODS, formulas
 
 
 class LineSegmentChain(Chain):
@@ -10,27 +15,153 @@ class LineSegmentChain(Chain):
 
     LineSegmentChains can be instantiated either conventionally or through the static method line_segment_approximation(),
     which approximates any Curve with a series of line-segments contained in a new LineSegmentChain instance.
+
+    The vertices are stored in a single Polyline rather than as Line objects. Lines are only created when they're
+    accessed, through iteration or get(). They are copies, modifying them doesn't modify the chain. Use self.vertices or
+    translate() instead.
+
+    The length index is computed from the vertices when it's first needed, and discarded whenever lines are added or
+    removed.
     """
+
+    __slots__ = '_vertices'
+
+    def __init__(self, curves=None, vertices=None):
+        """
+        :param curves: An iterable of continuous Lines.
+        :param vertices: Alternatively, the vertices of the chain. Anything accepted by Polyline().
+        """
+        self._vertices = Polyline(vertices)
+        self._ends = None
+
+        if curves is not None:
+            self.extend(curves)
+
     def __repr__(self):
-        return f"{type(self)}({len(self._curves)} curves: {[line.__repr__() for line in self._curves[:2]]}...)"
+        return f"{type(self)}({self.chain_size()} curves: {[line.__repr__() for line in self._lines(0, 2)]}...)"
+
+    @property
+    def vertices(self) -> Polyline:
+        """The chain's vertices. The i-th line goes from vertex i to vertex i+1."""
+        return self._vertices
+
+    @property
+    def _curves(self) -> list:
+        # Compatibility with the generic Chain methods, which expect a list of curves.
+        return self._lines()
+
+    def _lines(self, start=0, stop=None) -> list:
+        points = list(self._vertices[start:None if stop is None else stop + 1])
+        return [Line(points[i], points[i + 1]) for i in range(len(points) - 1)]
+
+    def __iter__(self):
+        # Consecutive lines share a vertex, like lines which were joined by append()
+        yield from self._lines()
+
+    @property
+    def start(self):
+        return self._vertices[0]
+
+    @property
+    def end(self):
+        return self._vertices[-1]
+
+    def chain_size(self):
+        return self._vertices.segment_count()
+
+    def get(self, index: int) -> Line:
+        if index < 0:
+            index += self.chain_size()
+
+        if not 0 <= index < self.chain_size():
+            raise IndexError("LineSegmentChain index out of range")
+
+        return Line(self._vertices[index], self._vertices[index + 1])
+
+    def length(self):
+        return self._vertices.length()
 
     def append(self, line2: Line):
-        if self._curves:
-            line1 = self._curves[-1]
+        vertices = self._vertices
+
+        if len(vertices):
+            end = vertices[-1]
 
             # Assert continuity
-            if abs(line1.end - line2.start) > TOLERANCES['input']:
+            if abs(end - line2.start) > TOLERANCES['input']:
                 raise ValueError(f"The end of the last line is different from the start of the new line"
-                                 f"|{line1.end} - {line2.start}| >= {TOLERANCES['input']}")
+                                 f"|{end} - {line2.start}| >= {TOLERANCES['input']}")
+        else:
+            vertices.append(line2.start.x, line2.start.y)
+
+        # Join lines. The start of line2 is replaced by the end of the last line.
+        vertices.append(line2.end.x, line2.end.y)
+        self._ends = None
+
+    def merge(self, chain: "LineSegmentChain"):
+        if not chain.chain_size():
+            return
+
+        if self.chain_size():
+            self.append(chain.get(0))
+            self._vertices.extend(chain.vertices.array[2:])
+        else:
+            self._vertices.extend(chain.vertices.array)
+
+        self._ends = None
 
-            # Join lines
-            line2.start = line1.end
+    def remove_from_first(self, number_of_curves: int):
+        # Removing every line mustn't leave the last vertex behind, later lines would be joined onto it
+        if number_of_curves >= self.chain_size():
+            self._vertices.truncate(stop=0)
+        else:
+            self._vertices.truncate(start=number_of_curves)
+        self._ends = None
 
-        self._curves.append(line2)
+    def remove_from_last(self, number_of_curves: int):
+        if number_of_curves >= self.chain_size():
+            self._vertices.truncate(stop=0)
+        else:
+            self._vertices.truncate(stop=len(self._vertices) - number_of_curves)
+        self._ends = None
+
+    def _length_index(self) -> np.ndarray:
+        if self._ends is None:
+            self._ends = np.cumsum(self._vertices.segment_lengths())
+
+        return self._ends
+
+    def points(self, ts):
+        if self.chain_size() == 0:
+            raise ValueError("LineSegmentChain.points was called before adding any lines to the chain.")
+
+        # Interpolate between the vertices directly, without creating any Line objects
+        indices, line_ts = self._get_curve_ts(ts, self._length_index())
+        return self._vertices.array[indices] + line_ts.reshape(-1, 1) * self._vertices.segment_vectors()[indices]
+
+    def derivatives(self, ts):
+        if self.chain_size() == 0:
+            raise ValueError("LineSegmentChain.derivatives was called before adding any lines to the chain.")
+
+        ends = self._length_index()
+        lengths = np.diff(ends, prepend=0)
+        indices, _ = self._get_curve_ts(ts, ends)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            directions = self._vertices.segment_vectors()[indices] / lengths[indices].reshape(-1, 1)
+
+        return np.nan_to_num(directions) * ends[-1]
+
+    def reversed(self):
+        return LineSegmentChain(vertices=self.vertices.array[::-1])
+
+    def translate(self, x: float, y: float):
+        """Translate every vertex of the chain in place."""
+        self._vertices.translate(x, y)
 
     @staticmethod
-    def line_segment_approximation(shape, increment_growth=11 / 10, error_cap=None, error_floor=None)\
-            -> "LineSegmentChain":
+    def line_segment_approximation(shape, increment_growth=11 / 10, error_cap=None, error_floor=None,
+                                   method="adaptive") -> "LineSegmentChain":
         """
         This method approximates any shape using straight line segments.
 
@@ -38,6 +169,9 @@ class LineSegmentChain(Chain):
         :param increment_growth: the scale by which line_segments grow and shrink. Must be > 1.
         :param error_cap: the maximum acceptable deviation from the curve.
         :param error_floor: the maximum minimum deviation from the curve before segment length starts growing again.
+        :param method: 'adaptive' grows and shrinks segments by trial and error. 'wang' computes the number of segments
+        of beziers directly, see bezier_approximation(). Elliptical arcs are always approximated with
+        arc_approximation() and other shapes are always approximated adaptively.
         :return: A LineSegmentChain which approximates the given shape.
         """
 
@@ -50,26 +184,49 @@ class LineSegmentChain(Chain):
         if increment_growth <= 1:
             raise ValueError(f"increment_growth must be > 1. Not {increment_growth}")
 
+        if method not in FLATTENING_METHODS:
+            raise ValueError(f"Unknown flattening method {method}. Please specify one of the following: "
+                             f"{FLATTENING_METHODS}")
+
         lines = LineSegmentChain()
 
         if isinstance(shape, Line):
             lines.append(shape)
             return lines
 
+        if isinstance(shape, LineSegmentChain):
+            lines.merge(shape)
+            return lines
+
+        if isinstance(shape, EllipticalArc):
+            return LineSegmentChain.arc_approximation(shape, error_cap)
+
+        if method == "wang" and isinstance(shape, (CubicBazier, QuadraticBezier)):
+            return LineSegmentChain.bezier_approximation(shape, error_cap)
+
         t = 0
-        line_start = shape.start
+        line_start = np.array((shape.start.x, shape.start.y))
         increment = 5
 
+        lines.vertices.append(*line_start)
+
+        # Same samples as Curve.max_distance(). Each candidate segment costs a single call to shape.points()
+        samples = np.arange(1, 10) / 10
+        ts = np.empty(len(samples) + 1)
+
         while t < 1:
             new_t = t + increment
 
             if new_t > 1:
                 new_t = 1
 
-            line_end = shape.point(new_t)
-            line = Line(line_start, line_end)
+            ts[0] = new_t
+            ts[1:] = formulas.linear_map(t, new_t, samples)
+            points = shape.points(ts)
 
-            distance = Curve.max_distance(shape, line, t_range1=(t, new_t))
+            line_end = points[0]
+            difference = points[1:] - (line_start + samples.reshape(-1, 1) * (line_end - line_start))
+            distance = np.hypot(difference[:, 0], difference[:, 1]).max()
 
             # If the error is too high, reduce increment and restart cycle
             if distance > error_cap:
@@ -80,9 +237,144 @@ class LineSegmentChain(Chain):
             if distance < error_floor:
                 increment *= increment_growth
 
-            lines.append(line)
+            lines.vertices.append(*line_end)
 
             line_start = line_end
             t = new_t
 
         return lines
+
+
+    @staticmethod
+    def bezier_approximation(shape, error_cap=None) -> "LineSegmentChain":
+        """
+        Approximate a CubicBazier or QuadraticBezier with line segments, without trial and error. Wang's formula bounds
+        the deviation of uniformly spaced segments, so the number of segments is computed upfront and every vertex is
+        evaluated in a single call to shape.points().
+
+        The deviation is guaranteed to be within error_cap, not only at sampled points. The bound is conservative, so
+        it may produce more segments than the adaptive approximation on unevenly curved beziers.
+
+        :param shape: The bezier to be approximated.
+        :param error_cap: the maximum acceptable deviation from the curve.
+        :return: A LineSegmentChain which approximates the given bezier.
+        """
+        error_cap = TOLERANCES['approximation'] if error_cap is None else error_cap
+
+        if error_cap <= 0:
+            raise ValueError(f"This algorithm is approximate. error_cap must be a non-zero positive float. Not {error_cap}")
+
+        segments = shape.flattening_segments(error_cap)
+        return LineSegmentChain(vertices=shape.points(np.linspace(0, 1, segments + 1)))
+
+
+    @staticmethod
+    def arc_approximation(shape: EllipticalArc, error_cap=None) -> "LineSegmentChain":
+        """
+        Approximate an EllipticalArc with line segments, without trial and error. The arc is flattened in output
+        coordinates, after its transformation, with angular steps computed from the tolerance and the local radius. See
+        EllipticalArc.flattening_angles().
+
+        :param shape: The arc to be approximated.
+        :param error_cap: the maximum acceptable deviation from the arc.
+        :return: A LineSegmentChain which approximates the given arc.
+        """
+        error_cap = TOLERANCES['approximation'] if error_cap is None else error_cap
+
+        if error_cap <= 0:
+            raise ValueError(f"This algorithm is approximate. error_cap must be a non-zero positive float. Not {error_cap}")
+
+        angles = np.array(shape.flattening_angles(error_cap))
+        ts = (angles - shape.start_angle) / shape.sweep_angle if shape.sweep_angle else np.zeros(len(angles))
+
+        return LineSegmentChain(vertices=shape.points(ts))
+
+
+class ApproximationCache:
+    """
+    The ApproximationCache class shares line segment approximations between curves which only differ by a translation,
+    such as the instances of a <use> element or identical parts tiled across a sheet.
+
+    Approximations are stored relative to the start of their curve. Every call returns a new LineSegmentChain, so
+    callers may modify the result.
+    """
+
+    # Relative coordinates are rounded so that translated copies of a curve share the same key despite rounding errors
+    key_precision = 9
+
+    __slots__ = 'approximation_options', 'max_size', 'hits', 'misses', '_approximations'
+
+    def __init__(self, max_size=1024, **approximation_options):
+        """
+        :param max_size: The maximum number of distinct approximations which are kept.
+        :param approximation_options: Keyword arguments passed on to LineSegmentChain.line_segment_approximation().
+        """
+        self.approximation_options = approximation_options
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._approximations = {}
+
+    def __repr__(self):
+        return f"ApproximationCache(hits: {self.hits}, misses: {self.misses}, size: {len(self._approximations)})"
+
+    def approximate(self, curve: Curve) -> LineSegmentChain:
+        """Equivalent to LineSegmentChain.line_segment_approximation(curve, **self.approximation_options)"""
+        key = self._key(curve)
+
+        if key is None:
+            return LineSegmentChain.line_segment_approximation(curve, **self.approximation_options)
+
+        relative_vertices = self._approximations.get(key)
+
+        if relative_vertices is None:
+            self.misses += 1
+            line_chain = LineSegmentChain.line_segment_approximation(curve, **self.approximation_options)
+
+            if len(self._approximations) < self.max_size:
+                self._approximations[key] = line_chain.vertices - curve.start
+
+            return line_chain
+
+        self.hits += 1
+        return LineSegmentChain(vertices=relative_vertices + curve.start)
+
+    def _key(self, curve: Curve):
+        """Describe the shape of a curve independently of its position. None if the curve can't be cached."""
+        precision = self.key_precision
+        origin = curve.start
+
+        def relative(point):
+            return round(point.x - origin.x, precision), round(point.y - origin.y, precision)
+
+        if isinstance(curve, CubicBazier):
+            return CubicBazier, relative(curve.control1), relative(curve.control2), relative(curve.end)
+
+        if isinstance(curve, QuadraticBezier):
+            return QuadraticBezier, relative(curve.control), relative(curve.end)
+
+        if isinstance(curve, EllipticalArc):
+            # The shape of an arc only depends on the linear part of its transformation
+            matrix = curve.transformation.affine_matrix if curve.transformation else None
+            linear = (1.0, 0.0, 0.0, 1.0) if matrix is None else (matrix.a, matrix.b, matrix.c, matrix.d)
+
+            return (EllipticalArc, round(curve.radii.x, precision), round(curve.radii.y, precision), curve.rotation,
+                    curve.start_angle, curve.sweep_angle, *(round(value, precision) for value in linear))
+
+        return None
+
+
+def approximate_iter(curves: Iterable[Curve], **approximation_options) -> Iterator[LineSegmentChain]:
+    """
+    Lazily approximate curves with line segments. Each curve is only approximated when the next chain is requested.
+
+    Approximations are shared between curves which only differ by a translation (see ApproximationCache).
+
+    :param curves: An iterable of curves, generally a parser generator such as svg_parser.parse_iter().
+    :param approximation_options: Keyword arguments passed on to LineSegmentChain.line_segment_approximation().
+    :return: A generator of LineSegmentChains, one per curve.
+    """
+    approximation_cache = ApproximationCache(**approximation_options)
+
+    for curve in curves:
+        yield approximation_cache.approximate(curve)
@@ -1,5 +1,7 @@
 import math
 
+from array import array
+
 from svg_to_gcode.geometry import Vector
 
 
@@ -80,3 +82,103 @@ class RotationMatrix(Matrix):
             matrix_list = [[math.cos(angle), math.sin(angle)],
                            [-math.sin(angle), math.cos(angle)]]
         super().__init__(matrix_list)
+
+
+class AffineMatrix:
+    """
+    The AffineMatrix class represents a 2D affine transformation, ie. the 3x3 matrix
+        [a c e]
+        [b d f]
+        [0 0 1]
+    using the same a-f naming as the svg matrix() transform. https://www.w3.org/TR/css-transforms-1/#MatrixDefined
+
+    Only the six meaningful entries are stored and every operation is written out by hand. It's much faster than the
+    generic Matrix class for composing transformations and for transforming large numbers of points.
+    """
+    __slots__ = 'a', 'b', 'c', 'd', 'e', 'f'
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=1.0, e=0.0, f=0.0):
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.e = e
+        self.f = f
+
+    def __repr__(self):
+        return f"AffineMatrix({self.a}, {self.b}, {self.c}, {self.d}, {self.e}, {self.f})"
+
+    def __iter__(self):
+        yield from (self.a, self.b, self.c, self.d, self.e, self.f)
+
+    def __eq__(self, other):
+        return isinstance(other, AffineMatrix) and tuple(self) == tuple(other)
+
+    def __mul__(self, other):
+        if isinstance(other, Vector):
+            return self.apply_to_vector(other)
+
+        if isinstance(other, AffineMatrix):
+            return self.multiply_affine_matrix(other)
+
+        raise TypeError(f"can't multiply affine matrix by type '{type(other)}'")
+
+    def multiply_affine_matrix(self, other: "AffineMatrix") -> "AffineMatrix":
+        """Compose two transformations. The result applies other first and self second."""
+        return AffineMatrix(self.a * other.a + self.c * other.b,
+                            self.b * other.a + self.d * other.b,
+                            self.a * other.c + self.c * other.d,
+                            self.b * other.c + self.d * other.d,
+                            self.a * other.e + self.c * other.f + self.e,
+                            self.b * other.e + self.d * other.f + self.f)
+
+    def apply(self, x: float, y: float) -> tuple:
+        """Transform the point (x, y). Scalar fast path which doesn't allocate any Vectors."""
+        return self.a * x + self.c * y + self.e, self.b * x + self.d * y + self.f
+
+    def apply_to_vector(self, vector: Vector) -> Vector:
+        """Transform a point, including the translation."""
+        return Vector(self.a * vector.x + self.c * vector.y + self.e, self.b * vector.x + self.d * vector.y + self.f)
+
+    def apply_linear(self, vector: Vector) -> Vector:
+        """Apply only the linear component (no translation) to a vector. Eg. to a direction or to radii."""
+        return Vector(self.a * vector.x + self.c * vector.y, self.b * vector.x + self.d * vector.y)
+
+    def apply_to_coordinates(self, coordinates) -> array:
+        """
+        Transform a whole buffer of points in one call.
+
+        :param coordinates: a flat sequence of x, y pairs. Eg. array('d', [x0, y0, x1, y1, ...])
+        :return: a new array('d') of transformed x, y pairs.
+        """
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+
+        transformed = array('d', coordinates)
+        xs = coordinates[0::2]
+        ys = coordinates[1::2]
+        transformed[0::2] = array('d', [a * x + c * y + e for x, y in zip(xs, ys)])
+        transformed[1::2] = array('d', [b * x + d * y + f for x, y in zip(xs, ys)])
+
+        return transformed
+
+    def determinant(self) -> float:
+        return self.a * self.d - self.b * self.c
+
+    def inverse(self) -> "AffineMatrix":
+        """Return the transformation which undoes self. Eg. to map output coordinates back into svg user units."""
+        determinant = self.determinant()
+
+        if determinant == 0:
+            raise ValueError(f"{self} is singular and can't be inverted")
+
+        a, b, c, d = self.d / determinant, -self.b / determinant, -self.c / determinant, self.a / determinant
+        return AffineMatrix(a, b, c, d, -(a * self.e + c * self.f), -(b * self.e + d * self.f))
+
+    def to_matrix(self) -> Matrix:
+        """Return the equivalent 4x4 Matrix, as used for 3D homogeneous coordinates."""
+        return Matrix([
+            [self.a, self.c, 0, self.e],
+            [self.b, self.d, 0, self.f],
+            [0,      0,      1, 0],
+            [0,      0,      0, 1]
+        ])
@@ -0,0 +1,146 @@
+import numpy as np
+
+from svg_to_gcode.geometry import Vector
+
+
+class PointArray:
+    """
+    The PointArray class stores a sequence of 2D points in a single (N, 2) float64 numpy buffer.
+
+    Arithmetic is vectorised and applies to every point at once. Individual points are only converted into Vector
+    objects when they're accessed. Those vectors are copies, modifying them doesn't modify the array.
+    """
+
+    __slots__ = '_buffer', '_size'
+
+    def __init__(self, points=None):
+        """
+        :param points: An (N, 2) array-like, a flat [x0, y0, x1, y1, ...] sequence or an iterable of Vectors.
+        """
+        self._buffer = self._to_array(points)
+        self._size = len(self._buffer)
+
+    @staticmethod
+    def _to_array(points) -> np.ndarray:
+        if points is None:
+            return np.empty((0, 2))
+
+        if isinstance(points, PointArray):
+            return points.array.copy()
+
+        if not isinstance(points, np.ndarray):
+            points = [tuple(point) if isinstance(point, Vector) else point for point in points]
+
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.array.tolist()})"
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def array(self) -> np.ndarray:
+        """An (N, 2) view of the points. Modifying it modifies the PointArray."""
+        return self._buffer[:self._size]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.array[index])
+
+        x, y = self.array[index]
+        return Vector(float(x), float(y))
+
+    def __iter__(self):
+        for x, y in self.array.tolist():
+            yield Vector(x, y)
+
+    def append(self, x: float, y: float):
+        """Append a point. The buffer grows geometrically, so appending is amortised O(1)."""
+        if self._size == len(self._buffer):
+            buffer = np.empty((max(8, 2 * self._size), 2))
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+
+        self._buffer[self._size] = x, y
+        self._size += 1
+
+    def extend(self, points):
+        """Append several points at once."""
+        points = self._to_array(points)
+
+        if self._size + len(points) > len(self._buffer):
+            buffer = np.empty((max(8, 2 * (self._size + len(points))), 2))
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+
+        self._buffer[self._size:self._size + len(points)] = points
+        self._size += len(points)
+
+    def truncate(self, start=0, stop=None):
+        """Only keep the points in [start, stop)."""
+        points = self.array[start:stop].copy()
+        self._buffer = points
+        self._size = len(points)
+
+    # Vectorised arithmetic. Vectors, (x, y) tuples and arrays are broadcast onto every point.
+    @staticmethod
+    def _operand(other):
+        if isinstance(other, PointArray):
+            return other.array
+
+        if isinstance(other, Vector):
+            return np.array((other.x, other.y))
+
+        return other
+
+    def __add__(self, other):
+        return type(self)(self.array + self._operand(other))
+
+    def __sub__(self, other):
+        return type(self)(self.array - self._operand(other))
+
+    def __mul__(self, other):
+        return type(self)(self.array * self._operand(other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return type(self)(self.array / self._operand(other))
+
+    def __abs__(self) -> np.ndarray:
+        """The magnitude of every point."""
+        return np.hypot(self.array[:, 0], self.array[:, 1])
+
+    def translate(self, x: float, y: float):
+        """Translate every point in place."""
+        self.array[:] += (x, y)
+
+    def apply(self, affine_matrix):
+        """Return a new PointArray with an AffineMatrix applied to every point."""
+        a, b, c, d, e, f = affine_matrix
+        points = self.array
+        return type(self)(np.column_stack((a * points[:, 0] + c * points[:, 1] + e,
+                                           b * points[:, 0] + d * points[:, 1] + f)))
+
+
+class Polyline(PointArray):
+    """
+    The Polyline class is a PointArray whose consecutive points are joined by straight line-segments.
+    """
+
+    __slots__ = ()
+
+    def segment_count(self) -> int:
+        return max(self._size - 1, 0)
+
+    def segment_vectors(self) -> np.ndarray:
+        """An (N-1, 2) array of the vectors from the start to the end of each segment."""
+        return np.diff(self.array, axis=0)
+
+    def segment_lengths(self) -> np.ndarray:
+        segments = self.segment_vectors()
+        return np.hypot(segments[:, 0], segments[:, 1])
+
+    def length(self) -> float:
+        return float(self.segment_lengths().sum())
@@ -1,3 +1,7 @@
+import math
+
+import numpy as np
+
 from svg_to_gcode.geometry import Vector
 from svg_to_gcode.geometry import Curve
 
@@ -5,7 +9,7 @@ from svg_to_gcode.geometry import Curve
 class QuadraticBezier(Curve):
     """The QuadraticBezier class inherits from the abstract Curve class and describes a quadratic bezier."""
 
-    __slots__ = 'control'
+    __slots__ = 'control', '_length_table'
 
     def __init__(self, start: Vector, end: Vector, control: Vector):
 
@@ -18,12 +22,36 @@ class QuadraticBezier(Curve):
     def __repr__(self):
         return f"QuadraticBezier(start: {self.start}, end: {self.end}, control: {self.control})"
 
+    def reversed(self):
+        return QuadraticBezier(self.end, self.start, self.control)
+
     def point(self, t):
         return self.control + ((1 - t)**2) * (self.start - self.control) + (t**2) * (self.end - self.control)
 
     def derivative(self, t):
         return 2 * (1 - t) * (self.control - self.start) + 2 * t * (self.end - self.control)
 
+    def _control_points(self) -> np.ndarray:
+        return np.array([tuple(self.start), tuple(self.control), tuple(self.end)])
+
+    def points(self, ts):
+        t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+        p0, p1, p2 = self._control_points()
+        return p1 + (1 - t)**2 * (p0 - p1) + t**2 * (p2 - p1)
+
+    def derivatives(self, ts):
+        t = np.asarray(ts, dtype=np.float64).reshape(-1, 1)
+        p0, p1, p2 = self._control_points()
+        return 2 * (1 - t) * (p1 - p0) + 2 * t * (p2 - p1)
+
+    def flattening_segments(self, tolerance: float) -> int:
+        """
+        Return the number of line-segments needed to approximate the curve within tolerance, using Wang's formula.
+        Segments are spaced uniformly in t.
+        """
+        p0, p1, p2 = self._control_points()
+        return max(1, math.ceil(math.sqrt(1 / 4 * math.hypot(*(p2 - 2 * p1 + p0)) / tolerance)))
+
     def sanity_check(self):
         # ToDo verify if self.start == self.end forms a valid curve under the svg standard
         pass
@@ -1,67 +1,228 @@
-"""
-This is an unfinished class which should not be committed yet.
-"""
+import math
 
-from svg_to_gcode.geometry import Chain
-from svg_to_gcode.geometry import CircularArc
-from svg_to_gcode import TOLERANCES, formulas
+import numpy as np
 
+from svg_to_gcode.geometry import Vector
+from svg_to_gcode.geometry import Line, CircularArc, EllipticalArc, ArcChain
+from svg_to_gcode import TOLERANCES
 
-class SmoothArcChain(Chain):
+
+class SmoothArcChain(ArcChain):
+    """
+    The SmoothArcChain class inherits form the ArcChain class. It represents a series of tangent-continuous circular
+    arcs, which can be drawn with native arc commands (G2/G3) instead of many short line-segments.
+
+    SmoothArcChains are generally instantiated through the static method arc_approximation(), which fits biarcs to any
+    smooth curve. Straight sections are represented by Lines.
+    """
+
+    # Each curve is split in at most 2 ** max_depth sections before the approximation gives up on arcs
+    max_depth = 12
 
     def __repr__(self):
         return f"SmoothArcs({[arc.__repr__() for arc in self._curves]})"
 
-    def append(self, arc2: CircularArc):
+    def append(self, arc2):
+        """Append a CircularArc, or a Line, to the chain. Consecutive arcs must join tangentially."""
 
         if self._curves:
             arc1 = self._curves[-1]
 
-            # Assert continuity
-            try:
-                assert abs(arc1.end - arc2.start) < TOLERANCES['input']
-            except AssertionError:
-                raise ValueError(f"The end of the last arc is different from the start of the new arc, "
-                                 f"|{arc1.end} - {arc2.start}| >= {TOLERANCES['input']}")
+            if isinstance(arc1, CircularArc) and isinstance(arc2, CircularArc):
+                tangent1, tangent2 = _unit(arc1.derivatives([1])[0]), _unit(arc2.derivatives([0])[0])
+
+                if np.hypot(*(tangent1 - tangent2)) > TOLERANCES['input']:
+                    raise ValueError(f"The last arc and the new arc form a discontinues curve, "
+                                     f"|{tangent1} - {tangent2}| >= {TOLERANCES['input']}")
+
+        # Assert continuity and join arcs
+        super().append(arc2)
+
+    @staticmethod
+    def arc_approximation(shape, error_cap=None) -> "SmoothArcChain":
+        """
+        Approximate a curve with tangent-continuous circular arcs.
+
+        Lines are kept as they are and circular EllipticalArcs are converted exactly. Any other curve is split into
+        sections, each of which is replaced by a biarc: two arcs which match the position and the tangent of the curve at
+        both ends of the section. Sections are halved until their biarc is within error_cap.
+
+        :param shape: The shape to be approximated. It must implement points() and derivatives().
+        :param error_cap: the maximum acceptable deviation from the curve.
+        :return: A SmoothArcChain which approximates the given shape.
+        """
+        error_cap = TOLERANCES['approximation'] if error_cap is None else error_cap
+
+        if error_cap <= 0:
+            raise ValueError(f"This algorithm is approximate. error_cap must be a non-zero positive float. Not {error_cap}")
+
+        arcs = SmoothArcChain()
+
+        if isinstance(shape, Line):
+            arcs.append(shape)
+            return arcs
+
+        if isinstance(shape, EllipticalArc) and _is_circular(shape):
+            return SmoothArcChain._circle_to_arcs(shape)
+
+        sections = [(0.0, 1.0, 0)]
+        while sections:
+            t0, t1, depth = sections.pop()
+            biarc = SmoothArcChain._fit_biarc(shape, t0, t1)
+
+            if biarc is not None and SmoothArcChain._deviation(shape, t0, t1, biarc) <= error_cap:
+                arcs.extend(biarc)
+            elif depth < SmoothArcChain.max_depth:
+                # Sections are popped from the end, so the first half is pushed last
+                t_mid = (t0 + t1) / 2
+                sections.append((t_mid, t1, depth + 1))
+                sections.append((t0, t_mid, depth + 1))
+            else:
+                start, end = shape.points([t0, t1])
+                if not np.allclose(start, end):
+                    arcs.append(Line(Vector(*start.tolist()), Vector(*end.tolist())))
+
+        return arcs
+
+    @staticmethod
+    def cubic_bazier_to_arcs(bazier, error_cap=None) -> "SmoothArcChain":
+        """Approximate a CubicBazier with biarcs. Equivalent to arc_approximation()."""
+        return SmoothArcChain.arc_approximation(bazier, error_cap)
+
+    @staticmethod
+    def _circle_to_arcs(shape: EllipticalArc) -> "SmoothArcChain":
+        (ux, uy), (vx, vy) = shape._axis_x, shape._axis_y
+        clockwise = (ux * vy - uy * vx) * shape.sweep_angle < 0
+        center = Vector(*shape._origin)
 
-            try:
-                assert abs(arc1.derivative(arc1.end) - arc2.derivative(arc2.start)) < TOLERANCES['input']
-            except AssertionError:
-                raise ValueError(f"The last arc and the new arc form a discontinues curve, "
-                                 f"|{arc1.derivative(1)} - {arc2.derivative(0)}| >= {TOLERANCES['input']}")
+        # Quarter turns at most, a single arc command can't describe a full circle unambiguously.
+        sections = max(1, math.ceil(abs(shape.sweep_angle) / (math.pi / 2) - 1e-9))
+        points = [Vector(x, y) for x, y in shape.points(np.linspace(0, 1, sections + 1)).tolist()]
 
-            # Join arcs
-            arc2.start = arc1.end
+        arcs = SmoothArcChain()
+        for start, end in zip(points, points[1:]):
+            arcs.append(CircularArc(start, end, center, clockwise))
 
-        self._curves.append(arc2)
+        return arcs
 
     @staticmethod
-    def cubic_bazier_to_arcs(bazier, _arcs=None):
+    def _tangent(shape, t):
+        """
+        The unit tangent at t. The same t always gives the same tangent, so consecutive biarcs join smoothly. None at
+        cusps, where the curve stops and turns back.
+        """
+        tangent = shape.derivatives([t])[0]
 
-        smooth_arcs = _arcs if _arcs else SmoothArcChain()
+        if np.hypot(*tangent) < 1e-9:
+            # The derivative vanishes where a control point coincides with an end point. Use a central difference.
+            step = 1e-4
+            before, after = shape.points([max(t - step, 0), min(t + step, 1)])
+            tangent = after - before
+
+        return _unit(tangent)
+
+    @staticmethod
+    def _fit_biarc(shape, t0, t1):
+        """
+        Fit a biarc to the section [t0, t1] of a shape. Return a list of curves, or None if no suitable biarc exists.
+        Based on https://www.ryanjuckett.com/biarc-interpolation/
+        """
+        p1, p2 = shape.points([t0, t1])
+        t1_, t2_ = SmoothArcChain._tangent(shape, t0), SmoothArcChain._tangent(shape, t1)
+
+        v = p2 - p1
+        v_dot_v = v @ v
+
+        if v_dot_v < 1e-18:
+            return None
+
+        # At cusps, the section leaves or arrives along its chord
+        t1_ = _unit(v) if t1_ is None else t1_
+        t2_ = _unit(v) if t2_ is None else t2_
+
+        t = t1_ + t2_
+        denominator = 2 * (1 - t1_ @ t2_)
+
+        if denominator < 1e-12:
+            # Parallel tangents
+            v_dot_t2 = v @ t2_
+            if abs(v_dot_t2) < 1e-12:
+                return None
+            d = v_dot_v / (4 * v_dot_t2)
+        else:
+            v_dot_t = v @ t
+            d = (-v_dot_t + math.sqrt(v_dot_t ** 2 + denominator * v_dot_v)) / denominator
+
+        joint = (p1 + p2 + d * (t1_ - t2_)) / 2
+
+        arc1 = SmoothArcChain._tangent_arc(p1, t1_, joint)
+        arc2 = SmoothArcChain._tangent_arc(p2, t2_, joint, reverse=True)
+
+        if arc1 is None or arc2 is None:
+            return None
+
+        return [curve for curve in (arc1, arc2) if not isinstance(curve, Line) or curve.length() > 0]
+
+    @staticmethod
+    def _tangent_arc(point, tangent, other, reverse=False):
+        """
+        The arc which is tangent to tangent at point and passes through other. If reverse is True, the arc ends at
+        point rather than starting there. Lines are returned for straight arcs and None for arcs longer than a half-turn.
+        """
+        w = other - point
+        chord = math.hypot(*w)
+        normal = np.array((-tangent[1], tangent[0]))
+        normal_offset = 2 * (normal @ w)
+
+        start, end = Vector(*point.tolist()), Vector(*other.tolist())
+        if reverse:
+            start, end = end, start
+
+        if abs(normal_offset) * SmoothArcChain.max_radius_ratio <= chord:
+            return Line(start, end) if tangent @ w * (-1 if reverse else 1) >= 0 else None
+
+        # The center lies on the normal, at the same distance from both points. Positive radii turn counterclockwise.
+        radius = (w @ w) / normal_offset
+        center = Vector(*(point + radius * normal).tolist())
+        arc = CircularArc(start, end, center, clockwise=radius < 0)
+
+        return arc if abs(arc.sweep_angle) <= math.pi else None
+
+    @staticmethod
+    def _deviation(shape, t0, t1, biarc, samples=32) -> float:
+        """Sample the section [t0, t1] of shape and return the largest distance from the biarc."""
+        points = shape.points(np.linspace(t0, t1, samples + 2)[1:-1])
+        return float(np.min([_distances(curve, points) for curve in biarc], axis=0).max())
 
-        start, control1, control2, end = bazier.start, bazier.control1, bazier.control2, bazier.end
-        tangent_intersect = formulas.line_intersect(start, control1, end, control2)
 
-        # print("tangent_intersect:", tangent_intersect)
+def _unit(vector):
+    """The unit vector in the direction of vector, or None if its length is 0."""
+    length = math.hypot(*vector)
+    return np.asarray(vector) / length if length > 0 else None
 
-        start_length = abs(start - tangent_intersect)
-        end_length = abs(end - tangent_intersect)
-        base_length = abs(start - end)
 
-        # print("start_length:", start_length, "end_length:", end_length, "base_length:", base_length)
+def _is_circular(shape: EllipticalArc) -> bool:
+    """Check whether the EllipticalArc is a circular arc in output coordinates."""
+    (ux, uy), (vx, vy) = shape._axis_x, shape._axis_y
+    u2, v2 = ux * ux + uy * uy, vx * vx + vy * vy
+    return abs(u2 - v2) <= 1e-9 * (u2 + v2) and abs(ux * vx + uy * vy) <= 1e-9 * (u2 + v2)
 
-        incenter_point = (start_length * end + end_length * start + base_length * tangent_intersect) / \
-                         (start_length + end_length + base_length)
 
-        # print("incenter:", incenter_point)
+def _distances(curve, points: np.ndarray) -> np.ndarray:
+    """The distance from each point to a Line or a CircularArc."""
+    start, end = np.array((curve.start.x, curve.start.y)), np.array((curve.end.x, curve.end.y))
+    to_ends = np.minimum(np.hypot(*(points - start).T), np.hypot(*(points - end).T))
 
-        center1 = formulas.tangent_arc_center(control1, start, incenter_point)
-        center2 = formulas.tangent_arc_center(control2, end, incenter_point)
+    if isinstance(curve, Line):
+        segment = end - start
+        t = np.clip((points - start) @ segment / (segment @ segment), 0, 1)
+        return np.hypot(*(points - start - t.reshape(-1, 1) * segment).T)
 
-        # print("centers:", center1, center2)
+    relative = points - (curve.center.x, curve.center.y)
+    radial = np.abs(np.hypot(*relative.T) - curve.radius)
 
-        smooth_arcs.append(CircularArc(start, incenter_point, center1))
-        smooth_arcs.append(CircularArc(incenter_point, end, center2))
+    # Points beyond the ends of the arc are measured to the closest end
+    sweep = curve.sweep_angle
+    angles = (np.arctan2(relative[:, 1], relative[:, 0]) - curve.start_angle) * math.copysign(1, sweep) % (2 * math.pi)
 
-        return smooth_arcs
+    return np.where(angles <= abs(sweep), radial, to_ends)
@@ -7,7 +7,15 @@ specific maintenance notes:
 """
 
 from svg_to_gcode.svg_parser._transformation import Transformation
+from svg_to_gcode.svg_parser._path_data import PathData, compile_path_data
 from svg_to_gcode.svg_parser._path import Path
-from svg_to_gcode.svg_parser._parser_methods import parse_file, sortCurves,scaleLines, getMinMax, parse_string, parse_root,drawOpts
+from svg_to_gcode.svg_parser._style import Stylesheet, parse_style
+from svg_to_gcode.svg_parser._units import parse_length
+from svg_to_gcode.svg_parser._parser_methods import parse_file, scaleLines, getMinMax, parse_string, parse_root,drawOpts
+from svg_to_gcode.svg_parser._parser_methods import iterparse_file, parse_iter
+from svg_to_gcode.svg_parser._parser_methods import parse_file_classified, parse_root_classified, filter_classifier, \
+    PEPAKURA_CLASSIFIERS
+from svg_to_gcode.svg_parser._ordering import sortCurves, optimizeCurves, travelTime
+from svg_to_gcode.svg_parser._stitching import stitchLines
 from svg_to_gcode.svg_parser._helper import openFile, getOutputFileName 
 from svg_to_gcode.svg_parser._dxf_importer import importDXF, importAllDXF
\ No newline at end of file
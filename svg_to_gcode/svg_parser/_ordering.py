@@ -0,0 +1,493 @@
+"""
+Ordering of curves, such that the travel moves between them are short.
+
+The curves are ordered greedily: each curve is followed by the remaining curve whose start is closest to its end. The
+starts are stored in a uniform grid, so each step only looks at the cells around the current end instead of scanning
+every remaining curve. Optionally, the ends of open curves are stored as well, and curves which are closer by their end
+are reversed.
+
+The greedy order can then be improved by a local search, optimizeCurves(), which applies 2-opt and Or-opt moves between
+curves which are close to each other. Based on https://en.wikipedia.org/wiki/2-opt and
+https://doi.org/10.1287/opre.21.2.498 (Or-opt).
+"""
+
+import math
+import time
+
+from collections import deque
+
+import numpy as np
+
+from svg_to_gcode.geometry import Curve
+from svg_to_gcode import TOLERANCES
+
+
+class _PointGrid:
+    """
+    A uniform grid of points, which supports nearest neighbour queries and deletion. Points are referred to by their
+    index in the list passed to __init__.
+    """
+
+    __slots__ = 'points', 'origin', 'cell_size', 'shape', 'cells', 'size'
+
+    def __init__(self, points: list, indices):
+        """
+        :param points: A list of (x, y) tuples.
+        :param indices: The indices of the points which are stored in the grid.
+        """
+        indices = list(indices)
+        coordinates = np.array([points[index] for index in indices], dtype=np.float64).reshape(-1, 2)
+
+        self.points = points
+        self.size = len(indices)
+
+        if self.size == 0:
+            self.origin, self.cell_size, self.shape, self.cells = np.zeros(2), 1.0, (0, 0), {}
+            return
+
+        # Cells are sized for about one point per cell. Collinear points fall back to the width of the grid.
+        self.origin = coordinates.min(axis=0)
+        extent = coordinates.max(axis=0) - self.origin
+        self.cell_size = max(math.sqrt(extent[0] * extent[1] / self.size), extent.max() / self.size) or 1.0
+
+        cells = np.floor((coordinates - self.origin) / self.cell_size).astype(np.intp)
+        self.shape = tuple((cells.max(axis=0) + 1).tolist())
+
+        self.cells = {}
+        for index, cell in zip(indices, map(tuple, cells.tolist())):
+            self.cells.setdefault(cell, set()).add(index)
+
+    def __len__(self):
+        return self.size
+
+    def indices(self) -> list:
+        return [index for cell in self.cells.values() for index in cell]
+
+    def _cell(self, x: float, y: float) -> tuple:
+        return math.floor((x - self.origin[0]) / self.cell_size), math.floor((y - self.origin[1]) / self.cell_size)
+
+    def remove(self, index: int):
+        x, y = self.points[index]
+        cell = self._cell(x, y)
+
+        self.cells[cell].remove(index)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+        self.size -= 1
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """Yield the cells of the grid at a Chebyshev distance r from (cx, cy)."""
+        width, height = self.shape
+
+        if r == 0:
+            yield cx, cy
+            return
+
+        x_range = range(max(cx - r, 0), min(cx + r, width - 1) + 1)
+        for y in (cy - r, cy + r):
+            if 0 <= y < height:
+                for x in x_range:
+                    yield x, y
+
+        y_range = range(max(cy - r + 1, 0), min(cy + r - 1, height - 1) + 1)
+        for x in (cx - r, cx + r):
+            if 0 <= x < width:
+                for y in y_range:
+                    yield x, y
+
+    def nearest(self, x: float, y: float) -> int:
+        """Return the index of the point closest to (x, y). Ties go to the lowest index."""
+        if self.size == 0:
+            raise ValueError("Can't find the nearest point of an empty grid.")
+
+        width, height = self.shape
+        origin_x, origin_y = self.origin
+        cx, cy = self._cell(x, y)
+
+        # Rings closer than r_min don't overlap the grid, rings further than r_max are entirely outside of it
+        r_min = max(0, -cx, cx - width + 1, -cy, cy - height + 1)
+        r_max = max(cx, width - 1 - cx, cy, height - 1 - cy)
+
+        best, best_distance = None, math.inf
+        cells, points = self.cells, self.points
+
+        for r in range(r_min, r_max + 1):
+            for cell in self._ring(cx, cy, r):
+                for index in cells.get(cell, ()):
+                    point_x, point_y = points[index]
+                    dx, dy = point_x - x, point_y - y
+                    distance = dx * dx + dy * dy
+
+                    if distance < best_distance or (distance == best_distance and index < best):
+                        best, best_distance = index, distance
+
+            if best is None:
+                continue
+
+            # Every point which hasn't been checked is outside of the block of rings 0 to r
+            margin = min(x - (origin_x + (cx - r) * self.cell_size), origin_x + (cx + r + 1) * self.cell_size - x,
+                         y - (origin_y + (cy - r) * self.cell_size), origin_y + (cy + r + 1) * self.cell_size - y)
+
+            if margin > 0 and best_distance < margin * margin:
+                break
+
+        return best
+
+
+def sortCurves(curves: [Curve], reverse=False) -> [Curve]:
+    """
+    Order curves greedily, such that each curve is followed by the remaining curve whose start is closest to its end.
+    The first curve stays first. Runs in O(n log n) for evenly spread curves, the input list isn't modified.
+
+    :param curves: The curves to be ordered.
+    :param reverse: If True, open curves may also be drawn backwards. Curves whose end is closer than their start are
+    replaced by curve.reversed(). Closed curves keep their direction.
+    :return: A new list of the ordered curves.
+    """
+    if len(curves) == 0:
+        return curves
+
+    # Point 2 * i is the start of curve i and point 2 * i + 1 is its end
+    points = []
+    for curve in curves:
+        points.extend(((curve.start.x, curve.start.y), (curve.end.x, curve.end.y)))
+
+    reversible = [reverse and points[2 * i] != points[2 * i + 1] for i in range(len(curves))]
+
+    indices = [2 * i + end for i in range(1, len(curves)) for end in ((0, 1) if reversible[i] else (0,))]
+    grid = _PointGrid(points, indices)
+    built_size = len(grid)
+
+    ordered_curves = [curves[0]]
+    end = curves[0].end
+
+    while len(grid):
+        index = grid.nearest(end.x, end.y)
+        i, is_end = divmod(index, 2)
+
+        grid.remove(2 * i)
+        if reversible[i]:
+            grid.remove(2 * i + 1)
+
+        curve = curves[i].reversed() if is_end else curves[i]
+        ordered_curves.append(curve)
+        end = curve.end
+
+        # Rebuild the grid once half of its points are gone, such that its cells stay about as dense as its points
+        if 0 < 2 * len(grid) < built_size:
+            grid = _PointGrid(points, grid.indices())
+            built_size = len(grid)
+
+    return ordered_curves
+
+
+def _close_points(points: np.ndarray, count: int) -> np.ndarray:
+    """
+    Find the count closest points to each point, itself included. Points are bucketed in a grid with about count / 4
+    points per cell and only the 3x3 cells around each point are searched, so fewer points are found where they're
+    sparse.
+
+    :param points: An (N, 2) array of points.
+    :return: An (N, count) array of indices, closest first, padded with -1.
+    """
+    size = len(points)
+    origin = points.min(axis=0)
+    extent = points.max(axis=0) - origin
+    density = count / (4 * size)
+    cell_size = max(math.sqrt(extent[0] * extent[1] * density), extent.max() * density) or 1.0
+
+    # Cells are offset by 1, such that the keys of the cells around each cell are unique
+    cells = np.floor((points - origin) / cell_size).astype(np.int64) + 1
+    height = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * height + cells[:, 1]
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    queries, candidates = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour_keys = keys + dx * height + dy
+            lows = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+            counts = np.searchsorted(sorted_keys, neighbour_keys, side='right') - lows
+
+            # Every point of the cell, for each query
+            ranks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            queries.append(np.repeat(np.arange(size), counts))
+            candidates.append(order[np.repeat(lows, counts) + ranks])
+
+    queries, candidates = np.concatenate(queries), np.concatenate(candidates)
+    distances = np.hypot(*(points[candidates] - points[queries]).T)
+
+    # Sort by query, then by distance, and keep the first count of each query. Two sorts are faster than np.lexsort.
+    sorting = np.argsort(distances)
+    sorting = sorting[np.argsort(queries[sorting], kind='stable')]
+    queries, candidates = queries[sorting], candidates[sorting]
+
+    group_starts = np.searchsorted(queries, np.arange(size))
+    ranks = np.arange(len(queries)) - group_starts[queries]
+    kept = ranks < count
+
+    close_points = np.full((size, count), -1, dtype=np.int64)
+    close_points[queries[kept], ranks[kept]] = candidates[kept]
+
+    return close_points
+
+
+def travelTime(rapid_feed: float, lift_time=0.0):
+    """
+    Return a cost function for optimizeCurves(), which estimates the duration of each travel move in seconds.
+
+    :param rapid_feed: The speed of travel moves, in units per minute. Eg. Compiler.movement_speed.
+    :param lift_time: The time it takes to lift and lower the tool, in seconds. Only moves of a non-zero length lift the
+    tool, such that joining curves is rewarded.
+    """
+    if rapid_feed <= 0:
+        raise ValueError(f"rapid_feed must be a positive number. Not {rapid_feed}")
+
+    def travel_time(distance: float) -> float:
+        if distance <= TOLERANCES["operation"]:
+            return distance * 60 / rapid_feed
+
+        return distance * 60 / rapid_feed + lift_time
+
+    return travel_time
+
+
+def _headings(curve: Curve, step=1e-6) -> (float, float):
+    """The direction of travel at the start and at the end of curve, in radians. Measured across a short step in t."""
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = curve.points([0, step, 1 - step, 1]).tolist()
+    return math.atan2(y1 - y0, x1 - x0), math.atan2(y3 - y2, x3 - x2)
+
+
+class _Tour:
+    """
+    An ordering of curves for the local search of optimizeCurves(). Curves are referred to by their index in the input,
+    and flipped curves are drawn from their end to their start. The first curve never moves.
+
+    The start and the end of each curve are (x, y) tuples, or (x, y, heading) tuples if headings is True.
+    """
+
+    __slots__ = 'points', 'ends', 'cost', 'headings', 'order', 'position', 'flipped'
+
+    def __init__(self, curves: [Curve], cost, headings=False):
+        self.points = [((curve.start.x, curve.start.y), (curve.end.x, curve.end.y)) for curve in curves]
+        self.cost = cost
+        self.headings = headings
+
+        # The start and the end of each curve, drawn forwards and drawn backwards
+        if headings:
+            self.ends = []
+            for (start, end), (start_heading, end_heading) in zip(self.points, map(_headings, curves)):
+                self.ends.append((((*start, start_heading), (*end, end_heading)),
+                                  ((*end, end_heading + math.pi), (*start, start_heading + math.pi))))
+        else:
+            self.ends = [((start, end), (end, start)) for start, end in self.points]
+
+        self.order = list(range(len(curves)))
+        self.position = list(range(len(curves)))
+        self.flipped = [False] * len(curves)
+
+    def start(self, position: int, flip=False) -> tuple:
+        """The start of the curve at position, or of the curve reversed if flip is True."""
+        curve = self.order[position]
+        return self.ends[curve][self.flipped[curve] != flip][0]
+
+    def end(self, position: int, flip=False) -> tuple:
+        curve = self.order[position]
+        return self.ends[curve][self.flipped[curve] != flip][1]
+
+    def travel(self, point1: tuple, point2: tuple) -> float:
+        distance = math.hypot(point2[0] - point1[0], point2[1] - point1[1])
+
+        if self.cost is None:
+            return distance
+
+        if self.headings:
+            # The smallest rotation between both headings, in [0, pi]
+            return self.cost(distance, abs((point2[2] - point1[2] + math.pi) % (2 * math.pi) - math.pi))
+
+        return self.cost(distance)
+
+    def edge(self, position: int) -> float:
+        """The cost of the travel move after position. The last curve isn't followed by a travel move."""
+        if position >= len(self.order) - 1:
+            return 0.0
+
+        return self.travel(self.end(position), self.start(position + 1))
+
+    def total(self) -> float:
+        return sum(self.edge(position) for position in range(len(self.order) - 1))
+
+    def two_opt_gain(self, first: int, last: int) -> float:
+        """The gain of drawing the curves from first to last (positions) in reverse, each curve reversed."""
+        gain = self.edge(first - 1) + self.edge(last) - self.travel(self.end(first - 1), self.start(last, True))
+
+        if last < len(self.order) - 1:
+            gain -= self.travel(self.end(first, True), self.start(last + 1))
+
+        return gain
+
+    def reverse(self, first: int, last: int):
+        segment = self.order[first:last + 1][::-1]
+        self.order[first:last + 1] = segment
+
+        for position, curve in enumerate(segment, first):
+            self.position[curve] = position
+            self.flipped[curve] = not self.flipped[curve]
+
+    def removal_gain(self, first: int, size: int) -> float:
+        """The gain of removing size curves from position first, and joining the curves around them."""
+        last = first + size - 1
+        gain = self.edge(first - 1) + self.edge(last)
+
+        if last < len(self.order) - 1:
+            gain -= self.travel(self.end(first - 1), self.start(last + 1))
+
+        return gain
+
+    def insertion_gain(self, first: int, size: int, after: int, reverse: bool) -> float:
+        """
+        The gain of inserting the size curves at position first after position after, optionally reversed. Or-opt moves
+        gain removal_gain() + insertion_gain().
+        """
+        last = first + size - 1
+        gain = self.edge(after)
+
+        segment_start, segment_end = (self.start(last, True), self.end(first, True)) if reverse else \
+            (self.start(first), self.end(last))
+
+        gain -= self.travel(self.end(after), segment_start)
+        if after < len(self.order) - 1:
+            gain -= self.travel(segment_end, self.start(after + 1))
+
+        return gain
+
+    def move(self, first: int, size: int, after: int, reverse: bool):
+        segment = self.order[first:first + size]
+        if reverse:
+            segment.reverse()
+            for curve in segment:
+                self.flipped[curve] = not self.flipped[curve]
+
+        del self.order[first:first + size]
+        insert = after + 1 if after < first else after + 1 - size
+        self.order[insert:insert] = segment
+
+        for position in range(min(first, insert), max(first + size, insert + size)):
+            self.position[self.order[position]] = position
+
+
+def optimizeCurves(curves: [Curve], reverse=False, time_limit=1.0, max_iterations=None, cost=None, neighbours=8,
+                   headings=False) -> [Curve]:
+    """
+    Improve the order of curves, such as the result of sortCurves(), with a local search. The search repeatedly applies
+    the first move which shortens the travel, until no move does or the budget is spent:
+        - 2-opt: draw a run of consecutive curves in reverse order, each curve reversed. Only if reverse is True.
+        - Or-opt: move a run of up to 3 curves elsewhere in the order, optionally reversed if reverse is True.
+    Only moves which bring a curve next to one of its closest neighbours are tried. The first curve stays first.
+
+    :param curves: The curves to be ordered.
+    :param reverse: If True, open curves may be drawn backwards. Closed curves keep their direction, unless headings is
+    True.
+    :param time_limit: The maximum run time, in seconds, including the search for close curves. None for no limit.
+    :param max_iterations: The maximum number of moves applied. None for no limit.
+    :param cost: A function of the length of a travel move, which returns its cost. Eg. travelTime(). Defaults to the
+    length itself.
+    :param neighbours: The number of close curves each curve may be moved next to.
+    :param headings: If True, cost is called as cost(distance, rotation), where rotation is the change in the direction
+    of travel from the end of a curve to the start of the next one, in radians between 0 and pi. Eg.
+    CompilerPC.transition_time(), for tools which must be turned along the path like a tangential knife.
+    :return: A new list of the ordered curves.
+    """
+    if len(curves) < 3:
+        return list(curves)
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    tour = _Tour(curves, cost, headings)
+    size = len(curves)
+
+    # Closed curves can be drawn backwards without reversing them, unless their direction matters
+    reversible = [reverse or (start == end and not headings) for start, end in tour.points]
+
+    # The closest curves to either end of each curve. Point 2 * i is the start of curve i and point 2 * i + 1 is its end
+    close_points = _close_points(np.array(tour.points, dtype=np.float64).reshape(-1, 2), 2 * neighbours + 2)
+    close_points = np.where(close_points >= 0, close_points // 2, -1).reshape(size, -1).tolist()
+
+    close_curves = []
+    for curve, close in enumerate(close_points):
+        close = set(close) - {curve, -1}
+        close_curves.append(sorted(close))
+
+    def improve(curve) -> bool:
+        """Apply the first improving move around curve. Return whether a move was applied."""
+        i = tour.position[curve]
+
+        # The runs of curves which start at curve, and the gain of removing them
+        segments = []
+        for segment_size in range(1, min(3, size - i) + 1 if i > 0 else 1):
+            segment_reversible = all(reversible[segment_curve] for segment_curve in tour.order[i:i + segment_size])
+            orientations = (False, True) if segment_reversible else (False,)
+            segments.append((segment_size, tour.removal_gain(i, segment_size), orientations))
+
+        for other in close_curves[curve]:
+            j = tour.position[other]
+            a, b = min(i, j), max(i, j)
+
+            # 2-opt, joining the ends or the starts of both curves
+            if reverse:
+                for first, last in ((a + 1, b), (a, b - 1)):
+                    if 1 <= first <= last and tour.two_opt_gain(first, last) > 1e-9:
+                        tour.reverse(first, last)
+                        return True
+
+            # Or-opt, moving curve and the curves that follow it, before or after the other curve
+            for segment_size, removal_gain, orientations in segments:
+                for after in (j - 1, j):
+                    if after < 0 or i - 1 <= after <= i + segment_size - 1:
+                        continue
+
+                    for reverse_segment in orientations:
+                        if removal_gain + tour.insertion_gain(i, segment_size, after, reverse_segment) > 1e-9:
+                            tour.move(i, segment_size, after, reverse_segment)
+                            return True
+
+        return False
+
+    # Curves whose surroundings changed are checked again
+    queue = deque(range(1, size))
+    queued = [True] * size
+    iterations = 0
+
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+
+        curve = queue.popleft()
+        queued[curve] = False
+
+        if improve(curve):
+            iterations += 1
+
+            # Check the curve again, along with its neighbours
+            for other in [curve] + close_curves[curve]:
+                position = tour.position[other]
+                for neighbour in tour.order[max(position - 1, 1):position + 2]:
+                    if not queued[neighbour]:
+                        queue.append(neighbour)
+                        queued[neighbour] = True
+
+    ordered_curves = []
+    for curve in tour.order:
+        start, end = tour.points[curve]
+
+        # Closed curves keep their direction, unless it matters
+        flipped = tour.flipped[curve] and (start != end or headings)
+        ordered_curves.append(curves[curve].reversed() if flipped else curves[curve])
+
+    return ordered_curves
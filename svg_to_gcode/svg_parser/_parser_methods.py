@@ -1,12 +1,28 @@
+import warnings
+
 from xml.etree import ElementTree
-from typing import List
-from copy import deepcopy
+from typing import List, Iterable, Iterator, Dict, Callable
 
 from svg_to_gcode.svg_parser import Path,  Transformation
+from svg_to_gcode.svg_parser._style import Stylesheet, element_style
+from svg_to_gcode.svg_parser._path import generate_curves
+from svg_to_gcode.svg_parser._shapes import compile_shape, shape_compilers, _length
+from svg_to_gcode.svg_parser._units import parse_length, convert_length, parse_view_box, view_box_to_viewport
 from svg_to_gcode.geometry import Curve,Text
 from svg_to_gcode.geometry._vector import Vector
 
-NAMESPACES = {'svg': 'http://www.w3.org/2000/svg'}
+NAMESPACES = {'svg': 'http://www.w3.org/2000/svg', 'xlink': 'http://www.w3.org/1999/xlink'}
+
+DEFS_TAG = "{%s}defs" % NAMESPACES["svg"]
+SYMBOL_TAG = "{%s}symbol" % NAMESPACES["svg"]
+USE_TAG = "{%s}use" % NAMESPACES["svg"]
+
+# Paths and basic shapes are drawn as geometric curves
+SHAPE_TAGS = {"{%s}%s" % (NAMESPACES["svg"], tag) for tag in shape_compilers}
+CURVE_TAGS = SHAPE_TAGS | {"{%s}path" % NAMESPACES["svg"]}
+
+# A predicate of an element and its computed style. See parse_root_classified.
+Classifier = Callable[[ElementTree.Element, Dict[str, str]], bool]
 
 class drawOpts:
     def  __init__(self):
@@ -15,206 +31,537 @@ class drawOpts:
         self.filter = None
     
 
-def _has_style(element: ElementTree.Element, key: str, value: str) -> bool:
+def _canvas_height(root: ElementTree.Element) -> float:
+    """Read the canvas height, in user units, from the viewBox or else the height attribute of the root."""
+    view_box = parse_view_box(root.get("viewBox"))
+
+    if view_box is not None:
+        return view_box[1] + view_box[3]
+
+    if root.get("height") is None:
+        raise ValueError("The root has neither a viewBox nor a height. Specify canvas_height or set transform_origin "
+                         "to False.")
+
+    return parse_length(root.get("height"))
+
+
+def _viewport_size(root: ElementTree.Element, view_box, unit: str) -> tuple:
+    """Read the width and height of the root's viewport in unit. Relative sizes default to the viewBox, in pixels."""
+    size = []
+
+    for attribute, view_box_index in (("width", 2), ("height", 3)):
+        try:
+            size.append(parse_length(root.get(attribute), unit))
+        except (TypeError, ValueError):
+            if view_box is None:
+                raise ValueError(f"The root's {attribute} must be an absolute length if it has no viewBox, not "
+                                 f"'{root.get(attribute)}'.")
+
+            size.append(convert_length(view_box[view_box_index], unit))
+
+    return tuple(size)
+
+
+def _document_transformation(root: ElementTree.Element, transform_origin: bool, canvas_height=None, unit=None,
+                             root_transformation=None) -> Transformation:
+    """
+    Compose the transformation at the bottom of the transformation stack. It's computed once per document and shared by
+    every element.
+
+    :param root: The root element. Its attributes are read, not its children.
+    :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
+    cartesian system.
+    :param canvas_height: The height of the canvas, in user units or in unit if it's specified. Read from the root by
+    default.
+    :param unit: None to keep user units. 'mm' or 'in' to map the viewBox onto the viewport and scale it to unit.
+    :param root_transformation: The root's transformation. Applied before changing the origin.
+    """
+    transformation = Transformation()
+
+    if unit is None:
+        if transform_origin:
+            transformation.add_translation(0, _canvas_height(root) if canvas_height is None else canvas_height)
+            transformation.add_scale(1, -1)
+
+    else:
+        pixel_size = convert_length(1, unit)
+
+        view_box = parse_view_box(root.get("viewBox"))
+        width, height = _viewport_size(root, view_box, unit)
+
+        if transform_origin:
+            transformation.add_translation(0, height if canvas_height is None else canvas_height)
+            transformation.add_scale(1, -1)
+
+        if view_box is None:
+            transformation.add_scale(pixel_size)
+        else:
+            scale_x, scale_y, translate_x, translate_y = view_box_to_viewport(view_box, width, height,
+                                                                              root.get("preserveAspectRatio"))
+            transformation.add_translation(translate_x, translate_y)
+            transformation.add_scale(scale_x, scale_y)
+
+    if root_transformation is not None:
+        transformation.extend(root_transformation)
+
+    return transformation
+
+
+def _document_stylesheet(root: ElementTree.Element) -> Stylesheet:
+    """Collect the rules of every <style> element in the document."""
+    stylesheet = Stylesheet()
+
+    for style_element in root.iter("{%s}style" % NAMESPACES["svg"]):
+        stylesheet.add_style_element(style_element)
+
+    return stylesheet
+
+
+def _element_state(element: ElementTree.Element, root_transformation=None, visible_root=True, stylesheet=None,
+                   root_style=None):
+    """
+    Compute the state an element inherits from its root and passes on to its children.
+
+    :param element: The etree element.
+    :param root_transformation: The root's transformation. (Transformations are inheritable)
+    :param visible_root: Specifies whether or the root is visible. (Inheritance can be overridden)
+    :param stylesheet: The document's Stylesheet, if any.
+    :param root_style: The root's style. (Some properties are inheritable, see _style.inherited_properties)
+    :return: (skip, transformation, visible, style). If skip is True, neither the element nor its children should be
+    drawn.
+    """
+
+    style = element_style(element, stylesheet, root_style)
+
+    # display cannot be overridden by inheritance. Just skip the element
+    display = style.get("display") == "none"
+
+    # Definitions and symbols are only drawn through <use> elements
+    if display or element.tag == DEFS_TAG or element.tag == SYMBOL_TAG:
+        return True, None, False, None
+
+    # Transformations are never modified once created. Elements without a transform share their root's transformation
+    # and a new one is only composed when a transform appears.
+    transformation = root_transformation
+
+    transform = element.get('transform')
+
+    # The x and y attributes of a <use> element are an additional translation
+    if element.tag == USE_TAG and (element.get('x') or element.get('y')):
+        transform = f"{transform or ''} translate({_length(element, 'x')} {_length(element, 'y')})"
+    if transform:
+        transformation = Transformation() if transformation is None else transformation
+        transformation = transformation.compose(transform)
+
+    # Is the element and it's root not hidden?
+    visibility = style.get("visibility")
+    visible = visible_root and visibility not in ("hidden", "collapse")
+    # Override inherited visibility
+    visible = visible or visibility == "visible"
+
+    return False, transformation, visible, style
+
+
+def _passes_filter(element: ElementTree.Element, style, filter) -> bool:
+    """
+    Check whether an element is selected by a drawOpts.filter value.
+
+    filter=None selects paths and shapes without a stroke-dasharray (Pepakura cut lines), filter='text' selects text
+    elements and any other value selects paths and shapes with an attribute or style property of that name. Eg.
+    'stroke-dasharray' for Pepakura groves. A value of 'none', which Inkscape writes by default, counts as no value.
+    """
+    if element.tag in CURVE_TAGS:
+        if filter == None:
+            return style.get('stroke-dasharray') in (None, 'none')
+
+        return style.get(filter) not in (None, 'none')
+
+    if element.tag == "{%s}text" % NAMESPACES["svg"]:
+        return filter == 'text'
+
+    return False
+
+
+def _element_curves(element: ElementTree.Element, transformation, canvas_height) -> List[Curve]:
+    """
+    Convert a single element (not its children) into geometric curves, regardless of its visibility.
+
+    :return: A list of geometric curves. Empty if the element isn't drawable.
+    """
+
+    if element.tag == "{%s}path" % NAMESPACES["svg"]:
+        # The transformation already includes the change of origin (see _document_transformation)
+        path = Path(element.attrib['d'], canvas_height, False, transformation)
+        return path.curves
+
+    if element.tag in SHAPE_TAGS:
+        return generate_curves(compile_shape(element), transformation)
+
+    if element.tag == "{%s}text" % NAMESPACES["svg"]:
+        transform = element.get('transform')
+        if transform:
+            command, arguments = transform.split('(')
+            arguments = arguments.replace(')', '')
+            arguments = [float(argument.strip()) for argument in arguments.replace(',', ' ').split()]
+            a = arguments[0]
+        else:
+            a = 0
+        x = element.get('x')
+        y = element.get('y')
+
+        if element.text == None:
+            for e2 in list(element):
+                if e2.tag == "{%s}tspan" % NAMESPACES["svg"]:
+                    tx = e2.text
+        else:
+            tx = element.text
+
+        return [Text(x,y,a,tx)]
+
+    return []
+
+
+def _draw_element(element: ElementTree.Element, transformation, visible, style, canvas_height, dOpts) \
+        -> List[Curve]:
+    """
+    Convert a single element (not its children) into geometric curves.
+
+    :return: A list of geometric curves. Empty if the element isn't drawable, is hidden or is filtered out by dOpts.
+    """
+
+    # If the current element is opaque and visible, draw it
+    if (dOpts.draw_hidden or visible) and _passes_filter(element, style, dOpts.filter):
+        return _element_curves(element, transformation, canvas_height)
+
+    return []
+
+
+class _ElementIndex:
+    """Index the elements of a document by id. The index is only built the first time it's needed."""
+
+    __slots__ = "root", "_elements"
+
+    def __init__(self, root: ElementTree.Element):
+        self.root = root
+        self._elements = None
+
+    def get(self, element_id: str):
+        if self._elements is None:
+            self._elements = {element.get("id"): element for element in self.root.iter() if "id" in element.attrib}
+
+        return self._elements.get(element_id)
+
+
+def _use_target(element: ElementTree.Element, ids) -> ElementTree.Element:
+    """Find the element referenced by a <use> element. None if it can't be found."""
+    href = element.get("href") or element.get("{%s}href" % NAMESPACES["xlink"]) or ""
+    target = ids.get(href[1:]) if href.startswith('#') and ids is not None else None
+
+    if target is None:
+        warnings.warn(f"Skipping <use> element. Can't find the element it references: '{href}'")
+
+    return target
+
+
+def _walk(root: ElementTree.Element, root_transformation=None, visible_root=True, stylesheet=None, root_style=None,
+          ids=None, references=()):
+    """
+    Depth-first traversal of an etree root's children, skipping elements which can't be drawn along with their
+    children.
+
+    The only child of a <use> element is the element it references (or the children of the symbol it references). Every
+    instance is traversed with its own transformation, while the referenced geometry is shared (see
+    compile_path_data and geometry.ApproximationCache).
+
+    :param ids: An index of the document's elements by id, used to resolve <use> elements. If None, they're skipped.
+    :param references: The elements referenced by the <use> elements being traversed. Used to detect circular
+    references.
+    :return: A generator of (element, transformation, visible, style) tuples.
+    """
+    if root.tag == USE_TAG:
+        target = _use_target(root, ids)
+
+        if target is None:
+            return
+
+        if target in references:
+            warnings.warn(f"Skipping <use> element. Circular reference to '{target.get('id')}'")
+            return
+
+        references = references + (target,)
+        children = list(target) if target.tag == SYMBOL_TAG else [target]
+    else:
+        children = list(root)
+
+    for element in children:
+        skip, transformation, visible, style = _element_state(element, root_transformation, visible_root, stylesheet,
+                                                              root_style)
+
+        if skip:
+            continue
+
+        yield element, transformation, visible, style
+
+        # Continue the recursion
+        yield from _walk(element, transformation, visible, stylesheet, style, ids, references)
+
+
+def filter_classifier(filter) -> Classifier:
     """
-    Check if an element contains a specific key and value either as an independent attribute or in the style attribute.
+    Return a classifier predicate (see parse_root_classified) which selects the same elements as drawOpts.filter.
+
+    :param filter: A drawOpts.filter value. None, 'text' or an attribute name.
     """
-    return element.get(key) == value or (element.get("style") and f"{key}:{value}" in element.get("style"))
+    return lambda element, style: _passes_filter(element, style, filter)
+
 
+# Pepakura exports mark groves with a stroke-dasharray. Everything else is cut, except for the edge ids.
+PEPAKURA_CLASSIFIERS = {
+    "groves": filter_classifier('stroke-dasharray'),
+    "cuts": filter_classifier(None),
+    "text": filter_classifier('text'),
+}
 
-# Todo deal with viewBoxes
-def parse_root(root: ElementTree.Element, transform_origin=True, canvas_height=None, dOpts=drawOpts,
-               visible_root=True, root_transformation=None) -> List[Curve]:
+
+def parse_root(root: ElementTree.Element, transform_origin=True, canvas_height=None, dOpts=None,
+               visible_root=True, root_transformation=None, unit=None) -> List[Curve]:
 
     """
     Recursively parse an etree root's children into geometric curves.
 
     :param root: The etree element who's children should be recursively parsed. The root will not be drawn.
-    :param canvas_height: The height of the canvas. By default the height attribute of the root is used. If the root
+    :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
     does not contain the height attribute, it must be either manually specified or transform must be False.
     :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
     cartesian system. Depends on canvas_height for calculations.
     :param dOpts: Whether or not to draw hidden elements based on their display, visibility and opacity attributes.
     :param visible_root: Specifies whether or the root is visible. (Inheritance can be overridden)
     :param root_transformation: Specifies whether the root's transformation. (Transformations are inheritable)
+    :param unit: If 'mm' or 'in', the viewBox is mapped onto the root's width and height (see preserveAspectRatio) and
+    curves are returned in unit. By default curves are in the document's user units.
     :return: A list of geometric curves describing the svg. Use the Compiler sub-module to compile them to gcode.
     """
 
-    if canvas_height is None:
-        height_str = root.get("height")
-        canvas_height = float(height_str) if height_str.isnumeric() else float(height_str[:-2])
+    return list(parse_iter(root, transform_origin, canvas_height, dOpts, visible_root, root_transformation, unit))
+
 
-    curves = []
+def parse_iter(root: ElementTree.Element, transform_origin=True, canvas_height=None, dOpts=None,
+               visible_root=True, root_transformation=None, unit=None) -> Iterator[Curve]:
+    """
+    Generator version of parse_root. Curves are yielded one element at a time, in the same order as parse_root, so that
+    they can be approximated and compiled before the rest of the document is parsed.
+
+    Takes the same parameters as parse_root.
+    """
+
+    dOpts = drawOpts() if dOpts is None else dOpts
+
+    document_transformation = _document_transformation(root, transform_origin, canvas_height, unit, root_transformation)
+    stylesheet = _document_stylesheet(root)
 
     # Draw visible elements (Depth-first search)
-    for element in list(root):
+    for element, transformation, visible, style in _walk(root, document_transformation, visible_root, stylesheet,
+                                                         ids=_ElementIndex(root)):
+        yield from _draw_element(element, transformation, visible, style, canvas_height, dOpts)
 
-        # display cannot be overridden by inheritance. Just skip the element
-        display = _has_style(element, "display", "none")
 
-        if display or element.tag == "{%s}defs" % NAMESPACES["svg"]:
-            continue
 
-        transformation = deepcopy(root_transformation) if root_transformation else None
+def parse_root_classified(root: ElementTree.Element, classifiers: Dict[str, Classifier],
+                          transform_origin=True, canvas_height=None, dOpts=None, unit=None) -> Dict[str, List[Curve]]:
+    """
+    Parse an etree root's children into several lists of curves in a single traversal.
 
-        transform = element.get('transform')
-        if transform:
-            transformation = Transformation() if transformation is None else transformation
-            transformation.add_transform(transform)
-
-        # Is the element and it's root not hidden?
-        visible = visible_root and not (_has_style(element, "visibility", "hidden")
-                                        or _has_style(element, "visibility", "collapse"))
-        # Override inherited visibility
-        visible = visible or (_has_style(element, "visibility", "visible"))
-
-        draw = True
-        # check for filter 
-        # if dOpts.doFiltering:
-        #     if dOpts.filter == None:
-        #         if element.get('stroke-dasharray') != None:
-        #             draw = False
-        #     else:
-        #         if element.get(dOpts.filter) == None:
-        #             draw = False
-
-        # if draw:
-            # If the current element is opaque and visible, draw it
-        if dOpts.draw_hidden or visible:
-            if element.tag == "{%s}path" % NAMESPACES["svg"]:
-                draw = True
-                if dOpts.filter == None:
-                    if element.get('stroke-dasharray') != None:
-                        draw = False
-                else:
-                    if element.get(dOpts.filter) == None:
-                        draw = False
-                if draw:
-                    path = Path(element.attrib['d'], canvas_height, transform_origin, transformation)
-                    curves.extend(path.curves)
-
-            elif element.tag == "{%s}text" % NAMESPACES["svg"]:
-                if dOpts.filter == 'text':
-                    if transform:
-                        command, arguments = transform.split('(')
-                        arguments = arguments.replace(')', '')
-                        arguments = [float(argument.strip()) for argument in arguments.replace(',', ' ').split()]
-                        a = arguments[0]
-                    else:
-                        a = 0
-                    x = element.get('x')
-                    y = element.get('y')
-                    
-                    # t = parse_root(element, transform_origin, canvas_height, dOpts, visible, transformation)
-                    if element.text == None:
-                        for e2 in list(element):
-                            if e2.tag == "{%s}tspan" % NAMESPACES["svg"]:
-                                tx = e2.text
-                    else:
-                        tx = element.text
-                    
-                    path = Path("", canvas_height, transform_origin, transformation)
-                    path.curves.append(Text(x,y,a,tx))
-                    curves.extend(path.curves)
-
-            # elif element.tag == "{%s}tspan" % NAMESPACES["svg"]:
-            #     if dOpts.filter == 'text':
-            #         if element.text != None:
-            #             if transform:
-            #                 command, arguments = transform.split('(')
-            #                 arguments = arguments.replace(')', '')
-            #                 arguments = [float(argument.strip()) for argument in arguments.replace(',', ' ').split()]
-            #                 a = arguments[0]
-            #             else:
-            #                 a = 0
-            #             x = element.get('x')
-            #             y = element.get('y')
-                        
-            #             tx = element.text
-            #             path = Path("", canvas_height, transform_origin, transformation)
-            #             path.curves.append(Text(x,y,a,tx))
-            #             curves.extend(path.curves)
+    Each drawable element is given to the classifiers in order and its curves are added to the list of the first
+    classifier which accepts it. Elements which aren't accepted by any classifier are not converted into curves.
+
+    :param root: The etree element who's children should be recursively parsed. The root will not be drawn.
+    :param classifiers: A dictionary of named predicates. Each predicate receives an etree element and its computed
+    style (a dictionary of attributes and style properties) and returns True if the element belongs to its list. See
+    filter_classifier() and PEPAKURA_CLASSIFIERS.
+    :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
+    does not contain the height attribute, it must be either manually specified or transform_origin must be False.
+    :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
+    cartesian system. Depends on canvas_height for calculations.
+    :param dOpts: Whether or not to draw hidden elements. dOpts.filter is ignored in favour of the classifiers.
+    :param unit: 'mm' or 'in' to return curves in physical units. See parse_root.
+    :return: A dictionary with the same keys as classifiers, mapping each name to a list of geometric curves.
+    """
 
+    dOpts = drawOpts() if dOpts is None else dOpts
 
-        # Continue the recursion
-        curves.extend(parse_root(element, transform_origin, canvas_height, dOpts, visible, transformation))
+    classified_curves = {name: [] for name in classifiers}
 
-    # ToDo implement shapes class
-    return curves
+    document_transformation = _document_transformation(root, transform_origin, canvas_height, unit)
+    stylesheet = _document_stylesheet(root)
+
+    for element, transformation, visible, style in _walk(root, document_transformation, stylesheet=stylesheet,
+                                                         ids=_ElementIndex(root)):
+        if not (dOpts.draw_hidden or visible):
+            continue
+
+        for name, classifier in classifiers.items():
+            if classifier(element, style):
+                classified_curves[name].extend(_element_curves(element, transformation, canvas_height))
+                break
+
+    return classified_curves
 
 
-def parse_string(svg_string: str, transform_origin=True, canvas_height=None, dOpts=drawOpts) -> List[Curve]:
+def parse_file_classified(file_path: str, classifiers: Dict[str, Classifier],
+                          transform_origin=True, canvas_height=None, dOpts=None, unit=None) -> Dict[str, List[Curve]]:
+    """
+    Parse an svg file into several lists of curves, reading and traversing it only once.
+    (Wrapper for parse_root_classified)
+
+    :param file_path: The path of the svg file.
+    :param classifiers: A dictionary of named predicates. Each predicate receives an etree element and its computed
+    style (a dictionary of attributes and style properties) and returns True if the element belongs to its list. See
+    filter_classifier() and PEPAKURA_CLASSIFIERS.
+    :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
+    does not contain the height attribute, it must be either manually specified or transform_origin must be False.
+    :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
+    cartesian system. Depends on canvas_height for calculations.
+    :param dOpts: Whether or not to draw hidden elements. dOpts.filter is ignored in favour of the classifiers.
+    :param unit: 'mm' or 'in' to return curves in physical units. See parse_root.
+    :return: A dictionary with the same keys as classifiers, mapping each name to a list of geometric curves.
+    """
+    root = ElementTree.parse(file_path).getroot()
+    return parse_root_classified(root, classifiers, transform_origin, canvas_height, dOpts, unit)
+
+
+def parse_string(svg_string: str, transform_origin=True, canvas_height=None, dOpts=None, unit=None) -> List[Curve]:
     """
         Recursively parse an svg string into geometric curves. (Wrapper for parse_root)
 
         :param svg_string: The etree element who's children should be recursively parsed. The root will not be drawn.
-        :param canvas_height: The height of the canvas. By default the height attribute of the root is used. If the root
+        :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
         does not contain the height attribute, it must be either manually specified or transform_origin must be False.
         :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard cartesian
          system. Depends on canvas_height for calculations.
         :param dOpts: Whether or not to draw hidden elements based on their display, visibility and opacity attributes.
+        :param unit: 'mm' or 'in' to return curves in physical units. See parse_root.
         :return: A list of geometric curves describing the svg. Use the Compiler sub-module to compile them to gcode.
     """
     root = ElementTree.fromstring(svg_string)
-    return parse_root(root, transform_origin, canvas_height, dOpts)
+    return parse_root(root, transform_origin, canvas_height, dOpts, unit=unit)
 
 
-def parse_file(file_path: str, transform_origin=True, canvas_height=None, dOpts=drawOpts) -> List[Curve]:
+def parse_file(file_path: str, transform_origin=True, canvas_height=None, dOpts=None, stream=False, unit=None) \
+        -> Iterable[Curve]:
     """
             Recursively parse an svg file into geometric curves. (Wrapper for parse_root)
 
             :param file_path: The etree element who's children should be recursively parsed. The root will not be drawn.
-            :param canvas_height: The height of the canvas. By default the height attribute of the root is used. If the root
+            :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
             does not contain the height attribute, it must be either manually specified or transform_origin must be False.
             :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard cartesian
              system. Depends on canvas_height for calculations.
             :param dOpts: Whether or not to draw hidden elements based on their display, visibility and opacity attributes.
-            :return: A list of geometric curves describing the svg. Use the Compiler sub-module to compile them to gcode.
+            :param stream: If True, return a generator which parses the file incrementally. See iterparse_file().
+            :param unit: 'mm' or 'in' to return curves in physical units. See parse_root.
+            :return: A list of geometric curves describing the svg, or a generator of them if stream is True. Use the
+            Compiler sub-module to compile them to gcode.
         """
-    if dOpts == None:
-        dOpts.draw_hidden= False
-        dOpts.Filter = None
+    if stream:
+        return iterparse_file(file_path, transform_origin, canvas_height, dOpts, unit)
 
     root = ElementTree.parse(file_path).getroot()
-    return parse_root(root, transform_origin, canvas_height, dOpts)
+    return parse_root(root, transform_origin, canvas_height, dOpts, unit=unit)
 
-# def getDistance(a,b):
-#     x = a.x - b.x
-#     y = a.y - b.y
 
-#     return x*x+ y * y
+def iterparse_file(file_path: str, transform_origin=True, canvas_height=None, dOpts=None, unit=None) \
+        -> Iterator[Curve]:
+    """
+    Incrementally parse an svg file into geometric curves, yielding them as soon as their element is closed.
 
-#  https://stackoverflow.com/questions/59580164/path-optimization-tsp-in-python
+    Unlike parse_file, the document is never held in memory as a whole. Elements are discarded once they've been
+    processed and only the inherited state of the currently open elements (a transformation and visibility stack) is
+    kept. Peak memory therefore doesn't depend on the size of the file.
 
-# simple stort 
-def sortCurves(curves ):
-    
-    if len(curves) == 0:
-        return(curves)
+    Unlike parse_file, <style> elements only apply to the elements which follow them and <use> elements can only
+    reference elements defined before them, inside of <defs> or <symbol> elements. Definitions are kept in memory.
 
-    newOrder = []
-    start = curves[0].end
-    newOrder.append(curves.pop(0))
-    
-    while curves:
-        shortest = float("Inf") 
+    :param file_path: The path of the svg file. File objects are also accepted.
+    :param canvas_height: The height of the canvas. By default the root's viewBox or height is used. If the root
+    does not contain the height attribute, it must be either manually specified or transform_origin must be False.
+    :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
+    cartesian system. Depends on canvas_height for calculations.
+    :param dOpts: Whether or not to draw hidden elements based on their display, visibility and opacity attributes.
+    :param unit: 'mm' or 'in' to return curves in physical units. See parse_root.
+    :return: A generator of geometric curves, in the same order as parse_file.
+    """
+
+    dOpts = drawOpts() if dOpts is None else dOpts
+
+    # <style> elements are added as soon as they are closed. They only apply to the elements which follow them.
+    stylesheet = Stylesheet()
 
-        for curve in curves:
-            x = start.x - curve.start.x
-            y = start.y - curve.start.y
-            d = x*x* + y*y
+    # Elements inside of definitions are kept and indexed by id, for <use> elements which follow them.
+    ids = {}
+    open_definitions = 0
 
-            if d < shortest:
-                shortest = d
-                selection = curve
+    # One (element, skip, transformation, visible, style) entry per open element. The root is never drawn.
+    stack = []
 
-        newOrder.append(selection)
+    for event, element in ElementTree.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if not stack:
+                document_transformation = _document_transformation(element, transform_origin, canvas_height, unit)
+                stack.append((element, False, document_transformation, True, None))
+                continue
+
+            if element.tag == DEFS_TAG or element.tag == SYMBOL_TAG:
+                open_definitions += 1
+
+            _, parent_skip, parent_transformation, parent_visible, parent_style = stack[-1]
+
+            if parent_skip:
+                stack.append((element, True, None, False, None))
+            else:
+                stack.append((element, *_element_state(element, parent_transformation, parent_visible, stylesheet,
+                                                        parent_style)))
+
+            continue
+
+        _, skip, transformation, visible, style = stack.pop()
+
+        if not stack:
+            element.clear()
+            break
+
+        # Styles are usually inside of <defs>, which are skipped
+        if element.tag == "{%s}style" % NAMESPACES["svg"]:
+            stylesheet.add_style_element(element)
+
+        is_definition = element.tag == DEFS_TAG or element.tag == SYMBOL_TAG
+        if is_definition:
+            open_definitions -= 1
+
+        if (open_definitions or is_definition) and "id" in element.attrib:
+            ids[element.get("id")] = element
+
+        if not skip:
+            yield from _draw_element(element, transformation, visible, style, canvas_height, dOpts)
+
+            if element.tag == USE_TAG:
+                for instance_element, instance_transformation, instance_visible, instance_style \
+                        in _walk(element, transformation, visible, stylesheet, style, ids):
+                    yield from _draw_element(instance_element, instance_transformation, instance_visible,
+                                             instance_style, canvas_height, dOpts)
+
+        # Keep definitions intact, they're released once the outermost definition is closed.
+        if open_definitions:
+            continue
 
-        curves.remove(selection)
-        start = selection.end
-    return newOrder
+        # Text elements read their children once they are closed, so their children are released with them.
+        parent = stack[-1][0]
+        if parent.tag != "{%s}text" % NAMESPACES["svg"]:
+            if not is_definition:
+                element.clear()
+            del parent[-1]
 
 def scaleLines(curves, scaleX ,scaleY):
+    # Svg files can be parsed directly into mm or in with the unit parameter of the parse functions
     for curve in curves:
         curve.start.x = curve.start.x * scaleX
         curve.start.y = curve.start.y * scaleY
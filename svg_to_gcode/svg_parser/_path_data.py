@@ -0,0 +1,329 @@
+"""
+Lexing and compilation of svg path data (the value of a path's d attribute).
+
+Based on the path data grammar: https://www.w3.org/TR/SVG2/paths.html#PathDataBNF
+"""
+
+import re
+import math
+import warnings
+
+from array import array
+from functools import lru_cache
+from typing import List
+
+from svg_to_gcode.geometry import Vector
+from svg_to_gcode import formulas
+
+verbose = False
+
+# The number of distinct d attributes whose compiled PathData is kept in memory.
+path_data_cache_size = 256
+
+command_lengths = {'M': 2, 'm': 2, 'L': 2, 'l': 2, 'H': 1, 'h': 1, 'V': 1, 'v': 1, 'Z': 0, 'z': 0, 'C': 6, 'c': 6,
+                   'Q': 4, 'q': 4, 'S': 4, 's': 4, 'T': 2, 't': 2, 'A': 7, 'a': 7}
+
+# If a moveto is followed by multiple pairs of coordinates, the subsequent pairs are treated as implicit lineto
+# commands. https://www.w3.org/TR/SVG2/paths.html#PathDataMovetoCommands
+implicit_commands = {'M': 'L', 'm': 'l'}
+
+# Arc flags are a single '0' or '1' and don't require a delimiter. "a1 1 0 00 1 1" is a valid arc.
+arc_flag_indices = {3, 4}
+
+_separator_pattern = re.compile(r"[\s,]*")
+_number_pattern = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_flag_pattern = re.compile(r"[01]")
+
+
+def tokenize_path_data(d: str):
+    """
+    Split path data into commands in a single left-to-right pass, without rebuilding the string.
+
+    Implicitly repeated commands are yielded as separate commands. Numbers may be separated by whitespace, commas, a
+    sign ("1-2") or a second decimal point ("1.5.5"). Incomplete commands are yielded as they are, it's up to the caller
+    to reject them.
+
+    :param d: the path data.
+    :return: a generator of (command_key, command_arguments) tuples. command_arguments is a list of floats.
+    """
+
+    command_key = ''
+    command_arguments = []
+    command_length = 0
+
+    position = _separator_pattern.match(d).end()
+    while position < len(d):
+        character = d[position]
+
+        if character in command_lengths:
+            if command_key:
+                yield command_key, command_arguments
+
+            command_key = character
+            command_arguments = []
+            command_length = command_lengths[command_key]
+            position += 1
+
+        else:
+            if not command_key:
+                raise ValueError(f"Path data must begin with a command, not '{character}'.")
+
+            # The current command is complete, but isn't followed by a new key. Assume it's repeated.
+            if len(command_arguments) == command_length:
+                if command_length == 0:
+                    raise ValueError(f"Command {command_key} doesn't take any arguments, got '{character}'.")
+
+                yield command_key, command_arguments
+
+                command_key = implicit_commands.get(command_key, command_key)
+                command_arguments = []
+
+            is_flag = command_key in 'Aa' and len(command_arguments) in arc_flag_indices
+            match = (_flag_pattern if is_flag else _number_pattern).match(d, position)
+
+            if match is None:
+                raise ValueError(f"Unexpected character '{character}' at position {position} of the path data.")
+
+            command_arguments.append(float(match.group()))
+            position = match.end()
+
+        position = _separator_pattern.match(d, position).end()
+
+    if command_key:
+        yield command_key, command_arguments
+
+
+# Opcodes of the compiled path data. Every drawing command is reduced to one of the following absolute primitives.
+LINE, CUBIC_BAZIER, QUADRATIC_BAZIER, ELLIPTICAL_ARC = range(4)
+
+
+class PathData:
+    """
+    The PathData class is a compact, transformation independent representation of path data.
+
+    Curves are stored as an array of opcodes and two float64 buffers, rather than as geometric objects. Relative,
+    shorthand and implicit commands are resolved, so every opcode describes an absolute primitive:
+        - LINE: start, end
+        - CUBIC_BAZIER: start, control1, control2, end
+        - QUADRATIC_BAZIER: start, control, end
+        - ELLIPTICAL_ARC: reads center_x, center_y, radius_x, radius_y, rotation, start_angle, sweep_angle from
+        arc_parameters instead of coordinates.
+
+    Instances are shared between every path with the same d attribute (see compile_path_data), treat them as immutable.
+    """
+
+    __slots__ = 'opcodes', 'coordinates', 'arc_parameters'
+
+    def __init__(self):
+        self.opcodes = array('B')
+        self.coordinates = array('d')  # x, y pairs
+        self.arc_parameters = array('d')
+
+    def __repr__(self):
+        return f"PathData({len(self.opcodes)} opcodes, {len(self.coordinates) // 2} points)"
+
+    def __len__(self):
+        return len(self.opcodes)
+
+
+class _PathDataCompiler:
+    """
+    Resolve svg commands into PathData opcodes. Based on Mozilla Docs:
+    https://developer.mozilla.org/en-US/docs/Web/SVG/Tutorial/Paths
+
+    Each command method must be implemented with the following structure:
+    def descriptive_name(self, *command_arguments):
+        execute calculations, raise before modifying any state if the command is invalid
+        append an opcode and its operands
+        update current_point (and last_control)
+
+    Alternatively a command method may simply call a base command.
+    """
+
+    __slots__ = 'path_data', 'initial_point', 'current_point', 'last_control'
+
+    def __init__(self):
+        self.path_data = PathData()
+        self.initial_point = (0.0, 0.0)
+        self.current_point = (0.0, 0.0)
+        self.last_control = None
+
+    def compile(self, d: str) -> PathData:
+        try:
+            for command_key, command_arguments in tokenize_path_data(d):
+                self.add_command(command_key, command_arguments)
+        except Exception as generic_exception:
+            warnings.warn(f"Terminating path. The following unforeseen exception occurred: {generic_exception}")
+
+        return self.path_data
+
+    def add_command(self, command_key: str, command_arguments: List[float]):
+        """
+        :param command_key: a character representing a specific command based on the svg standard
+        :param command_arguments: A list containing the arguments for the current command_key
+        """
+        try:
+            self.command_methods[command_key](self, *command_arguments)
+        except TypeError as type_error:
+            warnings.warn(f"Mis-formed input. Skipping command {command_key, command_arguments} because it caused the "
+                          f"following error: \n{type_error}")
+        except ValueError as value_error:
+            warnings.warn(f"Impossible geometry. Skipping curve {command_key, command_arguments} because it caused the "
+                          f"following value error:\n{value_error}")
+        else:
+            if verbose:
+                print(f"{command_key}{tuple(command_arguments)} -> {self.current_point}")
+
+    def _append(self, opcode, *values):
+        self.path_data.opcodes.append(opcode)
+        self.path_data.coordinates.extend(values)
+
+    # Establish a new initial point and a new current point. (multiple coordinates are parsed as lineto commands)
+    def absolute_move(self, x, y):
+        self.initial_point = (x, y)
+        self.current_point = (x, y)
+
+    def relative_move(self, dx, dy):
+        self.absolute_move(self.current_point[0] + dx, self.current_point[1] + dy)
+
+    # Draw straight line
+    def absolute_line(self, x, y):
+        self._append(LINE, *self.current_point, x, y)
+        self.current_point = (x, y)
+
+    def relative_line(self, dx, dy):
+        self.absolute_line(self.current_point[0] + dx, self.current_point[1] + dy)
+
+    def absolute_horizontal_line(self, x):
+        self.absolute_line(x, self.current_point[1])
+
+    def relative_horizontal_line(self, dx):
+        self.absolute_horizontal_line(self.current_point[0] + dx)
+
+    def absolute_vertical_line(self, y):
+        self.absolute_line(self.current_point[0], y)
+
+    def relative_vertical_line(self, dy):
+        self.absolute_vertical_line(self.current_point[1] + dy)
+
+    def close_path(self):
+        self.absolute_line(*self.initial_point)
+
+    # Draw curvy curves
+    def absolute_cubic_bazier(self, control1_x, control1_y, control2_x, control2_y, x, y):
+        self._append(CUBIC_BAZIER, *self.current_point, control1_x, control1_y, control2_x, control2_y, x, y)
+
+        self.last_control = (control2_x, control2_y)
+        self.current_point = (x, y)
+
+    def relative_cubic_bazier(self, dx1, dy1, dx2, dy2, dx, dy):
+        x, y = self.current_point
+        self.absolute_cubic_bazier(x + dx1, y + dy1, x + dx2, y + dy2, x + dx, y + dy)
+
+    def absolute_cubic_bezier_extension(self, x2, y2, x, y):
+        start = self.current_point
+
+        if self.last_control:
+            control1 = (2 * start[0] - self.last_control[0], 2 * start[1] - self.last_control[1])
+            self.absolute_cubic_bazier(*control1, x2, y2, x, y)
+        else:
+            self.absolute_quadratic_bazier(x2, y2, x, y)
+
+        self.current_point = start
+
+    def relative_cubic_bazier_extension(self, dx2, dy2, dx, dy):
+        x, y = self.current_point
+        self.absolute_cubic_bezier_extension(x + dx2, y + dy2, x + dx, y + dy)
+
+    def absolute_quadratic_bazier(self, control1_x, control1_y, x, y):
+        self._append(QUADRATIC_BAZIER, *self.current_point, control1_x, control1_y, x, y)
+
+        self.last_control = (control1_x, control1_y)
+        self.current_point = (x, y)
+
+    def relative_quadratic_bazier(self, dx1, dy1, dx, dy):
+        x, y = self.current_point
+        self.absolute_quadratic_bazier(x + dx1, y + dy1, x + dx, y + dy)
+
+    def absolute_quadratic_bazier_extension(self, x, y):
+        start = self.current_point
+
+        if self.last_control:
+            control = (2 * start[0] - self.last_control[0], 2 * start[1] - self.last_control[1])
+        else:
+            control = start
+
+        self.absolute_quadratic_bazier(*control, x, y)
+
+    def relative_quadratic_bazier_extension(self, dx, dy):
+        self.absolute_quadratic_bazier_extension(self.current_point[0] + dx, self.current_point[1] + dy)
+
+    # Convert svg endpoint notation to center notation.
+    # Based on w3.org implementation notes. https://www.w3.org/TR/SVG2/implnote.html
+    def absolute_arc(self, rx, ry, deg_from_horizontal, large_arc_flag, sweep_flag, x, y):
+        end = Vector(x, y)
+        start = Vector(*self.current_point)
+
+        radii = Vector(rx, ry)
+
+        rotation_rad = math.radians(deg_from_horizontal)
+
+        if abs(start-end) == 0:
+            raise ValueError("start and end points can't be equal")
+
+        radii, center, start_angle, sweep_angle = formulas.endpoint_to_center_parameterization(
+            start, end, radii, rotation_rad, large_arc_flag, sweep_flag)
+
+        self.path_data.opcodes.append(ELLIPTICAL_ARC)
+        self.path_data.arc_parameters.extend((center.x, center.y, radii.x, radii.y, rotation_rad, start_angle,
+                                              sweep_angle))
+
+        self.current_point = (x, y)
+
+    def relative_arc(self, rx, ry, deg_from_horizontal, large_arc_flag, sweep_flag, dx, dy):
+        x, y = self.current_point
+        self.absolute_arc(rx, ry, deg_from_horizontal, large_arc_flag, sweep_flag, x + dx, y + dy)
+
+    command_methods = {
+        # Only move end point
+        'M': absolute_move,
+        'm': relative_move,
+
+        # Draw straight line
+        'L': absolute_line,
+        'l': relative_line,
+        'H': absolute_horizontal_line,
+        'h': relative_horizontal_line,
+        'V': absolute_vertical_line,
+        'v': relative_vertical_line,
+        'Z': close_path,
+        'z': close_path,
+
+        # Draw bazier curves
+        'C': absolute_cubic_bazier,
+        'c': relative_cubic_bazier,
+        'S': absolute_cubic_bezier_extension,
+        's': relative_cubic_bazier_extension,
+        'Q': absolute_quadratic_bazier,
+        'q': relative_quadratic_bazier,
+        'T': absolute_quadratic_bazier_extension,
+        't': relative_quadratic_bazier_extension,
+
+        # Draw elliptical arcs
+        'A': absolute_arc,
+        'a': relative_arc
+    }
+
+
+@lru_cache(maxsize=path_data_cache_size)
+def compile_path_data(d: str) -> PathData:
+    """
+    Compile path data into its PathData representation.
+
+    Results are cached by d with least-recently-used eviction, such that identical outlines which repeat across a
+    document are only parsed once. Inspect the cache with compile_path_data.cache_info().
+
+    :param d: the path data.
+    :return: the shared PathData instance describing d.
+    """
+    return _PathDataCompiler().compile(d)
@@ -0,0 +1,161 @@
+"""
+Compilation of svg basic shapes into PathData.
+
+Shapes are compiled directly into opcodes, without generating and re-parsing a d attribute. Circles and ellipses become a
+single elliptical arc and everything else becomes straight lines, such that they are approximated as exact primitives.
+
+Based on the equivalent paths of the svg standard: https://www.w3.org/TR/SVG2/shapes.html
+"""
+
+import math
+import warnings
+
+from xml.etree import ElementTree
+from typing import List
+
+from svg_to_gcode.svg_parser._path_data import PathData, LINE, ELLIPTICAL_ARC, _number_pattern
+from svg_to_gcode.svg_parser._units import parse_length
+
+
+def _length(element: ElementTree.Element, attribute: str, default=0.0) -> float:
+    """Read a length attribute in user units. Absolute units (mm, in, pt, ...) are converted."""
+    value = element.get(attribute)
+    return default if value is None else parse_length(value)
+
+
+def _points(element: ElementTree.Element) -> List[float]:
+    """Read the points attribute of a polyline or polygon as a flat list of x, y coordinates."""
+    coordinates = [float(number) for number in _number_pattern.findall(element.get("points", ""))]
+
+    # An odd number of coordinates is an error. Render the points up to the error.
+    if len(coordinates) % 2:
+        warnings.warn(f"Odd number of coordinates in points='{element.get('points')}'. Dropping the last coordinate.")
+        coordinates.pop()
+
+    return coordinates
+
+
+def _radii(element: ElementTree.Element):
+    """Read the rx and ry attributes of a rect or ellipse. A missing (or auto) radius defaults to the other."""
+    rx, ry = element.get("rx", "auto"), element.get("ry", "auto")
+    rx = _length(element, "rx") if rx != "auto" else _length(element, "ry") if ry != "auto" else 0.0
+    ry = _length(element, "ry") if ry != "auto" else rx
+    return rx, ry
+
+
+def _append_line(path_data: PathData, x1, y1, x2, y2):
+    if (x1, y1) != (x2, y2):
+        path_data.opcodes.append(LINE)
+        path_data.coordinates.extend((x1, y1, x2, y2))
+
+
+def _append_arc(path_data: PathData, center_x, center_y, radius_x, radius_y, start_angle, sweep_angle):
+    path_data.opcodes.append(ELLIPTICAL_ARC)
+    path_data.arc_parameters.extend((center_x, center_y, radius_x, radius_y, 0.0, start_angle, sweep_angle))
+
+
+def _append_polyline(path_data: PathData, coordinates: List[float], closed: bool):
+    if closed and len(coordinates) >= 4:
+        coordinates = coordinates + coordinates[:2]
+
+    for i in range(0, len(coordinates) - 2, 2):
+        _append_line(path_data, *coordinates[i:i + 4])
+
+
+def compile_rect(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+
+    x, y = _length(element, "x"), _length(element, "y")
+    width, height = _length(element, "width"), _length(element, "height")
+
+    if width <= 0 or height <= 0:
+        return path_data
+
+    # Radii are capped at half of the rectangle
+    rx, ry = _radii(element)
+    rx, ry = min(max(rx, 0), width / 2), min(max(ry, 0), height / 2)
+
+    if rx == 0 or ry == 0:
+        _append_polyline(path_data, [x, y, x + width, y, x + width, y + height, x, y + height], True)
+        return path_data
+
+    right, bottom = x + width, y + height
+
+    # Clockwise (in svg coordinates) from the top edge, like the equivalent path.
+    _append_line(path_data, x + rx, y, right - rx, y)
+    _append_arc(path_data, right - rx, y + ry, rx, ry, -math.pi / 2, math.pi / 2)
+    _append_line(path_data, right, y + ry, right, bottom - ry)
+    _append_arc(path_data, right - rx, bottom - ry, rx, ry, 0, math.pi / 2)
+    _append_line(path_data, right - rx, bottom, x + rx, bottom)
+    _append_arc(path_data, x + rx, bottom - ry, rx, ry, math.pi / 2, math.pi / 2)
+    _append_line(path_data, x, bottom - ry, x, y + ry)
+    _append_arc(path_data, x + rx, y + ry, rx, ry, math.pi, math.pi / 2)
+
+    return path_data
+
+
+def compile_circle(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+
+    r = _length(element, "r")
+    if r > 0:
+        _append_arc(path_data, _length(element, "cx"), _length(element, "cy"), r, r, 0, 2 * math.pi)
+
+    return path_data
+
+
+def compile_ellipse(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+
+    rx, ry = _radii(element)
+
+    if rx > 0 and ry > 0:
+        _append_arc(path_data, _length(element, "cx"), _length(element, "cy"), rx, ry, 0, 2 * math.pi)
+
+    return path_data
+
+
+def compile_line(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+    _append_line(path_data, _length(element, "x1"), _length(element, "y1"), _length(element, "x2"),
+                 _length(element, "y2"))
+    return path_data
+
+
+def compile_polyline(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+    _append_polyline(path_data, _points(element), False)
+    return path_data
+
+
+def compile_polygon(element: ElementTree.Element) -> PathData:
+    path_data = PathData()
+    _append_polyline(path_data, _points(element), True)
+    return path_data
+
+
+# Maps the (local) tag of each basic shape to its compiler
+shape_compilers = {
+    "rect": compile_rect,
+    "circle": compile_circle,
+    "ellipse": compile_ellipse,
+    "line": compile_line,
+    "polyline": compile_polyline,
+    "polygon": compile_polygon,
+}
+
+
+def compile_shape(element: ElementTree.Element) -> PathData:
+    """
+    Compile a basic shape element into PathData.
+
+    :param element: A rect, circle, ellipse, line, polyline or polygon element.
+    :return: The shape's PathData. Empty if the shape isn't rendered, eg. if its width or radius is 0.
+    """
+    tag = element.tag.rpartition('}')[2]
+
+    try:
+        return shape_compilers[tag](element)
+    except ValueError as value_error:
+        warnings.warn(f"Skipping {tag} because it caused the following value error:\n{value_error}")
+        return PathData()
@@ -0,0 +1,182 @@
+"""
+Stitching of loose Lines into continuous LineSegmentChains, such that they're drawn without lifting the tool in between.
+
+The ends of the lines are snapped to the nodes of a graph, which are hashed in a uniform grid of twice the tolerance.
+Each line is an edge between two nodes. The edges are then covered with as few walks as possible:
+    - Walks start at the nodes with an odd number of lines, and end at another one. A component with 2k odd nodes can't
+    be covered with fewer than k walks.
+    - Once every node has an even number of lines left, the rest of the lines form closed loops. They're spliced into
+    the walks which pass through them, like in Hierholzer's algorithm, or drawn as separate loops.
+At nodes with several lines left, walks continue with the straightest one.
+
+Every step is linear in the number of lines, except at nodes with many lines, whose lines are scanned on every visit.
+"""
+
+import math
+
+from svg_to_gcode.geometry import Curve, Line, LineSegmentChain
+from svg_to_gcode import TOLERANCES
+
+
+class _Nodes:
+    """
+    Points which are closer than tolerance to each other are merged into a single node. A node is placed at the first of
+    its points and nodes are referred to by the order in which they were created.
+    """
+
+    __slots__ = 'tolerance', 'points', '_cells'
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.points = []
+        self._cells = {}
+
+    def node(self, x: float, y: float) -> int:
+        """Return the node of a point, a new one if no node is within tolerance."""
+        if self.tolerance == 0:
+            cell = x, y
+            cells = (cell,)
+        else:
+            # Cells are twice as large as the tolerance, so close points are in this cell or across the closest borders
+            scaled_x, scaled_y = x / (2 * self.tolerance), y / (2 * self.tolerance)
+            cell_x, cell_y = math.floor(scaled_x), math.floor(scaled_y)
+            step_x = 1 if scaled_x - cell_x >= 0.5 else -1
+            step_y = 1 if scaled_y - cell_y >= 0.5 else -1
+
+            cell = cell_x, cell_y
+            cells = (cell, (cell_x + step_x, cell_y), (cell_x, cell_y + step_y), (cell_x + step_x, cell_y + step_y))
+
+        for neighbour in cells:
+            for node in self._cells.get(neighbour, ()):
+                node_x, node_y = self.points[node]
+                if math.hypot(node_x - x, node_y - y) <= self.tolerance:
+                    return node
+
+        node = len(self.points)
+        self.points.append((x, y))
+        self._cells.setdefault(cell, []).append(node)
+
+        return node
+
+
+def stitchLines(curves: [Curve], tolerance=None) -> [Curve]:
+    """
+    Join Lines which share an end into LineSegmentChains, as long as possible. Lines may be drawn backwards. Lines which
+    can't be joined, and every other type of curve, are kept as they are.
+
+    :param curves: The curves to be stitched. Eg. the Lines of a dxf file.
+    :param tolerance: The distance below which the ends of two lines are considered the same point. Defaults to
+    TOLERANCES['input']. Lines are moved onto the first end they were snapped to.
+    :return: A new list of curves, in the order of their first curve in the input.
+    """
+    tolerance = TOLERANCES['input'] if tolerance is None else tolerance
+
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be a positive number. Not {tolerance}")
+
+    nodes = _Nodes(tolerance)
+    stitched = []  # (index of the first curve in the input, curve)
+
+    # Each edge is a line, between two nodes
+    edge_indices, edge_nodes = [], []
+    for index, curve in enumerate(curves):
+        if isinstance(curve, Line):
+            start, end = nodes.node(curve.start.x, curve.start.y), nodes.node(curve.end.x, curve.end.y)
+
+            # Lines of length 0 don't join anything
+            if start != end:
+                edge_indices.append(index)
+                edge_nodes.append((start, end))
+                continue
+
+        stitched.append((index, curve))
+
+    incident = [[] for _ in nodes.points]
+    for edge, (start, end) in enumerate(edge_nodes):
+        incident[start].append(edge)
+        incident[end].append(edge)
+
+    remaining = [len(edges) for edges in incident]
+    used = [False] * len(edge_nodes)
+
+    def next_edge(node: int, previous) -> int:
+        """The unused edge of node which continues straightest from previous, or the first one."""
+        edges = incident[node] = [edge for edge in incident[node] if not used[edge]]
+
+        if previous is None or len(edges) == 1:
+            return edges[0]
+
+        x, y = nodes.points[node]
+        previous_x, previous_y = nodes.points[previous]
+        direction = math.atan2(y - previous_y, x - previous_x)
+
+        def turn(edge):
+            start, end = edge_nodes[edge]
+            other_x, other_y = nodes.points[end if start == node else start]
+            return abs((math.atan2(other_y - y, other_x - x) - direction + math.pi) % (2 * math.pi) - math.pi)
+
+        return min(edges, key=turn)
+
+    def walk(node: int, previous=None) -> list:
+        """Follow unused edges from node until there are none left. Return the (edge, node) steps, the first is None."""
+        steps = [(None, node)]
+
+        while remaining[node]:
+            edge = next_edge(node, previous)
+            start, end = edge_nodes[edge]
+            other = end if start == node else start
+
+            used[edge] = True
+            remaining[node] -= 1
+            remaining[other] -= 1
+
+            steps.append((edge, other))
+            previous, node = node, other
+
+        return steps
+
+    def splice(steps: list) -> list:
+        """Insert a closed walk at every node with unused edges left. Every node must have an even number of them."""
+        spliced = []
+        stack = [iter(steps)]
+
+        while stack:
+            for step in stack[-1]:
+                spliced.append(step)
+                node = step[1]
+
+                if remaining[node]:
+                    # The walk returns to node, then the outer walk resumes
+                    previous = spliced[-2][1] if len(spliced) > 1 else None
+                    stack.append(iter(walk(node, previous)[1:]))
+                    break
+            else:
+                stack.pop()
+
+        return spliced
+
+    # Open walks between odd nodes first, which leaves an even number of edges at every node
+    walks = []
+    for node in range(len(nodes.points)):
+        if remaining[node] % 2:
+            walks.append(walk(node))
+
+    walks = [splice(steps) for steps in walks]
+
+    # The remaining edges form closed loops
+    for edge, (start, _) in enumerate(edge_nodes):
+        if not used[edge]:
+            walks.append(splice(walk(start)))
+
+    for steps in walks:
+        edges = [edge for edge, _ in steps[1:]]
+        index = min(edge_indices[edge] for edge in edges)
+
+        if len(edges) == 1:
+            stitched.append((index, curves[edge_indices[edges[0]]]))
+        else:
+            stitched.append((index, LineSegmentChain(vertices=[nodes.points[node] for _, node in steps])))
+
+    stitched.sort(key=lambda item: item[0])
+
+    return [curve for _, curve in stitched]
@@ -0,0 +1,188 @@
+"""
+Presentation styles. Inline style attributes and <style> stylesheets are resolved into a dictionary of properties per
+element, such that visibility and filter checks are simple lookups.
+
+Only the subset of css which svg editors commonly export is supported: rule sets whose selectors are a type, classes
+and an id (eg. "path", ".cut", "#edge1", "path.cut.red"), separated by commas. Rules with other selectors are ignored.
+"""
+
+import re
+import warnings
+
+from functools import lru_cache
+from xml.etree import ElementTree
+from typing import Dict, List
+
+# Presentation properties which children inherit from their parents. https://www.w3.org/TR/SVG2/propidx.html
+inherited_properties = ("visibility", "fill", "stroke", "stroke-width", "stroke-dasharray")
+
+_comment_pattern = re.compile(r"/\*.*?\*/", re.DOTALL)
+_rule_pattern = re.compile(r"([^{}]*)\{([^{}]*)\}")
+_selector_pattern = re.compile(r"(\*|[A-Za-z][\w-]*)?((?:[.#][\w-]+)*)")
+_simple_selector_pattern = re.compile(r"([.#])([\w-]+)")
+
+
+@lru_cache(maxsize=256)
+def parse_style(style: str) -> Dict[str, str]:
+    """
+    Parse css declarations, such as the value of a style attribute, into a dictionary.
+
+    Results are cached, since exports tend to repeat the same style on every element. Treat them as immutable.
+
+    :param style: Declarations separated by semicolons. Eg. "stroke:#000;stroke-dasharray:4, 2"
+    :return: A dictionary mapping property names to their values.
+    """
+    declarations = {}
+
+    for declaration in style.split(';'):
+        key, colon, value = declaration.partition(':')
+
+        if colon:
+            declarations[key.strip()] = value.strip()
+
+    return declarations
+
+
+def local_name(element: ElementTree.Element) -> str:
+    """Return the tag of an element without its namespace."""
+    return element.tag.rpartition('}')[2]
+
+
+class _Rule:
+    __slots__ = "type", "classes", "id", "specificity", "declarations"
+
+    def __init__(self, type_, classes, id_, declarations):
+        self.type = type_
+        self.classes = classes
+        self.id = id_
+        self.specificity = (id_ is not None, len(classes), type_ is not None)
+        self.declarations = declarations
+
+    def matches(self, element: ElementTree.Element, element_classes: List[str]) -> bool:
+        return (self.type is None or self.type == local_name(element)) \
+               and (self.id is None or self.id == element.get("id")) \
+               and all(class_ in element_classes for class_ in self.classes)
+
+
+class Stylesheet:
+    """
+    The Stylesheet class indexes the rules of one or more <style> elements by their selector's id, first class or type.
+
+    Matching an element only examines the rules indexed under its own id, classes and type, so the cost doesn't grow
+    with the number of rules in the document.
+    """
+
+    __slots__ = "id_rules", "class_rules", "type_rules", "universal_rules", "rule_count"
+
+    def __init__(self, css=None):
+        self.id_rules = {}
+        self.class_rules = {}
+        self.type_rules = {}
+        self.universal_rules = []
+        self.rule_count = 0
+
+        if css:
+            self.add_css(css)
+
+    def __repr__(self):
+        return f"Stylesheet({self.rule_count} rules)"
+
+    def __len__(self):
+        return self.rule_count
+
+    def add_css(self, css: str):
+        """Add the rules of a stylesheet. Later rules take precedence over earlier rules of the same specificity."""
+        css = _comment_pattern.sub('', css)
+
+        for selectors, declarations in _rule_pattern.findall(css):
+            declarations = parse_style(declarations)
+
+            for selector in selectors.split(','):
+                self._add_rule(selector.strip(), declarations)
+
+    def add_style_element(self, element: ElementTree.Element):
+        """Add the rules of a <style> element."""
+        if element.get("type", "text/css") == "text/css" and element.text:
+            self.add_css(element.text)
+
+    def _add_rule(self, selector: str, declarations: Dict[str, str]):
+        match = _selector_pattern.fullmatch(selector)
+
+        if not selector or selector.startswith('@') or match is None:
+            warnings.warn(f"Unsupported css selector '{selector}'. Ignoring it's rule.")
+            return
+
+        type_ = match.group(1) if match.group(1) != '*' else None
+        classes = []
+        id_ = None
+
+        for kind, name in _simple_selector_pattern.findall(match.group(2)):
+            if kind == '.':
+                classes.append(name)
+            else:
+                id_ = name
+
+        rule = _Rule(type_, classes, id_, declarations)
+        self.rule_count += 1
+
+        if id_ is not None:
+            self.id_rules.setdefault(id_, []).append((self.rule_count, rule))
+        elif classes:
+            self.class_rules.setdefault(classes[0], []).append((self.rule_count, rule))
+        elif type_ is not None:
+            self.type_rules.setdefault(type_, []).append((self.rule_count, rule))
+        else:
+            self.universal_rules.append((self.rule_count, rule))
+
+    def match(self, element: ElementTree.Element) -> List[Dict[str, str]]:
+        """
+        Find the declarations of every rule which applies to an element.
+
+        :return: A list of declaration dictionaries, in increasing order of precedence.
+        """
+        if not self.rule_count:
+            return []
+
+        element_classes = element.get("class", "").split()
+
+        candidates = list(self.universal_rules)
+        candidates.extend(self.type_rules.get(local_name(element), ()))
+        for class_ in element_classes:
+            candidates.extend(self.class_rules.get(class_, ()))
+        if element.get("id") is not None:
+            candidates.extend(self.id_rules.get(element.get("id"), ()))
+
+        matches = [(rule.specificity, order, rule) for order, rule in candidates if rule.matches(element, element_classes)]
+        matches.sort(key=lambda match: match[:2])
+
+        return [rule.declarations for _, _, rule in matches]
+
+
+def element_style(element: ElementTree.Element, stylesheet: Stylesheet = None, inherited_style=None) -> Dict[str, str]:
+    """
+    Compute the style of an element, in increasing order of precedence, from: the properties inherited from its parent,
+    its attributes, the stylesheet rules which match it and its style attribute.
+
+    :param element: The etree element.
+    :param stylesheet: The document's stylesheet, if any.
+    :param inherited_style: The style of the element's parent. Only inherited_properties are read from it.
+    :return: A dictionary mapping property (and attribute) names to values.
+    """
+    style = {}
+
+    if inherited_style:
+        for key in inherited_properties:
+            if key in inherited_style:
+                style[key] = inherited_style[key]
+
+    style.update(element.attrib)
+
+    if stylesheet is not None:
+        for declarations in stylesheet.match(element):
+            style.update(declarations)
+
+    inline_style = element.get("style")
+    if inline_style:
+        style.update(parse_style(inline_style))
+
+    return style
@@ -1,18 +1,19 @@
 import math
-from copy import deepcopy
 
-from svg_to_gcode.geometry import Vector, Matrix, IdentityMatrix
+from array import array
+
+from svg_to_gcode.geometry import Vector, Matrix, AffineMatrix
 
 
 class Transformation:
     """
     The Transformation class handles the parsing and computation behind svg transform attributes.
     """
-    __slots__ = "translation_matrix", "transformation_record", "command_methods"
+    __slots__ = "affine_matrix", "transformation_record", "command_methods"
 
     def __init__(self):
-        # Fancy matrix used for affine transformations (translations and linear transformations)
-        self.translation_matrix = IdentityMatrix(4)
+        # Used for affine transformations (translations and linear transformations)
+        self.affine_matrix = AffineMatrix()
 
         self.transformation_record = []
 
@@ -33,10 +34,28 @@ class Transformation:
 
     def __deepcopy__(self, memodict={}):
         copy = Transformation()
-        copy.translation_matrix = deepcopy(self.translation_matrix)
+        copy.affine_matrix = AffineMatrix(*self.affine_matrix)
 
         return copy
 
+    @property
+    def translation_matrix(self) -> Matrix:
+        """The transformation as a 4x4 Matrix. Kept for backwards compatibility, use self.affine_matrix instead."""
+        return self.affine_matrix.to_matrix()
+
+    def compose(self, transform_string: str) -> "Transformation":
+        """
+        Return a new Transformation which applies transform_string and then self. self is left untouched, such that a
+        single instance can be shared by every element which inherits it.
+        """
+        transformation = Transformation()
+        transformation.affine_matrix = self.affine_matrix
+        transformation.transformation_record = list(self.transformation_record)
+
+        transformation.add_transform(transform_string)
+
+        return transformation
+
     def add_transform(self, transform_string: str):
         transformations = transform_string.split(')')
 
@@ -56,25 +75,13 @@ class Transformation:
     # SVG transforms are equivalent to CSS transforms https://www.w3.org/TR/css-transforms-1/#MatrixDefined
     def add_matrix(self, a, b, c, d, e, f):
         self.transformation_record.append(("matrix", [a, b, c, d, e, f]))
-        matrix = Matrix([
-            [a, c, 0, e],
-            [b, d, 0, f],
-            [0, 0, 1, 0],
-            [0, 0, 0, 1]
-        ])
 
-        self.translation_matrix *= matrix
+        self.affine_matrix *= AffineMatrix(a, b, c, d, e, f)
 
     def add_translation(self, x: float, y=0.0):
         self.transformation_record.append(("translate", [x, y]))
-        translation_matrix = Matrix([
-            [1, 0, 0, x],
-            [0, 1, 0, y],
-            [0, 0, 1, 0],
-            [0, 0, 0, 1]
-        ])
 
-        self.translation_matrix *= translation_matrix
+        self.affine_matrix *= AffineMatrix(e=x, f=y)
 
     def add_scale(self, factor: float, factor_y=None):
         factor_x = factor
@@ -82,48 +89,28 @@ class Transformation:
 
         self.transformation_record.append(("scale", [factor_x, factor_y]))
 
-        scale_matrix = Matrix([
-            [factor_x, 0,        0, 0],
-            [0,        factor_y, 0, 0],
-            [0,        0,        1, 0],
-            [0,        0,        0, 1]
-        ])
-
-        self.translation_matrix *= scale_matrix
+        self.affine_matrix *= AffineMatrix(a=factor_x, d=factor_y)
 
     def add_rotation(self, angle: float, x=0.0, y=0.0):
         self.transformation_record.append(("rotate", [angle]))
 
         angle = math.radians(angle)
-        rotation_matrix = Matrix([
-            [math.cos(angle), -math.sin(angle), 0, 0],
-            [math.sin(angle), math.cos(angle),  0, 0],
-            [0,               0,                1, 0],
-            [0,               0,                0, 1]
-        ])
-
-        self.translation_matrix *= rotation_matrix
+        self.affine_matrix *= AffineMatrix(math.cos(angle), math.sin(angle), -math.sin(angle), math.cos(angle))
 
     def add_skew_x(self, angle):
         self.transformation_record.append(("skewX", [angle]))
 
         angle = math.radians(angle)
-        skew_matrix = IdentityMatrix(4)
-        skew_matrix.matrix_list[0][1] = math.tan(angle)
-
-        self.translation_matrix *= skew_matrix
+        self.affine_matrix *= AffineMatrix(c=math.tan(angle))
 
     def add_skew_y(self, angle):
         self.transformation_record.append(("skewY", [angle]))
 
         angle = math.radians(angle)
-        skew_matrix = IdentityMatrix(4)
-        skew_matrix.matrix_list[1][0] = math.tan(angle)
-
-        self.translation_matrix *= skew_matrix
+        self.affine_matrix *= AffineMatrix(b=math.tan(angle))
 
     def extend(self, other: "Transformation"):
-        self.translation_matrix *= other.translation_matrix
+        self.affine_matrix *= other.affine_matrix
         self.transformation_record.extend(other.transformation_record)
 
     def apply_affine_transformation(self, vector: Vector) -> Vector:
@@ -131,24 +118,18 @@ class Transformation:
         Apply the full affine transformation (linear + translation) to a vector. Generally used to transform points.
         Eg the center of an ellipse.
         """
-        vector_4d = Matrix([[vector.x], [vector.y], [1], [1]])
-        vector_4d = self.translation_matrix * vector_4d
-
-        return Vector(vector_4d.matrix_list[0][0], vector_4d.matrix_list[1][0])
+        return self.affine_matrix.apply_to_vector(vector)
 
     def apply_linear_transformation(self, vector: Vector) -> Vector:
         """
         Apply the linear component of the affine transformation (no translation) to a vector.
         Generally used to transform vector properties. Eg the radii of an ellipse.
         """
-        a = self.translation_matrix[0][0]
-        b = self.translation_matrix[1][0]
-        c = self.translation_matrix[0][1]
-        d = self.translation_matrix[1][1]
+        return self.affine_matrix.apply_linear(vector)
 
-        linear_transformation = Matrix([
-            [a, c],
-            [b, d]
-        ])
-
-        return linear_transformation * vector
+    def apply_to_coordinates(self, coordinates) -> array:
+        """
+        Apply the full affine transformation to a flat buffer of x, y pairs in a single call.
+        Generally used to transform every point of a path at once.
+        """
+        return self.affine_matrix.apply_to_coordinates(coordinates)
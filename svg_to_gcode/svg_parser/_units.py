@@ -0,0 +1,91 @@
+"""
+Absolute svg lengths and the root viewport. Based on https://www.w3.org/TR/SVG2/coords.html
+
+User units are css pixels, unless a viewBox says otherwise.
+"""
+
+import re
+
+from svg_to_gcode import UNITS
+
+# The size of each absolute unit in css pixels. https://www.w3.org/TR/css-values-3/#absolute-lengths
+unit_sizes = {"": 1.0, "px": 1.0, "pt": 96 / 72, "pc": 16.0, "mm": 96 / 25.4, "cm": 96 / 2.54, "q": 96 / 101.6,
+              "in": 96.0}
+
+_length_pattern = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zA-Z%]*)\s*")
+
+_aspect_ratio_alignments = {"min": 0.0, "mid": 0.5, "max": 1.0}
+
+
+def parse_length(value: str, unit="px") -> float:
+    """
+    Convert an absolute length to css pixels, or to another unit. Eg. '210mm' -> 793.7
+
+    :param value: A number, optionally followed by px, pt, pc, mm, cm, q or in.
+    :param unit: The unit of the result. Lengths which are already in unit are returned exactly.
+    :return: The length in unit.
+    """
+    match = _length_pattern.fullmatch(value)
+
+    if match is None or match.group(2).lower() not in unit_sizes:
+        raise ValueError(f"Unsupported length '{value}'. Only absolute lengths can be converted.")
+
+    return float(match.group(1)) * (unit_sizes[match.group(2).lower()] / unit_sizes[unit])
+
+
+def convert_length(pixels: float, unit: str) -> float:
+    """Convert a length from css pixels to unit ('mm' or 'in')."""
+    if unit not in UNITS:
+        raise ValueError(f"Unknown unit {unit}. Please specify one of the following: {UNITS}")
+
+    return pixels / unit_sizes[unit]
+
+
+def parse_view_box(view_box: str):
+    """Parse a viewBox attribute into (min_x, min_y, width, height). None if the viewBox is missing or invalid."""
+    if not view_box:
+        return None
+
+    values = [float(value) for value in view_box.replace(',', ' ').split()]
+
+    if len(values) != 4 or values[2] <= 0 or values[3] <= 0:
+        return None
+
+    return tuple(values)
+
+
+def view_box_to_viewport(view_box, viewport_width: float, viewport_height: float, preserve_aspect_ratio: str = None):
+    """
+    Compute the scale and translation which map a viewBox onto a viewport.
+
+    :param view_box: (min_x, min_y, width, height) as returned by parse_view_box.
+    :param viewport_width: The width of the viewport, in the output units.
+    :param viewport_height: The height of the viewport, in the output units.
+    :param preserve_aspect_ratio: The root's preserveAspectRatio attribute. Defaults to 'xMidYMid meet'.
+    :return: (scale_x, scale_y, translate_x, translate_y). A point maps to (x * scale_x + translate_x, ...)
+    """
+    min_x, min_y, width, height = view_box
+
+    scale_x = viewport_width / width
+    scale_y = viewport_height / height
+
+    words = (preserve_aspect_ratio or "xMidYMid meet").split()
+    if words and words[0] == "defer":
+        words = words[1:]
+
+    align = words[0] if words else "xMidYMid"
+    slice_ = len(words) > 1 and words[1] == "slice"
+
+    if align == "none":
+        return scale_x, scale_y, -min_x * scale_x, -min_y * scale_y
+
+    scale = max(scale_x, scale_y) if slice_ else min(scale_x, scale_y)
+
+    align = align.lower()
+    align_x = _aspect_ratio_alignments.get(align[1:4], 0.5)
+    align_y = _aspect_ratio_alignments.get(align[5:8], 0.5)
+
+    translate_x = -min_x * scale + align_x * (viewport_width - width * scale)
+    translate_y = -min_y * scale + align_y * (viewport_height - height * scale)
+
+    return scale, scale, translate_x, translate_y
@@ -0,0 +1,57 @@
+"""
+Compare the adaptive line segment approximation of beziers with Wang's formula at the same tolerance. The adaptive
+approximation grows and shrinks its segments by trial and error and only checks the error at sampled points. Wang's
+formula computes the number of segments upfront and bounds the error everywhere.
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from svg_to_gcode.geometry import Vector, CubicBazier, QuadraticBezier, LineSegmentChain
+
+
+def random_beziers(number_of_curves: int, size=100, seed=0):
+    """Generate an even mix of cubic and quadratic beziers with random control points."""
+    generator = random.Random(seed)
+    curves = []
+
+    for i in range(number_of_curves):
+        points = [Vector(generator.uniform(0, size), generator.uniform(0, size)) for _ in range(4)]
+        curves.append(CubicBazier(*points) if i % 2 else QuadraticBezier(*points[:3]))
+
+    return curves
+
+
+def max_deviation(curve, line_chain: LineSegmentChain, samples=2000) -> float:
+    """Measure the maximum distance from densely sampled points of the curve to the closest segment of the chain."""
+    points = curve.points(np.linspace(0, 1, samples))
+    starts, segments = line_chain.vertices.array[:-1], line_chain.vertices.segment_vectors()
+
+    deviations = np.full(samples, np.inf)
+    for start, segment in zip(starts, segments):
+        t = np.clip((points - start) @ segment / max(segment @ segment, 1e-30), 0, 1)
+        deviations = np.minimum(deviations, np.hypot(*(points - start - t.reshape(-1, 1) * segment).T))
+
+    return float(deviations.max())
+
+
+if __name__ == "__main__":
+    curves = random_beziers(200)
+    print(f"{len(curves)} random beziers\n")
+    print(f"{'tolerance':>10} {'method':>9} {'time [s]':>9} {'segments':>9} {'max deviation':>14}")
+
+    for tolerance in [0.1, 0.01, 0.001]:
+        for method in ["adaptive", "wang"]:
+            def approximate():
+                return [LineSegmentChain.line_segment_approximation(curve, error_cap=tolerance, method=method)
+                        for curve in curves]
+
+            run_time = min(timeit.repeat(approximate, number=1, repeat=3))
+            line_chains = approximate()
+
+            segments = sum(line_chain.chain_size() for line_chain in line_chains)
+            deviation = max(max_deviation(curve, line_chain) for curve, line_chain in zip(curves[:20], line_chains))
+
+            print(f"{tolerance:>10} {method:>9} {run_time:>9.4f} {segments:>9} {deviation:>14.6f}")
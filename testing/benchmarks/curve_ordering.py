@@ -0,0 +1,84 @@
+"""
+Compare sortCurves() with the quadratic nearest neighbour search it replaced. The previous implementation scanned every
+remaining curve at each step, and its distance, x*x* + y*y, parsed as x*x*(+y*y). It's reproduced below as it was, and
+with the distance corrected. sortCurves(reverse=True) may also draw curves backwards. optimizeCurves() improves the
+order of sortCurves() within a time limit.
+"""
+
+import math
+import random
+import time
+
+from svg_to_gcode.geometry import Vector, Line
+from svg_to_gcode.svg_parser import sortCurves, optimizeCurves
+
+
+def random_lines(number_of_lines: int, size=1000, length=5, seed=0):
+    """Short lines spread over a square sheet, like the cuts of a nested dxf."""
+    generator = random.Random(seed)
+    lines = []
+
+    for _ in range(number_of_lines):
+        start = Vector(generator.uniform(0, size), generator.uniform(0, size))
+        angle = generator.uniform(0, 2 * math.pi)
+        lines.append(Line(start, start + length * Vector(math.cos(angle), math.sin(angle))))
+
+    return lines
+
+
+def quadratic_sort_curves(curves, fixed_distance=False):
+    curves = list(curves)
+
+    newOrder = []
+    start = curves[0].end
+    newOrder.append(curves.pop(0))
+
+    while curves:
+        shortest = float("Inf")
+
+        for curve in curves:
+            x = start.x - curve.start.x
+            y = start.y - curve.start.y
+            d = x*x + y*y if fixed_distance else x*x* + y*y
+
+            if d < shortest:
+                shortest = d
+                selection = curve
+
+        newOrder.append(selection)
+
+        curves.remove(selection)
+        start = selection.end
+    return newOrder
+
+
+def travel_distance(curves) -> float:
+    """The total length of the moves from the end of each curve to the start of the next."""
+    return sum(abs(curve2.start - curve1.end) for curve1, curve2 in zip(curves, curves[1:]))
+
+
+if __name__ == "__main__":
+    implementations = {
+        "previous": quadratic_sort_curves,
+        "previous, fixed distance": lambda curves: quadratic_sort_curves(curves, fixed_distance=True),
+        "sortCurves": sortCurves,
+        "sortCurves, reverse": lambda curves: sortCurves(curves, reverse=True),
+        "optimizeCurves, 2 s": lambda curves: optimizeCurves(sortCurves(curves), time_limit=2),
+        "optimizeCurves, reverse, 2 s": lambda curves: optimizeCurves(sortCurves(curves, True), True, time_limit=2),
+    }
+
+    print(f"{'curves':>7} {'implementation':>29} {'time [s]':>9} {'travel distance':>16}")
+
+    for number_of_lines in [1000, 4000, 40000]:
+        lines = random_lines(number_of_lines)
+
+        for name, implementation in implementations.items():
+            # The quadratic implementations take minutes on the largest input
+            if number_of_lines > 4000 and name.startswith("previous"):
+                continue
+
+            start_time = time.perf_counter()
+            ordered_lines = implementation(lines)
+            run_time = time.perf_counter() - start_time
+
+            print(f"{number_of_lines:>7} {name:>29} {run_time:>9.3f} {travel_distance(ordered_lines):>16.0f}")
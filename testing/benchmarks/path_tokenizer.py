@@ -0,0 +1,88 @@
+"""
+Compare the single-pass path data tokenizer with the character-by-character parser it replaced, on increasingly long
+path data. The legacy parser splices the string for every implicit command and every negative number, so its run time
+grows quadratically with the length of d.
+"""
+
+import random
+import time
+import timeit
+
+from svg_to_gcode.svg_parser._path_data import tokenize_path_data, command_lengths
+
+
+def legacy_tokenize_path_data(d: str):
+    """The character-by-character parser previously used by Path._parse_commands, reduced to its tokenizing part."""
+    commands = []
+    command_key = ''
+    command_arguments = []
+    number_str = ''
+
+    i = 0
+    while i < len(d):
+        character = d[i]
+
+        is_numeric = character.isnumeric() or character in ['-', '.', 'e']
+        is_delimiter = character.isspace() or character in [',']
+        is_command_key = character in command_lengths.keys()
+        is_final = i == len(d) - 1
+
+        if command_key and len(command_arguments) == command_lengths[command_key] and is_numeric:
+            duplicate = {'m': 'l', 'M': 'L'}.get(command_key, command_key)
+            d = d[:i] + duplicate + d[i:]
+            continue
+
+        if is_numeric:
+            number_str += character
+
+            negatives = not is_final and character != 'e' and d[i + 1] == '-'
+            implicit_decimals = not is_final and d[i + 1] == '.' and '.' in number_str
+            if negatives or implicit_decimals:
+                d = d[:i+1] + ',' + d[i+1:]
+
+        if is_delimiter or is_command_key or is_final:
+            if number_str:
+                command_arguments.append(float(number_str))
+                number_str = ''
+
+        if is_command_key or is_final:
+            if command_key:
+                commands.append((command_key, list(command_arguments)))
+
+            command_key = character
+            command_arguments.clear()
+
+        if is_command_key and is_final:
+            commands.append((command_key, list(command_arguments)))
+
+        i += 1
+
+    return commands
+
+
+def random_path_data(number_of_coordinates: int, seed=0) -> str:
+    """Generate Inkscape-like path data: one moveto followed by implicit relative curves with negative numbers."""
+    generator = random.Random(seed)
+    coordinates = [f"{generator.uniform(-50, 50):.3f}" for _ in range(number_of_coordinates - 2)]
+    coordinates = coordinates[:len(coordinates) - len(coordinates) % 6]
+    # Negative coordinates need no separator, like Inkscape writes them
+    return "m 10,10 c" + "".join(f" {x}{y}" if float(y) < 0 else f" {x},{y}"
+                                 for x, y in zip(coordinates[::2], coordinates[1::2]))
+
+
+if __name__ == "__main__":
+    print(f"{'coordinates':>12} {'legacy [s]':>12} {'tokenizer [s]':>14} {'speedup':>8}")
+
+    for number_of_coordinates in [1_000, 5_000, 20_000, 100_000]:
+        d = random_path_data(number_of_coordinates)
+
+        tokenizer_time = min(timeit.repeat(lambda: list(tokenize_path_data(d)), number=1, repeat=3))
+
+        start_time = time.perf_counter()
+        legacy_tokens = legacy_tokenize_path_data(d)
+        legacy_time = time.perf_counter() - start_time
+
+        assert legacy_tokens == list(tokenize_path_data(d)), "The tokenizers disagree."
+
+        print(f"{number_of_coordinates:>12} {legacy_time:>12.4f} {tokenizer_time:>14.4f} "
+              f"{legacy_time / tokenizer_time:>7.1f}x")
@@ -1,6 +1,6 @@
 from xml.etree.ElementTree import Element, ElementTree
 
-from svg_to_gcode.svg_parser import parse_file, parse_string, parse_root
+from svg_to_gcode.svg_parser import parse_file, parse_string, parse_root, parse_iter
 from svg_to_gcode.geometry import LineSegmentChain
 
 from svg_to_gcode import TOLERANCES
@@ -18,6 +18,9 @@ def run_test(svg_file_name, _):
 
     file_curves = parse_file(svg_file_name)
 
+    iter_curves = list(parse_iter(root))
+    stream_curves = list(parse_file(svg_file_name, stream=True))
+
     if str(root_curves) != str(string_curves) or str(string_curves) != str(file_curves):
         print("Inconsistent parsing.")
         print("parse_root() ->", root_curves)
@@ -25,6 +28,13 @@ def run_test(svg_file_name, _):
         print("parse_file() ->", file_curves)
         return False
 
+    if str(file_curves) != str(iter_curves) or str(file_curves) != str(stream_curves):
+        print("Inconsistent lazy parsing.")
+        print("parse_file() ->", file_curves)
+        print("parse_iter() ->", iter_curves)
+        print("parse_file(stream=True) ->", stream_curves)
+        return False
+
     return True
 
 
@@ -0,0 +1,111 @@
+"""
+Use this script to verify whether AffineMatrix composes, inverts and applies transformations like the 4x4 Matrix
+arithmetic Transformation used before.
+"""
+
+import math
+
+from svg_to_gcode.geometry import Vector, Matrix, IdentityMatrix, AffineMatrix
+from svg_to_gcode.svg_parser import Transformation
+
+
+def reference_matrix(command: str, arguments: list) -> Matrix:
+    """The 4x4 Matrix of a single svg transform, as Transformation built it before AffineMatrix."""
+    if command == "matrix":
+        a, b, c, d, e, f = arguments
+        return Matrix([[a, c, 0, e], [b, d, 0, f], [0, 0, 1, 0], [0, 0, 0, 1]])
+
+    if command == "translate":
+        x, y = arguments
+        return Matrix([[1, 0, 0, x], [0, 1, 0, y], [0, 0, 1, 0], [0, 0, 0, 1]])
+
+    if command == "scale":
+        x, y = arguments
+        return Matrix([[x, 0, 0, 0], [0, y, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+
+    if command == "rotate":
+        angle = math.radians(arguments[0])
+        return Matrix([[math.cos(angle), -math.sin(angle), 0, 0], [math.sin(angle), math.cos(angle), 0, 0],
+                       [0, 0, 1, 0], [0, 0, 0, 1]])
+
+    matrix = IdentityMatrix(4)
+    if command == "skewX":
+        matrix.matrix_list[0][1] = math.tan(math.radians(arguments[0]))
+    else:
+        matrix.matrix_list[1][0] = math.tan(math.radians(arguments[0]))
+
+    return matrix
+
+
+def reference_apply(matrix: Matrix, point: Vector) -> Vector:
+    result = matrix * Matrix([[point.x], [point.y], [1], [1]])
+    return Vector(result[0][0], result[1][0])
+
+
+def close(vector1: Vector, vector2: Vector) -> bool:
+    return abs(vector1 - vector2) < 1e-9
+
+
+transforms = [
+    "translate(10 -5)",
+    "scale(2) translate(3, 4)",
+    "scale(1.5 -0.5)",
+    "rotate(30)",
+    "skewX(20)",
+    "skewY(-35)",
+    "matrix(1.2 0.3 -0.4 0.9 5 7)",
+    "translate(10 20) rotate(45) scale(2 3) skewX(10) skewY(5) matrix(1 0.2 0.1 1 -3 4)",
+]
+
+points = [Vector(0, 0), Vector(1, 0), Vector(0, 1), Vector(-7.5, 12.25)]
+failures = 0
+
+for transform in transforms:
+    transformation = Transformation()
+    transformation.add_transform(transform)
+    affine_matrix = transformation.affine_matrix
+
+    # Composition, from the record of the single transforms
+    reference = IdentityMatrix(4)
+    for command, arguments in transformation.transformation_record:
+        reference *= reference_matrix(command, arguments)
+
+    if not all(close(affine_matrix * point, reference_apply(reference, point)) for point in points):
+        failures += 1
+        print(f"AffineMatrix doesn't apply {transform} like Matrix")
+
+    # Every way of applying a transformation must agree
+    coordinates = affine_matrix.apply_to_coordinates([value for point in points for value in point])
+    applied = [Vector(*affine_matrix.apply(point.x, point.y)) for point in points]
+    linear = [affine_matrix.apply_to_vector(point) - affine_matrix.apply_to_vector(Vector(0, 0)) for point in points]
+
+    if not all(close(Vector(*coordinates[2 * i:2 * i + 2]), affine_matrix * point) and
+               close(applied[i], affine_matrix * point) and close(linear[i], affine_matrix.apply_linear(point))
+               for i, point in enumerate(points)):
+        failures += 1
+        print(f"AffineMatrix applies {transform} inconsistently")
+
+    if not all(close(reference_apply(affine_matrix.to_matrix(), point), affine_matrix * point) for point in points):
+        failures += 1
+        print(f"AffineMatrix.to_matrix() isn't equivalent for {transform}")
+
+    # The inverse undoes the transformation, on either side
+    inverse = affine_matrix.inverse()
+    identity = AffineMatrix()
+    if not all(close((inverse * affine_matrix) * point, point) and close(affine_matrix * (inverse * point), point)
+               for point in points) or not \
+            all(abs(value - expected) < 1e-9 for value, expected in zip(affine_matrix * inverse, identity)):
+        failures += 1
+        print(f"AffineMatrix.inverse() doesn't undo {transform}")
+
+try:
+    AffineMatrix(1, 2, 2, 4).inverse()
+    failures += 1
+    print("A singular AffineMatrix was inverted")
+except ValueError:
+    pass
+
+if failures:
+    print(f"AffineMatrix is broken! {failures} test cases failed.")
+else:
+    print(f"AffineMatrix matches Matrix for all {len(transforms)} transforms")
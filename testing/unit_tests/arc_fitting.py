@@ -0,0 +1,62 @@
+"""
+Use this script to verify whether biarc fitting stays within tolerance, also around cusps, and compiles to consistent
+G2/G3 commands.
+"""
+
+import math
+import random
+import re
+
+import numpy as np
+
+from svg_to_gcode.geometry import Vector, CubicBazier, QuadraticBezier, SmoothArcChain
+from svg_to_gcode.compiler import Compiler, interfaces
+from svg_to_gcode import TOLERANCES
+
+generator = random.Random(0)
+curves = []
+for i in range(40):
+    points = [Vector(generator.uniform(0, 100), generator.uniform(0, 100)) for _ in range(4)]
+    curves.append(CubicBazier(*points) if i % 2 else QuadraticBezier(*points[:3]))
+
+# Curves with a cusp, where the derivative vanishes and the curve turns back
+cusps = [QuadraticBezier(Vector(0, 0), Vector(0, 0), Vector(5, 5)),
+         CubicBazier(Vector(0, 0), Vector(10, 0), Vector(10, 10), Vector(0, 10))]
+curves += cusps
+
+# Compare densely sampled points of each curve with points sampled every 0.002 along its arcs
+worst_deviation = 0
+for curve in curves:
+    arcs = SmoothArcChain.arc_approximation(curve)
+    arc_points = np.vstack([arc.points(np.linspace(0, 1, 2 + int(arc.length() / 0.002))) for arc in arcs])
+
+    for point in curve.points(np.linspace(0, 1, 400)):
+        worst_deviation = max(worst_deviation, np.hypot(*(arc_points - point).T).min())
+
+# Sections which end at a cusp are fitted along their chord, rather than given up on and split into many lines
+cusp_sections = [SmoothArcChain.arc_approximation(cusp).chain_size() for cusp in cusps]
+
+# G2/G3 commands must end on their circle, otherwise controllers reject them
+compiler = Compiler(interfaces.Gcode, movement_speed=1000, cutting_speed=300, pass_depth=0, arcs=True)
+compiler.append_curves(curves)
+
+position, arc_commands, radius_errors = None, 0, []
+for command in compiler.body:
+    words = {key: float(value) for key, value in re.findall(r"([XYIJ])(-?[\d.]+)", command)}
+
+    if command.startswith(("G2", "G3")):
+        arc_commands += 1
+        center = (position[0] + words["I"], position[1] + words["J"])
+        radius_errors.append(abs(math.hypot(words["I"], words["J"]) -
+                                 math.hypot(words["X"] - center[0], words["Y"] - center[1])))
+
+    if "X" in words:
+        position = (words["X"], words["Y"])
+
+# Sampling the arcs adds a little error of its own
+if worst_deviation < 1.05 * TOLERANCES["approximation"] and arc_commands and max(radius_errors) < 0.002 and \
+        max(cusp_sections) <= 32:
+    print(f"{arc_commands} arcs are within {worst_deviation:.5f} of {len(curves)} curves")
+else:
+    print(f"Arc fitting is broken! deviation: {worst_deviation}, arcs: {arc_commands}, "
+          f"radius error: {max(radius_errors, default=None)}, sections around cusps: {cusp_sections}")
@@ -0,0 +1,49 @@
+"""Use this script to verify whether numeric arc-lengths, and their inverse, are accurate."""
+
+import math
+
+import numpy as np
+
+from svg_to_gcode.geometry import Vector, CubicBazier, QuadraticBezier, EllipticalArc
+from svg_to_gcode.svg_parser import Transformation
+
+transformation = Transformation()
+transformation.add_transform("matrix(1.2 0.3 -0.4 0.9 5 7) rotate(30)")
+
+curves = [
+    CubicBazier(Vector(0, 0), Vector(10, 0), Vector(0, 10), Vector(10, 10)),
+    CubicBazier(Vector(0, 0), Vector(1, 0), Vector(3, 1), Vector(-2, 1)),
+    CubicBazier(Vector(0, 0), Vector(3, 0), Vector(0, 0), Vector(3, 0)),
+    QuadraticBezier(Vector(0, 0), Vector(10, 0), Vector(5, 8)),
+    EllipticalArc(Vector(1, 2), Vector(5, 3), 0.4, 0.3, 2.0, None),
+    EllipticalArc(Vector(1, 2), Vector(5, 3), 0.4, 0.3, -2.0, transformation),
+    EllipticalArc(Vector(0, 0), Vector(3, 3), 0, 0, 2 * math.pi, None),
+]
+
+failures = 0
+for curve in curves:
+    # A dense polyline converges to the arc-length from below
+    vertices = curve.points(np.linspace(0, 1, 10 ** 6 + 1))
+    expected_length = np.hypot(*np.diff(vertices, axis=0).T).sum()
+    length = curve.length()
+
+    # Points sampled at even distances are evenly spaced along a dense polyline
+    distances = np.linspace(0, length, 21)
+    ts = curve.distances_to_ts(distances)
+    polyline_distances = np.concatenate(([0], np.cumsum(np.hypot(*np.diff(vertices, axis=0).T))))
+    sampled_distances = np.interp(ts, np.linspace(0, 1, len(vertices)), polyline_distances)
+
+    if not math.isclose(length, expected_length, rel_tol=1e-9) or \
+            not np.allclose(sampled_distances, distances, atol=1e-6 * length) or not np.allclose(ts[[0, -1]], (0, 1)):
+        failures += 1
+        print(f"{curve} is measured incorrectly: {length} instead of {expected_length}")
+
+circle = curves[-1]
+if not math.isclose(circle.length(), 6 * math.pi, rel_tol=1e-12):
+    failures += 1
+    print(f"The circumference of a circle of radius 3 is {circle.length()} instead of {6 * math.pi}")
+
+if failures:
+    print(f"Arc-lengths are broken! {failures} curves are measured incorrectly.")
+else:
+    print(f"All {len(curves)} curves are measured accurately")
@@ -0,0 +1,47 @@
+"""Use this script to verify whether basic shapes are parsed into the same outlines as their equivalent paths."""
+
+from svg_to_gcode.svg_parser import parse_string
+
+# Each shape followed by its equivalent path
+equivalents = [
+    ('<rect x="10" y="10" width="20" height="10"/>', 'M10 10 H30 V20 H10 Z'),
+    ('<rect x="10" y="10" width="20" height="10" rx="2"/>',
+     'M12 10 H28 A2 2 0 0 1 30 12 V18 A2 2 0 0 1 28 20 H12 A2 2 0 0 1 10 18 V12 A2 2 0 0 1 12 10'),
+    ('<circle cx="50" cy="50" r="10"/>', 'M60 50 A10 10 0 0 1 40 50 A10 10 0 0 1 60 50'),
+    ('<ellipse cx="50" cy="50" rx="10" ry="5"/>', 'M60 50 A10 5 0 0 1 40 50 A10 5 0 0 1 60 50'),
+    ('<line x1="0" y1="0" x2="5" y2="5"/>', 'M0 0 L5 5'),
+    ('<polyline points="0,0 1,1 2,0"/>', 'M0 0 L1 1 L2 0'),
+    ('<polygon points="0,0 1,1 2,0"/>', 'M0 0 L1 1 L2 0 Z'),
+]
+
+
+def outline(svg_element, samples):
+    """Sample points along the curves of a single svg element."""
+    curves = parse_string(f'<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">{svg_element}</svg>')
+
+    points = []
+    for curve in curves:
+        for i in range(samples + 1):
+            t = i / samples
+            points.append(curve.point(t))
+
+    return points
+
+
+def covers(points, dense_points, tolerance=0.1):
+    """Check whether every point lies close to the outline described by dense_points."""
+    return all(min(abs(point - other) for other in dense_points) < tolerance for point in points)
+
+
+failures = 0
+for shape, path in equivalents:
+    path = f'<path d="{path}"/>'
+
+    if not (covers(outline(shape, 8), outline(path, 128)) and covers(outline(path, 8), outline(shape, 128))):
+        failures += 1
+        print(f"{shape} doesn't match its equivalent path {path}")
+
+if failures:
+    print(f"Basic shapes are broken! {failures}/{len(equivalents)} shapes differ from their equivalent path.")
+else:
+    print("Identical outlines. Basic shapes are parsed correctly")
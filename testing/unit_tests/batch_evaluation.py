@@ -0,0 +1,69 @@
+"""
+Use this script to verify whether points(ts) and derivatives(ts) agree with point(t) for every type of curve, and
+whether chains keep their length index consistent.
+"""
+
+import numpy as np
+
+from svg_to_gcode.geometry import Vector, Line, CubicBazier, QuadraticBezier, EllipticalArc, CircularArc
+from svg_to_gcode.geometry import LineSegmentChain, SmoothArcChain
+from svg_to_gcode.svg_parser import Transformation
+
+transformation = Transformation()
+transformation.add_transform("matrix(1.2 0.3 -0.4 0.9 5 7) rotate(30)")
+
+cubic = CubicBazier(Vector(0, 0), Vector(10, 0), Vector(0, 10), Vector(10, 10))
+curves = [
+    Line(Vector(0, 0), Vector(3, 4)),
+    Line(Vector(2, 0), Vector(2, 5)),
+    cubic,
+    QuadraticBezier(Vector(0, 0), Vector(10, 0), Vector(5, 8)),
+    EllipticalArc(Vector(1, 2), Vector(5, 3), 0.4, 0.3, 2.0, None),
+    EllipticalArc(Vector(1, 2), Vector(5, 3), 0.4, 0.3, -2.0, transformation),
+    CircularArc(Vector(1, 0), Vector(0, 1), Vector(0, 0)),
+    LineSegmentChain.line_segment_approximation(cubic),
+    SmoothArcChain.arc_approximation(cubic, 0.01),
+]
+
+ts = np.linspace(0, 1, 11)
+inner_ts, step = ts[1:-1], 1e-6
+shuffled_ts = np.random.default_rng(0).permutation(ts)
+
+failures = 0
+for curve in curves:
+    points = curve.points(ts)
+    expected_points = np.array([tuple(curve.point(t)) for t in ts])
+
+    # Central differences of points() approximate the derivatives
+    derivatives = curve.derivatives(inner_ts)
+    expected_derivatives = (curve.points(inner_ts + step) - curve.points(inner_ts - step)) / (2 * step)
+
+    # Chains group ts by curve, the order of the ts mustn't matter
+    shuffled_points = curve.points(shuffled_ts)
+    expected_shuffled_points = np.array([tuple(curve.point(t)) for t in shuffled_ts])
+
+    if not (np.allclose(points, expected_points) and np.allclose(derivatives, expected_derivatives, atol=1e-4) and
+            np.allclose(shuffled_points, expected_shuffled_points)):
+        failures += 1
+        print(f"{type(curve).__name__} points(ts) or derivatives(ts) don't match point(t)")
+
+# The length index must follow the chain as curves are removed and merged
+for chain in curves[-2:]:
+    size = chain.chain_size()
+    tail = type(chain)(vertices=chain.vertices.array[3:]) if isinstance(chain, LineSegmentChain) else \
+        type(chain)([chain.get(i) for i in range(3, size)])
+
+    chain.remove_from_last(size - 3)
+    chain.merge(tail)
+    chain.remove_from_first(1)
+
+    expected_length = sum(curve.length() for curve in chain)
+    if chain.chain_size() != size - 1 or not np.isclose(chain.length(), expected_length) or \
+            not np.allclose(tuple(chain.point(1)), tuple(chain.get(-1).end)):
+        failures += 1
+        print(f"{type(chain).__name__} length index is inconsistent after remove_from_first, remove_from_last and merge")
+
+if failures:
+    print(f"Batch evaluation is broken! {failures}/{len(curves)} curves are inconsistent.")
+else:
+    print(f"All {len(curves)} curves evaluate consistently")
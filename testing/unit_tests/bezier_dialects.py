@@ -0,0 +1,53 @@
+"""Use this script to verify whether beziers are drawn natively, and exactly, by the G5 / G5.1 interface dialects."""
+
+import re
+
+import numpy as np
+
+from svg_to_gcode.svg_parser import parse_file
+from svg_to_gcode.geometry import Vector, CubicBazier, QuadraticBezier
+from svg_to_gcode.compiler import Compiler, interfaces
+
+curves = parse_file("testing/examples/cubic_bazier.svg") + parse_file("testing/examples/quadratic_bazier.svg")
+beziers = [curve for curve in curves if isinstance(curve, (CubicBazier, QuadraticBezier))]
+
+
+def decoded_beziers(body):
+    """Rebuild the beziers described by G5 and G5.1 commands."""
+    position, decoded = None, []
+
+    for command in body:
+        words = {key: float(value) for key, value in re.findall(r" ([XYIJPQ])(-?[\d.]+)", command)}
+
+        if command.startswith("G5.1"):
+            decoded.append(QuadraticBezier(position, Vector(words["X"], words["Y"]),
+                                           position + Vector(words["I"], words["J"])))
+        elif command.startswith("G5"):
+            end = Vector(words["X"], words["Y"])
+            decoded.append(CubicBazier(position, end, position + Vector(words["I"], words["J"]),
+                                       end + Vector(words["P"], words["Q"])))
+
+        if "X" in words:
+            position = Vector(words["X"], words["Y"])
+
+    return decoded
+
+
+ts = np.linspace(0, 1, 50)
+for interface in [interfaces.MarlinGcode, interfaces.LinuxCNCGcode]:
+    compiler = Compiler(interface, movement_speed=1000, cutting_speed=300, pass_depth=0, beziers=True)
+    compiler.append_curves(curves)
+
+    decoded = decoded_beziers(compiler.body)
+    deviation = max((np.abs(curve.points(ts) - original.points(ts)).max() for curve, original in zip(decoded, beziers)),
+                    default=np.inf)
+
+    line_compiler = Compiler(interfaces.Gcode, movement_speed=1000, cutting_speed=300, pass_depth=0)
+    line_compiler.append_curves(curves)
+
+    if len(decoded) == len(beziers) and deviation < 1e-3:
+        print(f"{interface.__name__}: {len(beziers)} beziers drawn natively in {len(compiler.body)} commands "
+              f"instead of {len(line_compiler.body)}")
+    else:
+        print(f"{interface.__name__}: native beziers are broken! {len(decoded)}/{len(beziers)} decoded, "
+              f"deviation: {deviation}")
@@ -0,0 +1,168 @@
+"""
+Use this script to verify whether sortCurves() orders curves like a brute force greedy nearest neighbour search, whether
+optimizeCurves() improves the order without losing any curve, whether it keeps collinear dashes together when the
+direction of travel matters, and whether every type of curve can be reversed.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from svg_to_gcode.geometry import Vector, Line, CubicBazier, QuadraticBezier, EllipticalArc, CircularArc
+from svg_to_gcode.geometry import LineSegmentChain, SmoothArcChain
+from svg_to_gcode.svg_parser import Transformation, sortCurves, optimizeCurves, travelTime
+
+
+def random_lines(number_of_lines: int, size=100, seed=0, grid=None):
+    """Random lines. If grid is given, coordinates are rounded to it, which creates many ties."""
+    generator = random.Random(seed)
+
+    def coordinate():
+        value = generator.uniform(0, size)
+        return value if grid is None else round(value / grid) * grid
+
+    return [Line(Vector(coordinate(), coordinate()), Vector(coordinate(), coordinate()))
+            for _ in range(number_of_lines)]
+
+
+def brute_force_order(curves, reverse=False):
+    """Return the (start, end) of each ordered curve."""
+    if not curves:
+        return []
+
+    # The ends of open curves are candidates too, right after their start
+    candidates = [(i, is_end) for i in range(1, len(curves)) for is_end in (False, True)
+                  if not is_end or (reverse and tuple(curves[i].start) != tuple(curves[i].end))]
+    order = [(tuple(curves[0].start), tuple(curves[0].end))]
+
+    while candidates:
+        end = order[-1][1]
+
+        def distance(candidate):
+            point = tuple(curves[candidate[0]].end if candidate[1] else curves[candidate[0]].start)
+            return (point[0] - end[0]) ** 2 + (point[1] - end[1]) ** 2
+
+        i, is_end = min(candidates, key=distance)
+        candidates = [candidate for candidate in candidates if candidate[0] != i]
+
+        start, end = tuple(curves[i].start), tuple(curves[i].end)
+        order.append((end, start) if is_end else (start, end))
+
+    return order
+
+
+def endpoints(curves):
+    return [(tuple(curve.start), tuple(curve.end)) for curve in curves]
+
+
+test_cases = {
+    "random lines": random_lines(500),
+    "clustered lines": random_lines(300, size=1) + random_lines(300, seed=1),
+    "lines with ties": random_lines(500, grid=10),
+    "collinear lines": [Line(Vector(x, 0), Vector(x + 0.5, 0)) for x in random.Random(0).sample(range(1000), 300)],
+    "closed lines": random_lines(100) + [Line(Vector(x, x), Vector(x, x)) for x in range(0, 100, 3)],
+    "single line": random_lines(1),
+    "no lines": [],
+}
+
+failures = 0
+for name, curves in test_cases.items():
+    for reverse in [False, True]:
+        if endpoints(sortCurves(curves, reverse)) != brute_force_order(curves, reverse):
+            failures += 1
+            print(f"sortCurves(reverse={reverse}) doesn't match the brute force order for {name}")
+
+
+def travel(curves, cost=lambda distance: distance):
+    return sum(cost(abs(curve2.start - curve1.end)) for curve1, curve2 in zip(curves, curves[1:]))
+
+
+# optimizeCurves() must draw the same curves, starting with the same curve, with less travel
+for name in ["random lines", "clustered lines", "closed lines"]:
+    for reverse in [False, True]:
+        for cost in [None, travelTime(1000, lift_time=0.5)]:
+            curves = sortCurves(test_cases[name], reverse)
+            optimized_curves = optimizeCurves(curves, reverse, time_limit=None, cost=cost)
+
+            expected_lines = sorted(sorted(line) for line in endpoints(curves))
+            lines = sorted(sorted(line) for line in endpoints(optimized_curves))
+            directions_kept = set(endpoints(optimized_curves)) <= set(endpoints(curves))
+
+            cost = cost or (lambda distance: distance)
+            if lines != expected_lines or optimized_curves[0] is not curves[0] or \
+                    (not reverse and not directions_kept) or travel(optimized_curves, cost) >= travel(curves, cost):
+                failures += 1
+                print(f"optimizeCurves(reverse={reverse}) didn't improve the order of {name}")
+
+
+def heading(curve):
+    return math.atan2(curve.end.y - curve.start.y, curve.end.x - curve.start.x)
+
+
+def knife_cost(distance, rotation):
+    """Lifting the knife costs 1, turning it by a half-turn costs 1 and every 100 units of travel cost 1."""
+    return rotation / math.pi + (distance / 100 + 1 if distance > 1e-6 else 0)
+
+
+def knife_time(curves):
+    rotations = [abs((heading(curve2) - heading(curve1) + math.pi) % (2 * math.pi) - math.pi)
+                 for curve1, curve2 in zip(curves, curves[1:])]
+    return sum(knife_cost(abs(curve2.start - curve1.end), rotation)
+               for curve1, curve2, rotation in zip(curves, curves[1:], rotations))
+
+
+def dashed_lines(number_of_lines: int, seed=0):
+    """Dashed lines in random directions, drawn in a random order and direction, except for the first dash."""
+    generator = random.Random(seed)
+    dashes = []
+
+    for line in range(number_of_lines):
+        angle, x, y = generator.uniform(0, 2 * math.pi), generator.uniform(0, 100), generator.uniform(0, 100)
+        for dash in range(generator.randint(2, 6)):
+            start = Vector(x + 4 * dash * math.cos(angle), y + 4 * dash * math.sin(angle))
+            end = Vector(x + (4 * dash + 2.5) * math.cos(angle), y + (4 * dash + 2.5) * math.sin(angle))
+            dashes.append(Line(end, start) if dashes and generator.random() < 0.5 else Line(start, end))
+
+    return dashes[:1] + generator.sample(dashes[1:], len(dashes) - 1)
+
+
+def turns(curves):
+    return sum(abs(heading(curve2) - heading(curve1)) > 1e-9 for curve1, curve2 in zip(curves, curves[1:]))
+
+
+# With headings, the dashes of each line must be cut one after another, in the same direction
+for number_of_lines in [1, 10, 30]:
+    curves = sortCurves(dashed_lines(number_of_lines), True)
+    optimized_curves = optimizeCurves(curves, True, time_limit=None, cost=knife_cost, headings=True)
+
+    if turns(optimized_curves) != number_of_lines - 1 or knife_time(optimized_curves) > knife_time(curves):
+        failures += 1
+        print(f"optimizeCurves(headings=True) turned the knife {turns(optimized_curves)} times between the dashes of "
+              f"{number_of_lines} lines")
+
+# reversed().points(ts) must be points(1 - ts)
+transformation = Transformation()
+transformation.add_transform("matrix(1.2 0.3 -0.4 0.9 5 7) rotate(30)")
+cubic = CubicBazier(Vector(0, 0), Vector(10, 0), Vector(0, 10), Vector(10, 10))
+
+curves = [
+    Line(Vector(0, 0), Vector(3, 4)),
+    cubic,
+    QuadraticBezier(Vector(0, 0), Vector(10, 0), Vector(5, 8)),
+    EllipticalArc(Vector(1, 2), Vector(5, 3), 0.4, 0.3, -2.0, transformation),
+    CircularArc(Vector(1, 0), Vector(0, 1), Vector(0, 0), clockwise=True),
+    LineSegmentChain.line_segment_approximation(cubic),
+    SmoothArcChain.arc_approximation(cubic, 0.01),
+]
+
+ts = np.linspace(0, 1, 11)
+for curve in curves:
+    if not np.allclose(curve.reversed().points(ts), curve.points(1 - ts)):
+        failures += 1
+        print(f"{type(curve).__name__}.reversed() doesn't follow the curve backwards")
+
+if failures:
+    print(f"Curve ordering is broken! {failures} test cases failed.")
+else:
+    print(f"sortCurves and optimizeCurves passed all test cases and all {len(curves)} curves can be reversed")
@@ -0,0 +1,104 @@
+"""
+Use this script to verify whether stitchLines() joins every loose line into as few continuous chains as possible, and
+whether the compilers draw the chains without lifting the tool in between.
+"""
+
+import random
+from collections import Counter
+
+from svg_to_gcode.geometry import Vector, Line, LineSegmentChain, CubicBazier
+from svg_to_gcode.svg_parser import stitchLines, sortCurves
+from svg_to_gcode.compiler import Compiler, interfaces
+
+generator = random.Random(0)
+
+
+def jitter(x, y):
+    """Ends of the same point differ by less than TOLERANCES['input'], like the ends of lines exported from CAD."""
+    return Vector(x + generator.uniform(-1e-4, 1e-4), y + generator.uniform(-1e-4, 1e-4))
+
+
+def line(point1, point2):
+    return Line(jitter(*point1), jitter(*point2)) if generator.random() < 0.5 else Line(jitter(*point2), jitter(*point1))
+
+
+def key(x, y):
+    return round(x, 2), round(y, 2)
+
+
+# A mesh of 10 x 10 cells, 50 separate squares, a star and a dashed line
+lines = [line((x, y), (x + 1, y)) for x in range(10) for y in range(11)] + \
+        [line((x, y), (x, y + 1)) for x in range(11) for y in range(10)]
+
+for square in range(50):
+    x, y = 20 + 2 * (square % 10), 2 * (square // 10)
+    corners = [(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1), (x, y)]
+    lines += [line(corner1, corner2) for corner1, corner2 in zip(corners, corners[1:])]
+
+lines += [line((50, 50), (50 + dx, 50 + dy)) for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1), (1, 1)]]
+lines += [line((60 + 2 * dash, 0), (61 + 2 * dash, 0)) for dash in range(10)]
+generator.shuffle(lines)
+
+# Other curves, and lines of length 0, must be kept as they are
+bezier = CubicBazier(Vector(0, 0), Vector(5, 5), Vector(0, 5), Vector(5, 0))
+point = Line(Vector(70, 70), Vector(70, 70))
+curves = lines + [bezier, point]
+
+stitched_curves = stitchLines(curves)
+
+# Every line must be drawn exactly once
+expected_lines = Counter(tuple(sorted((key(*line.start), key(*line.end)))) for line in lines)
+stitched_lines = Counter()
+for curve in stitched_curves:
+    if isinstance(curve, (Line, LineSegmentChain)) and curve is not point:
+        for stitched_line in LineSegmentChain.line_segment_approximation(curve):
+            stitched_lines[tuple(sorted((key(*stitched_line.start), key(*stitched_line.end))))] += 1
+
+# Each connected group of lines with 2k ends of odd degree can't be drawn with fewer than max(k, 1) chains
+parents = {}
+
+
+def find(node):
+    while parents.setdefault(node, node) != node:
+        node = parents[node]
+    return node
+
+
+degrees = Counter()
+for start, end in expected_lines.elements():
+    degrees[start] += 1
+    degrees[end] += 1
+    parents[find(start)] = find(end)
+
+odd_nodes = Counter(find(node) for node, degree in degrees.items() if degree % 2)
+groups = {find(node) for node in degrees}
+expected_chains = sum(max(odd_nodes[group] // 2, 1) for group in groups)
+chains = len(stitched_curves) - 2
+
+failures = 0
+if stitched_lines != expected_lines:
+    failures += 1
+    print("stitchLines() lost or duplicated some lines")
+
+if chains != expected_chains:
+    failures += 1
+    print(f"stitchLines() joined {len(lines)} lines into {chains} chains instead of {expected_chains}")
+
+if bezier not in stitched_curves or point not in stitched_curves:
+    failures += 1
+    print("stitchLines() didn't keep the other curves")
+
+# Chains are drawn as a whole, the laser is only turned off before each of them
+for arcs in [False, True]:
+    compiler = Compiler(interfaces.Gcode, movement_speed=1000, cutting_speed=300, pass_depth=0, arcs=arcs)
+    compiler.append_curves(sortCurves(stitched_curves))
+    laser_offs = sum(command == compiler.interface.laser_off() for command in compiler.body)
+
+    if laser_offs > len(stitched_curves):
+        failures += 1
+        print(f"Compiler(arcs={arcs}) turned the laser off {laser_offs} times for {len(stitched_curves)} curves")
+
+if failures:
+    print(f"Line stitching is broken! {failures} test cases failed.")
+else:
+    print(f"stitchLines passed all test cases, {len(lines)} lines were joined into {chains} chains")
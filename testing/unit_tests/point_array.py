@@ -0,0 +1,62 @@
+"""Use this script to verify whether LineSegmentChains stored as Polylines behave like chains of Line objects."""
+
+import math
+
+from svg_to_gcode.geometry import Vector, Line, Polyline, LineSegmentChain, CubicBazier
+
+
+
+def same(v1, v2):
+    return tuple(v1) == tuple(v2)
+
+
+curve = CubicBazier(Vector(0, 0), Vector(0, 10), Vector(10, 10), Vector(10, 0))
+chain = LineSegmentChain.line_segment_approximation(curve)
+
+# The same chain, built one Line at a time
+lines = list(chain)
+rebuilt = LineSegmentChain()
+for line in lines:
+    rebuilt.append(line)
+
+expected_length = sum(abs(line.end - line.start) for line in lines)
+continuous = all(same(a.end, b.start) for a, b in zip(lines, lines[1:]))
+
+shifted = LineSegmentChain(vertices=chain.vertices + (5, -5))
+shifted_starts = [line.start - Vector(5, -5) for line in shifted]
+
+polyline = Polyline([Vector(0, 0), Vector(3, 4), Vector(3, 0)])
+trimmed = LineSegmentChain(vertices=polyline)
+trimmed.remove_from_first(1)
+
+# Removing every line leaves an empty chain, which later lines start afresh
+emptied = []
+for remove in [LineSegmentChain.remove_from_first, LineSegmentChain.remove_from_last]:
+    appended = LineSegmentChain(vertices=[(0, 0), (2, 0)])
+    remove(appended, 2)
+    appended.append(Line(Vector(5, 5), Vector(6, 5)))
+
+    merged = LineSegmentChain(vertices=[(0, 0), (2, 0)])
+    remove(merged, 2)
+    merged.merge(LineSegmentChain(vertices=[(5, 5), (6, 5)]))
+
+    emptied += [chain.chain_size() == 1 and same(chain.start, (5, 5)) and same(chain.end, (6, 5))
+                for chain in (appended, merged)]
+
+checks = {
+    "chain_size": chain.chain_size() == len(lines) == rebuilt.chain_size(),
+    "continuity": continuous and same(lines[0].start, curve.start) and same(lines[-1].end, curve.end),
+    "length": math.isclose(chain.length(), expected_length) and math.isclose(rebuilt.length(), expected_length),
+    "get": same(chain.get(-1).end, lines[-1].end) and same(chain.get(0).start, lines[0].start),
+    "translation": all(abs(a - line.start) < 1e-9 for a, line in zip(shifted_starts, lines)),
+    "polyline": polyline.length() == 9 and abs(polyline).tolist() == [0, 5, 3],
+    "remove_from_first": trimmed.chain_size() == 1 and same(trimmed.get(0).start, (3, 4)),
+    "remove_every_line": all(emptied),
+}
+
+broken = [name for name, passed in checks.items() if not passed]
+
+if broken:
+    print(f"LineSegmentChain vertices are broken! Failed checks: {broken}")
+else:
+    print(f"All {len(checks)} checks passed. {chain.chain_size()} segments are stored in a single Polyline")
@@ -0,0 +1,41 @@
+"""Use this script to verify whether dense polylines, eg. from CAD exports, are simplified into arcs within tolerance."""
+
+import math
+
+import numpy as np
+
+from svg_to_gcode.svg_parser import parse_string
+from svg_to_gcode.geometry import Line, LineSegmentChain, ArcChain, CircularArc
+from svg_to_gcode.compiler import Compiler, interfaces
+from svg_to_gcode import TOLERANCES
+
+# A slot with rounded ends, flattened into 2 x 100 line segments, followed by a zigzag which must be left untouched
+half_turns = [(20 + 10 * math.cos(a), 30 + 10 * math.sin(a)) for a in np.linspace(math.pi / 2, 3 * math.pi / 2, 101)] + \
+             [(60 + 10 * math.cos(a), 30 + 10 * math.sin(a)) for a in np.linspace(-math.pi / 2, math.pi / 2, 101)]
+zigzag = [(60 - 4 * i, 40 + 3 * (i % 2)) for i in range(1, 8)]
+d = "M " + " L ".join(f"{x:.4f},{y:.4f}" for x, y in half_turns + zigzag)
+
+svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><path d="{d}"/></svg>'
+curves = parse_string(svg)
+
+line_chain = LineSegmentChain(curves)
+arc_chain = ArcChain.fit_arcs(line_chain)
+arcs = [curve for curve in arc_chain if isinstance(curve, CircularArc)]
+
+# Every point of the original polyline must be close to the arcs and lines which replace it
+points = line_chain.points(np.linspace(0, 1, 5000))
+arc_points = np.vstack([curve.points(np.linspace(0, 1, 2 + int(curve.length() / 0.002))) for curve in arc_chain])
+deviation = max(np.hypot(*(arc_points - point).T).min() for point in points)
+
+zigzag_kept = sum(isinstance(curve, Line) for curve in arc_chain) >= len(zigzag) - 1
+
+compiler = Compiler(interfaces.Gcode, movement_speed=1000, cutting_speed=300, pass_depth=0, arcs=True)
+compiler.append_curves(curves)
+arc_commands = sum(command.startswith(("G2", "G3")) for command in compiler.body)
+
+if 2 <= len(arcs) <= 4 and zigzag_kept and deviation < 1.05 * TOLERANCES["approximation"] and arc_commands == len(arcs):
+    print(f"{line_chain.chain_size()} line segments were simplified into {arc_chain.chain_size()} curves, "
+          f"{len(arcs)} of which are arcs, within {deviation:.5f}")
+else:
+    print(f"Arc fitting of polylines is broken! arcs: {len(arcs)}, zigzag kept: {zigzag_kept}, "
+          f"deviation: {deviation}, arc commands: {arc_commands}")
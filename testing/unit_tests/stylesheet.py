@@ -0,0 +1,38 @@
+"""
+Use this script to verify whether stylesheets, inline styles and inherited styles are resolved correctly, and whether
+stroke-dasharray:none is cut like a path without a dash.
+"""
+
+import io
+
+from svg_to_gcode.svg_parser import parse_file, drawOpts
+
+svg = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+    <defs><style>/* comment */ .hidden { display:none } path.grove, #grove2 { stroke-dasharray: 2,2 }
+    g.invisible { visibility:hidden }</style></defs>
+    <path class="hidden" d="M0 0 L1 1"/>
+    <path class="grove" d="M0 0 L2 2"/>
+    <path id="grove2" d="M0 0 L3 3"/>
+    <g class="invisible"><path d="M0 0 L4 4"/><path style="visibility: visible" d="M0 0 L5 5"/></g>
+    <g stroke-dasharray="1"><path d="M0 0 L6 6"/></g>
+    <path d="M0 0 L7 7"/>
+    <path style="stroke-dasharray:none" d="M0 0 L8 8"/>
+</svg>"""
+
+expected_cuts = [5, 7, 8]
+expected_groves = [2, 3, 6]
+
+for stream in (False, True):
+    cuts_opts = drawOpts()
+    groves_opts = drawOpts()
+    groves_opts.filter = "stroke-dasharray"
+
+    cuts = [curve.end.x for curve in parse_file(io.StringIO(svg), dOpts=cuts_opts, stream=stream)]
+    groves = [curve.end.x for curve in parse_file(io.StringIO(svg), dOpts=groves_opts, stream=stream)]
+
+    if cuts == expected_cuts and groves == expected_groves:
+        print(f"stream={stream}: Styles are resolved correctly")
+    else:
+        print(f"stream={stream}: Styles are broken!")
+        print("cuts:", cuts, "expected:", expected_cuts)
+        print("groves:", groves, "expected:", expected_groves)
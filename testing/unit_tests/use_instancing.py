@@ -0,0 +1,30 @@
+"""Use this script to verify whether <use> instances are placed correctly and share a single approximation."""
+
+import io
+
+from svg_to_gcode.svg_parser import parse_file
+from svg_to_gcode.geometry import ApproximationCache
+
+columns, rows = 25, 20
+holes = "".join(f'<use href="#hole" x="{10 * (i % columns)}" y="{10 * (i // columns)}"/>' for i in range(columns * rows))
+svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="300" height="300">
+    <defs><circle id="hole" cx="5" cy="5" r="2"/></defs>
+    {holes}
+</svg>"""
+
+for stream in (False, True):
+    curves = list(parse_file(io.StringIO(svg), stream=stream))
+
+    # Each hole starts on the right of its circle. The origin is flipped to the bottom-left.
+    expected_starts = [(10 * (i % columns) + 7, 300 - 10 * (i // columns) - 5) for i in range(columns * rows)]
+    starts = [(round(curve.start.x, 6), round(curve.start.y, 6)) for curve in curves]
+
+    approximation_cache = ApproximationCache()
+    for curve in curves:
+        approximation_cache.approximate(curve)
+
+    if starts == expected_starts and approximation_cache.misses == 1:
+        print(f"stream={stream}: {len(curves)} instances share {approximation_cache.misses} approximation")
+    else:
+        print(f"stream={stream}: <use> instancing is broken! {approximation_cache}")
+        print("unexpected starts:", [(a, b) for a, b in zip(starts, expected_starts) if a != b][:5])
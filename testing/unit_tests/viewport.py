@@ -0,0 +1,33 @@
+"""Use this script to verify whether viewBoxes, preserveAspectRatio and units are mapped to the right output units."""
+
+from svg_to_gcode.svg_parser import parse_string
+from svg_to_gcode import TOLERANCES
+
+# root attributes, unit, expected (start, end) of the line M0 0 L10 20
+cases = [
+    ('width="210mm" height="297mm" viewBox="0 0 210 297"', None, ((0, 297), (10, 277))),
+    ('width="210mm" height="297mm" viewBox="0 0 210 297"', "mm", ((0, 297), (10, 277))),
+    ('width="8.5in" height="11in" viewBox="0 0 612 792"', "in", ((0, 11), (10 / 72, 11 - 20 / 72))),
+    ('width="96px" height="96px"', "in", ((0, 1), (0.1041667, 1 - 0.2083333))),
+    ('width="200mm" height="100mm" viewBox="0 0 100 100"', "mm", ((50, 100), (60, 80))),
+    ('width="200mm" height="100mm" viewBox="0 0 100 100" preserveAspectRatio="xMinYMin meet"', "mm",
+     ((0, 100), (10, 80))),
+    ('width="200mm" height="100mm" viewBox="0 0 100 100" preserveAspectRatio="none"', "mm", ((0, 100), (20, 80))),
+    ('width="100mm" height="100mm" viewBox="0 0 50 25" preserveAspectRatio="xMaxYMax slice"', "mm",
+     ((-100, 100), (-60, 20))),
+]
+
+failures = 0
+for attributes, unit, expected in cases:
+    svg = f'<svg xmlns="http://www.w3.org/2000/svg" {attributes}><path d="M0 0 L10 20"/></svg>'
+    line = parse_string(svg, unit=unit)[0]
+
+    for point, (x, y) in zip((line.start, line.end), expected):
+        if abs(point.x - x) > TOLERANCES["operation"] or abs(point.y - y) > TOLERANCES["operation"]:
+            failures += 1
+            print(f"<svg {attributes}> with unit={unit}: expected {(x, y)} got {point}")
+
+if failures:
+    print(f"The document transformation is broken! {failures} points are misplaced.")
+else:
+    print("Every viewport is mapped correctly")